@@ -0,0 +1,326 @@
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from compute import CALCULATOR_BUILDERS, calculator
+from families import FAMILIES, make_distribution
+
+# --- API de Cálculo HTTP/JSON (sin Streamlit) ---
+# Servidor local asíncrono (asyncio, solo biblioteca estándar) que expone
+# los mismos cálculos que las calculadoras para las 17 familias del
+# registro:
+#
+#   GET  /health            -> {"status": "ok"}
+#   GET  /families          -> parámetros, valores por defecto y tipo
+#   GET  /metrics           -> peticiones, lotes y cálculos deduplicados
+#   POST /compute           -> {"family": "normal", "params": {"mu": 0, "sigma": 1},
+#                               "method": "cdf", "x": [0, 1.96]}
+#                              <- {"result": [0.5, 0.975...]}
+#
+# Las peticiones concurrentes para la misma (familia, método) se juntan
+# durante una ventana corta (micro-lote): los parámetros de cada petición
+# se repiten a lo largo de sus x y todo el lote se resuelve con una sola
+# llamada vectorizada de SciPy gracias al broadcasting. Las peticiones
+# idénticas dentro de la misma ventana se resuelven una sola vez. Los
+# lotes se calculan en el ejecutor del bucle (run_in_executor), así un
+# lote grande no detiene las demás conexiones.
+#
+# Los números son los de las páginas: cdf y sf pasan por IntervalQuery
+# (cdf o sf según el lado de la mediana) y la Hipergeométrica usa
+# HypergeomEngine en modo 'auto' para pmf, logpmf, cdf y sf, como
+# compute.calculator. Esas peticiones se agrupan por parámetros dentro del
+# lote en lugar de vectorizarse a lo largo de ellos.
+#
+# Uso:  python api_server.py [--host 127.0.0.1] [--port 8765] [--window-ms 1]
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+BATCH_WINDOW = 0.001       # segundos que se espera a otras peticiones
+MAX_BATCH_POINTS = 1_000_000
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+DISCRETE_METHODS = ('pmf', 'logpmf', 'cdf', 'sf', 'logcdf', 'logsf', 'ppf', 'isf')
+CONTINUOUS_METHODS = ('pdf', 'logpdf', 'cdf', 'sf', 'logcdf', 'logsf', 'ppf', 'isf')
+# Métodos de HypergeomEngine; el resto de la Hipergeométrica usa SciPy
+ENGINE_METHODS = ('pmf', 'logpmf', 'cdf', 'sf')
+
+
+class RequestError(ValueError):
+    """Petición inválida (se responde con 400)."""
+
+
+def parse_request(payload):
+    """Valida el cuerpo de /compute y devuelve (familia, método, parámetros, x)."""
+    if not isinstance(payload, dict):
+        raise RequestError("El cuerpo debe ser un objeto JSON.")
+    family = payload.get('family')
+    if family not in FAMILIES:
+        raise RequestError(f"Familia desconocida: {family!r}.")
+    spec = FAMILIES[family]
+
+    method = payload.get('method', 'cdf')
+    allowed = DISCRETE_METHODS if spec['kind'] == 'discrete' else CONTINUOUS_METHODS
+    if method not in allowed:
+        raise RequestError(f"Método {method!r} no válido para {spec['label']}; usa uno de: {', '.join(allowed)}.")
+
+    params = payload.get('params', {})
+    if not isinstance(params, dict):
+        raise RequestError("'params' debe ser un objeto JSON.")
+    unknown = set(params) - set(spec['params'])
+    if unknown:
+        raise RequestError(f"Parámetros desconocidos para {spec['label']}: {', '.join(sorted(unknown))}.")
+    try:
+        values = tuple(float(params.get(name, spec['defaults'][name])) for name in spec['params'])
+        x = np.atleast_1d(np.asarray(payload.get('x', []), dtype=float))
+    except (TypeError, ValueError):
+        raise RequestError("Los parámetros y 'x' deben ser numéricos.")
+    if x.ndim != 1:
+        raise RequestError("'x' debe ser un número o una lista de números.")
+    return family, method, values, x
+
+
+def uses_calculator(family, method):
+    """True si la petición pasa por compute.calculator (como en las páginas)."""
+    return method in ('cdf', 'sf') or (family in CALCULATOR_BUILDERS and method in ENGINE_METHODS)
+
+
+def evaluate(family, method, values, x):
+    """Evaluación directa de una sola petición (sin lotes)."""
+    params = dict(zip(FAMILIES[family]['params'], values))
+    with np.errstate(all='ignore'):
+        if uses_calculator(family, method):
+            calc = calculator(family, **params)
+            if method == 'cdf':
+                return calc.query.le(x)
+            if method == 'sf':
+                return calc.query.gt(x)
+            return np.asarray(getattr(calc.dist, method)(x), dtype=float)
+        dist = make_distribution(family, **params)
+        return np.asarray(getattr(dist, method)(x), dtype=float)
+
+
+def evaluate_batch(family, method, pending):
+    """
+    Resultados de un lote [(valores, x), ...] en el mismo orden; una
+    excepción en lugar del arreglo si esa petición falla.
+    """
+    sizes = [len(x) for _, x in pending]
+    try:
+        if uses_calculator(family, method):
+            # Una evaluación por combinación de parámetros del lote
+            groups = {}
+            for i, (values, _) in enumerate(pending):
+                groups.setdefault(values, []).append(i)
+            parts = [None] * len(pending)
+            for values, members in groups.items():
+                result = evaluate(family, method, values, np.concatenate([pending[i][1] for i in members]))
+                for i, part in zip(members, np.split(result, np.cumsum([sizes[i] for i in members])[:-1])):
+                    parts[i] = part
+            return parts
+        # Cada parámetro como columna repetida a lo largo de las x de su petición
+        columns = np.repeat(np.array([values for values, _ in pending]), sizes, axis=0)
+        x_all = np.concatenate([x for _, x in pending])
+        result = evaluate(family, method, tuple(columns[:, j] for j in range(columns.shape[1])), x_all)
+        return np.split(result, np.cumsum(sizes)[:-1])
+    except Exception:
+        # Un error en el lote no debe afectar a las demás peticiones:
+        # se reintenta cada una por separado.
+        parts = []
+        for values, x in pending:
+            try:
+                parts.append(evaluate(family, method, values, x))
+            except Exception as e:
+                parts.append(e)
+        return parts
+
+
+class MicroBatcher:
+    """
+    Junta las peticiones de una (familia, método) que llegan dentro de
+    'window' segundos y las resuelve con una única llamada vectorizada.
+    """
+
+    def __init__(self, window=BATCH_WINDOW, max_points=MAX_BATCH_POINTS):
+        self.window = window
+        self.max_points = max_points
+        self._pending = {}
+        self._in_flight = {}
+        self.batches = 0
+        self.requests = 0
+        self.deduplicated = 0
+        self.points = 0
+
+    async def submit(self, family, method, values, x):
+        # Single-flight: una petición idéntica a otra que ya espera en el
+        # lote comparte su resultado en vez de añadir más puntos
+        flight_key = (family, method, values, x.tobytes())
+        future = self._in_flight.get(flight_key)
+        if future is not None:
+            self.requests += 1
+            self.deduplicated += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = self._in_flight[flight_key] = loop.create_future()
+        future.add_done_callback(lambda _: self._in_flight.pop(flight_key, None))
+        key = (family, method)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = []
+            loop.call_later(self.window, self._flush, key)
+        pending.append((values, x, future))
+        self.requests += 1
+        if sum(len(item[1]) for item in pending) >= self.max_points:
+            self._flush(key)
+        return await asyncio.shield(future)
+
+    def metrics(self):
+        executed = self.requests - self.deduplicated
+        return {
+            'requests': self.requests,
+            'deduplicated': self.deduplicated,
+            'batches': self.batches,
+            'points': self.points,
+            'mean_batch_size': round(executed / self.batches, 3) if self.batches else 0.0,
+            'in_flight': len(self._in_flight),
+        }
+
+    def _flush(self, key):
+        pending = self._pending.pop(key, None)
+        if not pending:
+            return
+        self.batches += 1
+        self.points += sum(len(x) for _, x, _ in pending)
+        family, method = key
+        # SciPy fuera del bucle: las demás conexiones siguen atendiéndose
+        job = asyncio.get_running_loop().run_in_executor(
+            None, evaluate_batch, family, method, [(values, x) for values, x, _ in pending])
+        job.add_done_callback(lambda done: self._resolve(pending, done))
+
+    @staticmethod
+    def _resolve(pending, done):
+        error = done.exception()
+        parts = [error] * len(pending) if error is not None else done.result()
+        for (_, _, future), part in zip(pending, parts):
+            if future.done():
+                continue
+            if isinstance(part, BaseException):
+                future.set_exception(part)
+            else:
+                future.set_result(part)
+
+
+def _json_list(values):
+    # JSON no admite NaN ni infinitos: se envían como null
+    return [v if np.isfinite(v) else None for v in values.tolist()]
+
+
+class ComputeServer:
+    """Servidor HTTP/1.1 mínimo (keep-alive) sobre asyncio."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, window=BATCH_WINDOW):
+        self.host, self.port = host, port
+        self.batcher = MicroBatcher(window)
+        self.started = time.time()
+
+    async def handle_compute(self, payload):
+        family, method, values, x = parse_request(payload)
+        result = await self.batcher.submit(family, method, values, x)
+        return {'family': family, 'method': method, 'result': _json_list(result)}
+
+    async def route(self, method, path, body):
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok', 'uptime': round(time.time() - self.started, 3)}
+        if method == 'GET' and path == '/metrics':
+            return 200, self.batcher.metrics()
+        if method == 'GET' and path == '/families':
+            return 200, {
+                name: {'label': spec['label'], 'kind': spec['kind'], 'params': list(spec['params']),
+                       'defaults': spec['defaults']}
+                for name, spec in FAMILIES.items()
+            }
+        if method == 'POST' and path == '/compute':
+            try:
+                payload = json.loads(body or b'{}')
+            except json.JSONDecodeError as e:
+                return 400, {'error': f"JSON inválido: {e}"}
+            # Se admite una petición o una lista de peticiones
+            if isinstance(payload, list):
+                results = await asyncio.gather(*(self.handle_compute(p) for p in payload), return_exceptions=True)
+                return 200, [{'error': str(r)} if isinstance(r, Exception) else r for r in results]
+            return 200, await self.handle_compute(payload)
+        return 404, {'error': f"Ruta no encontrada: {method} {path}"}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0) or 0)
+                if length > MAX_BODY_BYTES:
+                    status, response = 413, {'error': "Cuerpo demasiado grande."}
+                    body = b''
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    try:
+                        status, response = await self.route(method, path.split('?')[0], body)
+                    except RequestError as e:
+                        status, response = 400, {'error': str(e)}
+                    except Exception as e:
+                        status, response = 500, {'error': f"Error en el cálculo: {e}"}
+
+                data = json.dumps(response).encode('utf-8')
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large'}.get(status, 'Error')
+                writer.write(
+                    f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+                    + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API local de cálculo de distribuciones (HTTP/JSON).")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--window-ms', type=float, default=BATCH_WINDOW * 1000,
+                        help="Ventana de micro-lote en milisegundos")
+    args = parser.parse_args(argv)
+
+    print(f"Escuchando en http://{args.host}:{args.port} (ventana {args.window_ms} ms)")
+    try:
+        asyncio.run(ComputeServer(args.host, args.port, args.window_ms / 1000).serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,10 @@
 import streamlit as st
 import numpy as np
 
+from helpers import debug_panel
+from timing import start_rerun
+from warmup import start_warmup
+
 # --- Configuración de la Página ---
 # Esto se aplica a TODAS las páginas de la aplicación
 st.set_page_config(
@@ -9,6 +13,12 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('inicio')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página Principal (app.py) ---
 # Esta será nuestra página de "Fundamentos".
 # Streamlit la mostrará como la página principal.
@@ -83,3 +93,5 @@ st.write("La CDF es una función escalonada.")
 st.subheader("Para variables continuas:")
 st.latex(r"F(x) = \int_{-\infty}^{x} f(t) \,dt")
 st.write("La CDF es una función continua y es la integral (antiderivada) de la PDF.")
+
+debug_panel()
@@ -0,0 +1,274 @@
+import argparse
+import inspect
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import scipy
+import matplotlib
+import matplotlib.pyplot as plt
+
+from compute import view_data, calculator
+from families import FAMILIES, make_distribution
+from figures import managed_figure
+from exercises import TEMPLATES, N_VARIANTS, DEFAULT_SEED
+from helpers import plot_discrete_distribution, plot_continuous_distribution, _render_image
+
+# --- Micro-benchmarks de los Helpers y de los Cálculos de cada Página ---
+# Mide, para las 17 familias y tres juegos de parámetros (pequeño, por
+# defecto y extremo dentro de los rangos de los sliders):
+#
+#   construccion  objeto congelado de SciPy (families.make_distribution)
+#   grafico       plot_discrete/continuous_distribution sin la caché
+#   png           rasterización del gráfico (opciones de escritorio, rendering.py)
+#   calculadora   compute.calculator (como la página y la API) con 100
+#                 valores de x y 10 intervalos
+#
+# y, por plantilla de 'exercises.py', el cálculo vectorizado de las
+# N_VARIANTS respuestas del banco ('ejercicio').
+#
+# Cada caso se repite 'repeat' veces con tantas llamadas por repetición
+# como hagan falta para superar 'min_time'; se guarda la mediana y el
+# mínimo por llamada. Los resultados van a un JSON que se puede comparar
+# con una línea base: un caso es una regresión si su mediana supera la
+# de la línea base en más de 'threshold' (por defecto 25 %).
+#
+# Uso:  python benchmarks.py [--families normal t] [--output resultados.json]
+#                            [--baseline base.json] [--threshold 0.25]
+#                            [--update-baseline]
+# Sale con código 1 si hay regresiones.
+#
+# 'benchmark_baseline.json' (en la raíz del repositorio) es la línea base
+# de referencia; su 'meta' indica la máquina y las versiones con que se
+# midió. Los tiempos solo son comparables en la misma máquina, así que en
+# integración continua la línea base se regenera en el mismo trabajo, con
+# el código de la rama destino, antes de medir el cambio:
+#
+#     git checkout <rama destino> && python benchmarks.py --update-baseline --baseline /tmp/base.json
+#     git checkout <cambio>       && python benchmarks.py --baseline /tmp/base.json
+#
+# Si las versiones de Python, NumPy, SciPy o matplotlib o la máquina de la
+# línea base no coinciden con las actuales, se avisa antes de comparar.
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_BASELINE = os.path.join(_APP_DIR, 'benchmark_baseline.json')
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 5
+DEFAULT_MIN_TIME = 0.02   # segundos por repetición
+
+# Sin la caché de Streamlit: se mide el trabajo real
+_plot_discrete = inspect.unwrap(plot_discrete_distribution)
+_plot_continuous = inspect.unwrap(plot_continuous_distribution)
+
+# 'defecto' son los valores de families.py; los demás se combinan con ellos
+PARAM_SETS = {
+    'bernoulli': {'pequeño': {'p': 0.01}, 'extremo': {'p': 0.99}},
+    'binomial': {'pequeño': {'n': 1}, 'extremo': {'n': 100, 'p': 0.01}},
+    'geometrica': {'pequeño': {'p': 0.99}, 'extremo': {'p': 0.01}},
+    'hipergeometrica': {'pequeño': {'N': 10, 'K': 1, 'n': 1}, 'extremo': {'N': 200, 'K': 100, 'n': 100}},
+    'uniforme_discreta': {'pequeño': {'a': 1, 'b': 1}, 'extremo': {'a': 20, 'b': 40}},
+    'poisson': {'pequeño': {'lam': 0.1}, 'extremo': {'lam': 30.0}},
+    'uniforme_continua': {'pequeño': {'a': 0.0, 'b': 0.1}, 'extremo': {'a': -10.0, 'b': 10.0}},
+    'triangular': {'pequeño': {'a': 0.0, 'c': 0.0, 'b': 1.0}, 'extremo': {'a': -10.0, 'c': 10.0, 'b': 10.0}},
+    'exponencial': {'pequeño': {'lam': 10.0}, 'extremo': {'lam': 0.1}},
+    'normal': {'pequeño': {'sigma': 0.1}, 'extremo': {'mu': 10.0, 'sigma': 5.0}},
+    'lognormal': {'pequeño': {'sigma_log': 0.1}, 'extremo': {'mu_log': 3.0, 'sigma_log': 2.0}},
+    'gamma': {'pequeño': {'alpha': 0.1, 'beta': 0.1}, 'extremo': {'alpha': 20.0, 'beta': 5.0}},
+    'beta': {'pequeño': {'alpha': 0.1, 'beta': 0.1}, 'extremo': {'alpha': 20.0, 'beta': 20.0}},
+    'weibull': {'pequeño': {'k': 0.1, 'lam': 0.1}, 'extremo': {'k': 5.0, 'lam': 20.0}},
+    't': {'pequeño': {'df': 1}, 'extremo': {'df': 30}},
+    'chi2': {'pequeño': {'k': 1}, 'extremo': {'k': 50}},
+    'f': {'pequeño': {'df1': 1, 'df2': 1}, 'extremo': {'df1': 50, 'df2': 50}},
+}
+
+
+def measure(fn, repeat=DEFAULT_REPEAT, min_time=DEFAULT_MIN_TIME):
+    """
+    Segundos por llamada de fn(): {'median', 'min', 'number', 'repeat'}.
+    'number' (llamadas por repetición) se duplica hasta superar 'min_time'.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return {'median': float(np.median(times)), 'min': float(np.min(times)), 'number': number, 'repeat': repeat}
+
+
+def param_sets(family):
+    defaults = FAMILIES[family]['defaults']
+    sets = {'defecto': dict(defaults)}
+    for name, params in PARAM_SETS.get(family, {}).items():
+        sets[name] = {**defaults, **params}
+    return sets
+
+
+def _figure(data):
+    # Gráfico sin caché (ni adornos de la página)
+    if data.discrete:
+        return _plot_discrete(data.dist, data.points, f"PMF {data.label}")
+    return _plot_continuous(data.dist, data.points[0], data.points[1], f"PDF {data.label}")
+
+
+def _plot(data):
+    plt.close(_figure(data))
+
+
+def _png(data):
+    with managed_figure(_figure(data)) as fig:
+        _render_image(fig)
+
+
+def _calculator(calc, data):
+    # 100 valores de x y 10 intervalos repartidos por el rango graficado
+    lo, hi = (data.points[0], data.points[-1])
+    x = np.linspace(lo, hi, 100)
+    if calc.discrete:
+        x = np.round(x)
+    edges = np.linspace(lo, hi, 11)
+    return calc.query.query(x=x, a=edges[:-1], b=edges[1:])
+
+
+def family_cases(family):
+    """(nombre, función) de los casos de una familia."""
+    cases = []
+    for set_name, params in param_sets(family).items():
+        data = view_data(family, **params)
+        # La misma Calculation que la página y la API (HypergeomEngine en la Hipergeométrica)
+        calc = calculator(family, **params)
+        prefix = f"{family}/{set_name}"
+        cases.append((f"{prefix}/construccion", lambda p=params: make_distribution(family, **p)))
+        cases.append((f"{prefix}/grafico", lambda d=data: _plot(d)))
+        cases.append((f"{prefix}/png", lambda d=data: _png(d)))
+        cases.append((f"{prefix}/calculadora", lambda c=calc, d=data: _calculator(c, d)))
+    return cases
+
+
+def exercise_cases(families):
+    """Un caso por plantilla: las N_VARIANTS respuestas del banco en una llamada."""
+    cases = []
+    for index, template in enumerate(TEMPLATES):
+        if template['page'] not in families:
+            continue
+        # Los mismos sorteos que exercises.build_bank
+        rng = np.random.default_rng([DEFAULT_SEED, index])
+        drawn = {}
+        for name, sampler in template['params'].items():
+            drawn[name] = np.asarray(sampler(rng, N_VARIANTS, drawn))
+        cases.append((f"{template['page']}/ejercicio/{template['id']}", lambda t=template, d=drawn: t['answer'](**d)))
+    return cases
+
+
+def run(families=None, repeat=DEFAULT_REPEAT, min_time=DEFAULT_MIN_TIME, pattern=None, progress=None):
+    """Ejecuta los casos y devuelve {'meta': ..., 'results': {caso: medida}}."""
+    families = list(families or FAMILIES)
+    cases = [case for family in families for case in family_cases(family)] + exercise_cases(families)
+    if pattern:
+        cases = [(name, fn) for name, fn in cases if pattern in name]
+
+    results = {}
+    for name, fn in cases:
+        results[name] = measure(fn, repeat, min_time)
+        if progress is not None:
+            progress(name, results[name])
+    meta = {
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'matplotlib': matplotlib.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+    }
+    return {'meta': meta, 'results': results}
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Filas (caso, base, actual, cambio relativo, regresión) para los casos
+    presentes en ambos resultados, de la mayor subida a la mayor bajada.
+    """
+    rows = []
+    for name, measured in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None or base['median'] <= 0:
+            continue
+        change = measured['median'] / base['median'] - 1
+        rows.append((name, base['median'], measured['median'], change, change > threshold))
+    return sorted(rows, key=lambda row: -row[3])
+
+
+def format_comparison(rows, threshold=DEFAULT_THRESHOLD):
+    lines = [f"{'Caso':<52} {'base µs':>11} {'actual µs':>11} {'cambio':>8}"]
+    for name, base, current, change, regression in rows:
+        flag = "  REGRESIÓN" if regression else ""
+        lines.append(f"{name:<52} {1e6 * base:11.1f} {1e6 * current:11.1f} {100 * change:+7.1f}%{flag}")
+    n_regressions = sum(row[4] for row in rows)
+    lines.append(f"{n_regressions} regresiones (umbral +{100 * threshold:.0f} %) en {len(rows)} casos comparados.")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks de los helpers y de los cálculos por familia.")
+    parser.add_argument('--families', nargs='*', choices=list(FAMILIES), help="Familias a medir (por defecto, todas)")
+    parser.add_argument('--pattern', help="Solo los casos cuyo nombre contiene este texto (ej. 'grafico')")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME, help="Segundos mínimos por repetición")
+    parser.add_argument('--output', help="Guarda los resultados en JSON")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="JSON de la línea base")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="Subida relativa que cuenta como regresión")
+    parser.add_argument('--update-baseline', action='store_true', help="Guarda estos resultados como línea base")
+    args = parser.parse_args(argv)
+
+    def progress(name, measured):
+        print(f"{name:<52} {1e6 * measured['median']:11.1f} µs  (x{measured['number']})", flush=True)
+
+    current = run(args.families, args.repeat, args.min_time, args.pattern, progress)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+
+    if args.update_baseline:
+        # Se conservan los casos de la línea base que no se midieron esta vez
+        baseline = {'meta': current['meta'], 'results': {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline['results'] = json.load(f)['results']
+        baseline['results'].update(current['results'])
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Línea base actualizada: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No hay línea base en {args.baseline}; usa --update-baseline para crearla.")
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    differs = [name for name in ('python', 'numpy', 'scipy', 'matplotlib', 'machine', 'processor')
+               if baseline.get('meta', {}).get(name) != current['meta'][name]]
+    if differs:
+        print(f"Aviso: la línea base se midió con otro entorno ({', '.join(differs)}); los tiempos pueden no ser comparables.")
+    rows = compare(current, baseline, args.threshold)
+    print()
+    print(format_comparison(rows, args.threshold))
+    return 1 if any(row[4] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,201 @@
+import collections
+
+import numpy as np
+import scipy.stats as stats
+
+from families import FAMILIES, make_distribution
+from hypergeom_engine import HypergeomEngine
+from queries import IntervalQuery
+from timing import timer
+
+# --- Cálculos de las Páginas (sin Streamlit) ---
+# La parte numérica de las pestañas "Visualización" y "Calculadora" de
+# las 17 familias: parámetros en la notación de la página, números y
+# arreglos de salida. Nada aquí importa Streamlit ni matplotlib, así que
+# se puede llamar desde trabajos por lotes, benchmarks o grupos de
+# procesos sin un script runner. Las páginas y 'views.py' solo dibujan.
+#
+#   view_data(familia, **parámetros)    puntos, título y objetos del gráfico
+#   figure_key(familia, **parámetros)   clave de caché del gráfico
+#   calculator(familia, **parámetros)   momentos y probabilidades
+#
+# Las otras páginas ya tienen su módulo de cálculo: 'fitting.py' y
+# 'gof.py' (Ajuste de Datos), 'mixtures.py' (Mezclas), 'relations.py'
+# (mapa del Resumen), 'exercises.py' (ejercicios generados) y
+# 'progress.py' (Panel Docente).
+#
+# Los parámetros van con el tipo del slider: la clave de la caché
+# distingue 5 de 5.0.
+
+ViewData = collections.namedtuple('ViewData', 'dist frozen points label discrete args')
+
+
+def _lognormal_max(dist):
+    # Hasta el percentil 99.5, sin pasar de 50
+    x_max = dist.ppf(0.995)
+    if x_max > 50 or np.isinf(x_max) or np.isnan(x_max):
+        x_max = 50
+    return x_max
+
+
+# 'label': título sin el prefijo PMF/PDF/CDF. 'k_values' (discretas) o
+# 'range' (continuas) reciben la distribución y los parámetros.
+VIEWS = {
+    'bernoulli': {
+        'label': lambda p: f"de Bernoulli (p={p:.2f})",
+        'k_values': lambda dist, p: [0, 1],
+    },
+    'binomial': {
+        'label': lambda n, p: f"Binomial (n={n}, p={p:.2f})",
+        'k_values': lambda dist, n, p: np.arange(0, n + 1),
+    },
+    'geometrica': {
+        'label': lambda p: f"Geométrica (p={p:.2f})",
+        # Los primeros 25 ensayos o hasta que la prob. sea muy baja
+        'k_values': lambda dist, p: np.arange(1, max(25, int(dist.mean() * 3)) + 1),
+    },
+    'hipergeometrica': {
+        'label': lambda N, K, n: f"Hipergeométrica (N={N}, K={K}, n={n})",
+        # Motor exacto: toda la PMF en un solo barrido
+        'build': lambda N, K, n: HypergeomEngine(N, K, n, mode='exact'),
+        'frozen': lambda N, K, n: stats.hypergeom(N, K, n),
+        'k_values': lambda dist, N, K, n: dist.k_values,
+    },
+    'uniforme_discreta': {
+        'label': lambda a, b: f"Uniforme Discreta (a={a}, b={b})",
+        'k_values': lambda dist, a, b: np.arange(a, b + 1),
+    },
+    'poisson': {
+        'label': lambda lam: f"de Poisson (λ={lam:.1f})",
+        # Hasta k = media + 4 desviaciones estándar (sigma = sqrt(lambda))
+        'k_values': lambda dist, lam: np.arange(0, int(lam + 4 * np.sqrt(lam)) + 1),
+    },
+    'uniforme_continua': {
+        'label': lambda a, b: f"Uniforme Continua (a={a:.1f}, b={b:.1f})",
+        'range': lambda dist, a, b: (a - (b - a) * 0.2, b + (b - a) * 0.2),
+    },
+    'triangular': {
+        'label': lambda a, c, b: f"Triangular (a={a:.1f}, c={c:.1f}, b={b:.1f})",
+        'range': lambda dist, a, c, b: (a - (b - a) * 0.1, b + (b - a) * 0.1),
+    },
+    'exponencial': {
+        'label': lambda lam: f"Exponencial (λ={lam:.1f}, media β={1.0 / lam:.2f})",
+        # Hasta 3 veces la media
+        'range': lambda dist, lam: (0, 3 * dist.mean()),
+    },
+    'normal': {
+        'label': lambda mu, sigma: f"Normal (μ={mu:.1f}, σ={sigma:.1f})",
+        # +/- 4 desviaciones estándar
+        'range': lambda dist, mu, sigma: (mu - 4 * sigma, mu + 4 * sigma),
+    },
+    'lognormal': {
+        'label': lambda mu_log, sigma_log: f"Lognormal (μ_log={mu_log:.1f}, σ_log={sigma_log:.1f})",
+        'range': lambda dist, mu_log, sigma_log: (0, _lognormal_max(dist)),
+    },
+    'gamma': {
+        'label': lambda alpha, beta: f"Gamma (α={alpha:.1f}, β={beta:.1f})",
+        'range': lambda dist, alpha, beta: (0, dist.ppf(0.998)),
+    },
+    'beta': {
+        'label': lambda alpha, beta: f"Beta (α={alpha:.1f}, β={beta:.1f})",
+        # El rango es siempre 0 a 1
+        'range': lambda dist, alpha, beta: (0, 1),
+    },
+    'weibull': {
+        'label': lambda k, lam: f"Weibull (k={k:.1f}, λ={lam:.1f})",
+        'range': lambda dist, k, lam: (0, dist.ppf(0.995)),
+    },
+    't': {
+        'label': lambda df: f"t de Student (df={df})",
+        'range': lambda dist, df: (-4, 4),
+    },
+    'chi2': {
+        'label': lambda k: f"Chi-Cuadrado (k={k})",
+        'range': lambda dist, k: (0, dist.ppf(0.998)),
+    },
+    'f': {
+        'label': lambda df1, df2: f"Distribución F (df1={df1}, df2={df2})",
+        # Evitar valores extremos si df2 es pequeño
+        'range': lambda dist, df1, df2: (0, min(dist.ppf(0.995), 15)),
+    },
+}
+
+
+def view_data(family, **params):
+    """
+    Todo lo que el gráfico necesita, sin dibujarlo: ViewData(dist, frozen,
+    points, label, discrete, args), con 'points' los k graficados
+    (discretas) o el rango (x_min, x_max) (continuas).
+    """
+    spec = VIEWS[family]
+    values = {**FAMILIES[family]['defaults'], **params}
+    args = tuple(values[name] for name in FAMILIES[family]['params'])
+
+    with timer('construccion'):
+        dist = spec['build'](*args) if 'build' in spec else make_distribution(family, **values)
+        frozen = spec['frozen'](*args) if 'frozen' in spec else dist
+    discrete = FAMILIES[family]['kind'] == 'discrete'
+    points = spec['k_values'](dist, *args) if discrete else spec['range'](dist, *args)
+    return ViewData(dist, frozen, points, spec['label'](*args), discrete, args)
+
+
+def figure_key(family, **params):
+    """Partes de la clave de caché del gráfico (familia y valores de los sliders)."""
+    values = {**FAMILIES[family]['defaults'], **params}
+    return (family,) + tuple(values[name] for name in FAMILIES[family]['params'])
+
+
+# Objetos de la calculadora que no son los de families.py: la
+# Hipergeométrica usa el motor propio con el método elegido en la página.
+CALCULATOR_BUILDERS = {
+    'hipergeometrica': lambda N, K, n, mode='auto': HypergeomEngine(N, K, n, mode=mode),
+}
+
+
+class Calculation:
+    """
+    Resultados de la pestaña "Calculadora" para una distribución. Las
+    probabilidades usan IntervalQuery (cdf o sf según el lado), así las
+    colas superiores no pierden precisión.
+    """
+
+    def __init__(self, dist, discrete):
+        self.dist = dist
+        self.discrete = discrete
+        self.query = IntervalQuery(dist, discrete=discrete)
+
+    def moments(self):
+        """{'mean', 'var', 'std'} (nan o inf si el momento no existe)."""
+        return {'mean': float(self.dist.mean()), 'var': float(self.dist.var()), 'std': float(self.dist.std())}
+
+    def at(self, x):
+        """
+        Probabilidades en x: 'pmf' (discretas) o 'pdf' (continuas), y 'le',
+        'gt', 'ge' = P(X ≤ x), P(X > x), P(X ≥ x).
+        """
+        result = self.query.query(x=[x])
+        values = {name: float(result[name][0]) for name in ('le', 'gt', 'ge')}
+        if self.discrete:
+            values['pmf'] = float(self.dist.pmf(x))
+        else:
+            values['pdf'] = float(self.dist.pdf(x))
+        return values
+
+    def between(self, a, b):
+        """P(a ≤ X ≤ b)."""
+        return float(self.query.between(a, b)[0])
+
+
+def calculator(family, **params):
+    """
+    Calculation de 'family' con los parámetros de la calculadora (los que
+    falten toman el valor por defecto). La Hipergeométrica acepta además
+    mode='auto' | 'exact' | 'binomial'.
+    """
+    builder = CALCULATOR_BUILDERS.get(family)
+    with timer('construccion'):
+        if builder is not None:
+            dist = builder(**{**FAMILIES[family]['defaults'], **params})
+        else:
+            dist = make_distribution(family, **params)
+    return Calculation(dist, FAMILIES[family]['kind'] == 'discrete')
@@ -0,0 +1,132 @@
+import time
+
+import numpy as np
+import scipy.stats as stats
+
+from streaming_stats import iter_chunks, DEFAULT_CHUNK
+
+# --- Actualización Bayesiana Conjugada en Flujo ---
+# Con una a priori conjugada la a posteriori pertenece a la misma familia
+# y solo depende de estadísticos suficientes (número de éxitos, suma de
+# conteos, número de observaciones). Cada lote se reduce con una suma y
+# actualiza los hiperparámetros en O(1) de memoria: no se guardan las
+# observaciones, así que el flujo puede tener millones de datos.
+#
+# - Beta–Binomial: p ~ Beta(α, β), X_i ~ Bernoulli(p)
+#       α' = α + Σ x_i,  β' = β + n - Σ x_i
+# - Gamma–Poisson: λ ~ Gamma(α, escala β), X_i ~ Poisson(λ)
+#       α' = α + Σ x_i,  1/β' = 1/β + n
+#   (la escala β es la misma notación de la página Gamma; internamente se
+#   acumula la tasa 1/β para no perder precisión con n grande)
+
+RENDER_INTERVAL = 0.5
+
+
+class BetaBinomialPosterior:
+    """A posteriori Beta para la probabilidad p de resultados Bernoulli (0/1)."""
+
+    label = "Beta–Binomial"
+
+    def __init__(self, alpha, beta):
+        if alpha <= 0 or beta <= 0:
+            raise ValueError("Los hiperparámetros α y β deben ser positivos.")
+        self.alpha, self.beta = float(alpha), float(beta)
+        self.n_obs = 0
+
+    def update(self, batch):
+        """Incorpora un lote de resultados 0/1 (se ignoran los NaN)."""
+        batch = np.asarray(batch, dtype=float).ravel()
+        batch = batch[~np.isnan(batch)]
+        if np.any((batch != 0) & (batch != 1)):
+            raise ValueError("Los resultados Bernoulli deben ser 0 o 1.")
+        successes = float(batch.sum())
+        self.alpha += successes
+        self.beta += len(batch) - successes
+        self.n_obs += len(batch)
+        return self
+
+    def dist(self):
+        return stats.beta(self.alpha, self.beta)
+
+    def params(self):
+        return {'alpha': self.alpha, 'beta': self.beta}
+
+
+class GammaPoissonPosterior:
+    """A posteriori Gamma (forma α, escala β) para la tasa λ de conteos Poisson."""
+
+    label = "Gamma–Poisson"
+
+    def __init__(self, alpha, beta):
+        if alpha <= 0 or beta <= 0:
+            raise ValueError("La forma α y la escala β deben ser positivas.")
+        self.alpha = float(alpha)
+        self.rate = 1.0 / float(beta)
+        self.n_obs = 0
+
+    @property
+    def beta(self):
+        return 1.0 / self.rate
+
+    def update(self, batch):
+        """Incorpora un lote de conteos enteros no negativos (se ignoran los NaN)."""
+        batch = np.asarray(batch, dtype=float).ravel()
+        batch = batch[~np.isnan(batch)]
+        if np.any((batch < 0) | (batch != np.floor(batch))):
+            raise ValueError("Los conteos Poisson deben ser enteros no negativos.")
+        self.alpha += float(batch.sum())
+        self.rate += len(batch)
+        self.n_obs += len(batch)
+        return self
+
+    def dist(self):
+        return stats.gamma(a=self.alpha, scale=self.beta)
+
+    def params(self):
+        return {'alpha': self.alpha, 'beta': self.beta}
+
+
+POSTERIORS = {
+    'beta_binomial': BetaBinomialPosterior,
+    'gamma_poisson': GammaPoissonPosterior,
+}
+
+
+def simulated_feed(model, true_value, total, batch_size=DEFAULT_CHUNK, seed=0):
+    """
+    Flujo simulado de 'total' observaciones en lotes: Bernoulli(p) para
+    'beta_binomial' o Poisson(λ) para 'gamma_poisson'.
+    """
+    rng = np.random.default_rng(seed)
+    remaining = int(total)
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        if model == 'beta_binomial':
+            yield (rng.random(size) < true_value).astype(float)
+        else:
+            yield rng.poisson(true_value, size).astype(float)
+        remaining -= size
+
+
+def file_feed(source, column=0, chunk_size=DEFAULT_CHUNK):
+    """Flujo de lotes desde un archivo (ruta o bytes subidos) vía 'iter_chunks'."""
+    return iter_chunks(source, column=column, chunk_size=chunk_size)
+
+
+def run_stream(posterior, batches, on_render=None, min_interval=RENDER_INTERVAL):
+    """
+    Consume los lotes actualizando 'posterior'. 'on_render(posterior)' se
+    llama como máximo una vez cada 'min_interval' segundos y siempre al
+    final, de modo que el costo de redibujar no depende del número de
+    lotes.
+    """
+    last_render = time.monotonic()
+    for batch in batches:
+        posterior.update(batch)
+        now = time.monotonic()
+        if on_render is not None and now - last_render >= min_interval:
+            on_render(posterior)
+            last_render = now
+    if on_render is not None:
+        on_render(posterior)
+    return posterior
@@ -0,0 +1,240 @@
+import glob
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+# --- Caché Persistente en Disco (direccionada por contenido) ---
+# Guarda en disco los gráficos ya rasterizados (PNG) y arreglos evaluados
+# para que sobrevivan a reinicios y despliegues, y para que varios
+# procesos de Streamlit los compartan. Cada entrada es un archivo cuyo
+# nombre es el SHA-256 de su clave: (familia, parámetros, opciones del
+# gráfico, versión del código). La versión del código es el hash de los
+# fuentes .py de la aplicación, así un cambio en cualquier página o en
+# los helpers invalida todo lo anterior sin borrar nada a mano.
+#
+# Escrituras atómicas: se escribe en un archivo temporal del mismo
+# directorio y se publica con os.replace, de modo que otro proceso nunca
+# lee un archivo a medias. Al superar 'max_bytes' se borran las entradas
+# usadas hace más tiempo (cada lectura actualiza la fecha del archivo)
+# hasta quedar en el 80 % del límite.
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'DISTRIBUCIONES_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.distribuciones', 'cache'),
+)
+DEFAULT_MAX_BYTES = int(float(os.environ.get('DISTRIBUCIONES_CACHE_MB', 512)) * 1024 * 1024)
+EVICT_TO = 0.8            # fracción del límite que queda tras desalojar
+STALE_TEMP_SECONDS = 3600  # temporales huérfanos (procesos caídos)
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def code_version():
+    """Hash de los fuentes .py de la aplicación (raíz y 'pages/')."""
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(_APP_DIR, '*.py')) + glob.glob(os.path.join(_APP_DIR, 'pages', '*.py'))):
+        digest.update(os.path.relpath(path, _APP_DIR).encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+CODE_VERSION = code_version()
+
+
+def _canonical(value):
+    # Representación estable entre procesos (sin ids ni direcciones)
+    if isinstance(value, np.ndarray):
+        return f"ndarray{value.shape}{value.dtype.str}:{hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()}"
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (bytes, bytearray)):
+        return f"bytes:{hashlib.sha256(value).hexdigest()}"
+    if isinstance(value, (list, tuple)):
+        return '(' + ','.join(_canonical(v) for v in value) + ')'
+    if isinstance(value, dict):
+        return '{' + ','.join(f"{_canonical(k)}:{_canonical(v)}" for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))) + '}'
+    return repr(value)
+
+
+def make_key(*parts, version=CODE_VERSION):
+    """Clave de una entrada: SHA-256 de las partes más la versión del código."""
+    return hashlib.sha256(_canonical((version,) + parts).encode('utf-8')).hexdigest()
+
+
+def dist_fingerprint(dist):
+    """
+    (nombre, args, kwds) de una distribución congelada de SciPy, o None si
+    el objeto no se puede identificar por sus parámetros.
+    """
+    family = getattr(dist, 'dist', None)
+    if family is None or not hasattr(dist, 'args'):
+        return None
+    return (getattr(family, 'name', type(family).__name__), tuple(dist.args), dict(getattr(dist, 'kwds', {})))
+
+
+class DiskCache:
+    """
+    Caché de bytes y arreglos en 'path', acotada a 'max_bytes'. Segura
+    para varios hilos y procesos que compartan el directorio.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = None   # estimación; se recalcula al desalojar
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def _file(self, key, suffix):
+        return os.path.join(self.path, key[:2], key + suffix)
+
+    def file_path(self, key, suffix='.bin'):
+        """Ruta de la entrada 'key' si está en disco (y la marca como usada), o None."""
+        path = self._file(key, suffix)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    # --- Bytes ---
+
+    def get_bytes(self, key, suffix='.bin'):
+        path = self._file(key, suffix)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            # Marca de uso reciente para el desalojo LRU
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put_bytes(self, key, data, suffix='.bin'):
+        path = self._file(key, suffix)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        if self._size is None:
+            size = self._scan_size()
+            with self._lock:
+                if self._size is None:
+                    self._size = size
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            self.writes += 1
+            self._size += len(data)
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+
+    def get_or_compute(self, key, compute, suffix='.bin'):
+        """Bytes de 'key'; si no están, los calcula con compute() y los guarda."""
+        data = self.get_bytes(key, suffix)
+        if data is None:
+            data = compute()
+            self.put_bytes(key, data, suffix)
+        return data
+
+    # --- Arreglos ---
+
+    def get_arrays(self, key):
+        """Tupla de arreglos guardada con put_arrays, o None."""
+        data = self.get_bytes(key, '.npz')
+        if data is None:
+            return None
+        try:
+            with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+                return tuple(npz[f'a{i}'] for i in range(len(npz.files)))
+        except (ValueError, OSError, KeyError):
+            return None
+
+    def put_arrays(self, key, *arrays):
+        buffer = io.BytesIO()
+        np.savez(buffer, **{f'a{i}': np.asarray(a) for i, a in enumerate(arrays)})
+        self.put_bytes(key, buffer.getvalue(), '.npz')
+
+    # --- Tamaño y desalojo ---
+
+    def _entries(self):
+        for directory in glob.glob(os.path.join(self.path, '??')):
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            info = entry.stat()
+                        except OSError:
+                            continue
+                        yield entry.path, entry.name, info
+            except OSError:
+                continue
+
+    def _scan_size(self):
+        return sum(info.st_size for _, name, info in self._entries() if not name.startswith('.tmp-'))
+
+    def evict(self):
+        """Borra las entradas menos usadas hasta quedar en EVICT_TO * max_bytes."""
+        now = time.time()
+        files = []
+        for path, name, info in self._entries():
+            if name.startswith('.tmp-'):
+                if now - info.st_mtime > STALE_TEMP_SECONDS:
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+                continue
+            files.append((info.st_mtime, info.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes * EVICT_TO
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                removed += 1
+            except OSError:
+                # Otro proceso ya la borró
+                pass
+            total -= size
+        with self._lock:
+            self._size = total
+            self.evictions += removed
+        return removed
+
+    def size(self):
+        return self._scan_size()
+
+    def metrics(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'writes': self.writes,
+                    'evictions': self.evictions, 'bytes': self._size if self._size is not None else self._scan_size()}
@@ -0,0 +1,138 @@
+import hashlib
+import io
+import os
+import tempfile
+
+import numpy as np
+
+from streaming_stats import iter_chunks, DEFAULT_CHUNK
+from disk_cache import DiskCache, EVICT_TO
+
+# --- CDF Empírica para Archivos Grandes ---
+# Los datos se leen con memory-map cuando es posible (.npy, binarios,
+# Parquet) y la CDF empírica se calcula con un único ordenamiento. Por
+# encima de 'exact_threshold' datos se usa un histograma fino calculado
+# por bloques (error en x menor que el ancho de un cubo). El resultado se
+# reduce a la resolución de pantalla antes de graficar.
+#
+# Los archivos subidos .npy y .parquet se copian a disco para abrirlos con
+# memory-map. La copia es una entrada de una DiskCache propia (nombre =
+# hash del contenido, escritura atómica con mkstemp, desalojo LRU), de a
+# lo sumo DISTRIBUCIONES_ECDF_MB megabytes (por defecto 256). Un archivo
+# que no cabe en ese límite se lee desde memoria.
+
+EXACT_THRESHOLD = 5_000_000
+HISTOGRAM_BINS = 1 << 16
+SCREEN_POINTS = 2_000
+
+SPILL_DIR = os.path.join(tempfile.gettempdir(), "distribuciones_ecdf")
+SPILL_MAX_BYTES = int(float(os.environ.get('DISTRIBUCIONES_ECDF_MB', 256)) * 1024 * 1024)
+
+_SPILL = DiskCache(SPILL_DIR, SPILL_MAX_BYTES)
+
+
+def file_digest(raw_bytes):
+    """Hash del contenido; identifica el archivo en las cachés."""
+    return hashlib.sha256(raw_bytes).hexdigest()
+
+
+def _spill_to_disk(raw_bytes, digest, ext):
+    # Un archivo subido vive en memoria; se escribe una vez en disco
+    # (nombre = hash) para poder abrirlo con memory-map. None si no cabe.
+    if len(raw_bytes) > SPILL_MAX_BYTES * EVICT_TO:
+        return None
+    path = _SPILL.file_path(digest, ext)
+    if path is None:
+        _SPILL.put_bytes(digest, raw_bytes, ext)
+        path = _SPILL.file_path(digest, ext)
+    return path
+
+
+def load_values(source, column=0, name=None):
+    """
+    Devuelve un arreglo 1D (posiblemente memory-mapped) con la columna
+    pedida. 'source' es una ruta o los bytes de un archivo subido; en ese
+    caso 'name' indica la extensión (.npy, .csv/.txt o .parquet).
+    """
+    if isinstance(source, (bytes, bytearray)):
+        ext = os.path.splitext(name or '')[1].lower()
+        if ext not in ('.npy', '.parquet'):
+            return np.concatenate(list(iter_chunks(io.BytesIO(source), column=column)) or [np.array([])])
+        # Si no cabe en la caché de copias se lee desde memoria
+        source = _spill_to_disk(source, file_digest(source), ext) or io.BytesIO(source)
+    else:
+        ext = os.path.splitext(str(source))[1].lower()
+
+    if ext == '.npy':
+        array = np.load(source, mmap_mode=None if isinstance(source, io.BytesIO) else 'r')
+        return array[:, column] if array.ndim > 1 else array
+    if ext == '.parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Leer Parquet requiere 'pyarrow' (pip install pyarrow).")
+        schema_names = pq.read_schema(source).names
+        table = pq.read_table(source, columns=[schema_names[column]], memory_map=True)
+        return table.column(0).to_numpy()
+    return np.concatenate(list(iter_chunks(source, column=column)) or [np.array([])])
+
+
+def _downsample(x, y, max_points):
+    # Conserva los puntos en rangos equiespaciados de la CDF (el escalón
+    # se sigue dibujando con drawstyle='steps-post') y los extremos.
+    if len(x) <= max_points:
+        return x, y
+    idx = np.unique(np.linspace(0, len(x) - 1, max_points).round().astype(int))
+    return x[idx], y[idx]
+
+
+def compute_ecdf(values, max_points=SCREEN_POINTS, exact_threshold=EXACT_THRESHOLD,
+                 bins=HISTOGRAM_BINS, chunk_size=DEFAULT_CHUNK):
+    """
+    CDF empírica reducida a 'max_points' puntos.
+
+    Devuelve (x, y, n, método) con método 'exacto' (un ordenamiento) o
+    'histograma' (dos pasadas por bloques: rango y conteos).
+    """
+    n_total = len(values)
+    if n_total <= exact_threshold:
+        x = np.sort(np.asarray(values, dtype=float))
+        x = x[np.isfinite(x)]
+        n = len(x)
+        if n == 0:
+            raise ValueError("No hay datos numéricos.")
+        # Último índice de cada valor repetido: altura real del escalón
+        last = np.r_[np.nonzero(np.diff(x))[0], n - 1]
+        x, y = x[last], (last + 1) / n
+        x, y = _downsample(x, y, max_points)
+        return x, y, n, 'exacto'
+
+    lo, hi = np.inf, -np.inf
+    for start in range(0, n_total, chunk_size):
+        chunk = np.asarray(values[start:start + chunk_size], dtype=float)
+        chunk = chunk[np.isfinite(chunk)]
+        if len(chunk):
+            lo, hi = min(lo, chunk.min()), max(hi, chunk.max())
+    if not np.isfinite(lo):
+        raise ValueError("No hay datos numéricos.")
+
+    edges = np.linspace(lo, hi if hi > lo else lo + 1.0, bins + 1)
+    counts = np.zeros(bins, dtype=np.int64)
+    for start in range(0, n_total, chunk_size):
+        chunk = np.asarray(values[start:start + chunk_size], dtype=float)
+        counts += np.histogram(chunk[np.isfinite(chunk)], bins=edges)[0]
+    n = int(counts.sum())
+    x, y = edges[1:], np.cumsum(counts) / n
+    x, y = _downsample(x, y, max_points)
+    return x, y, n, 'histograma'
+
+
+def ks_distance(dist, ecdf_x, ecdf_y, discrete=False):
+    """
+    Distancia máxima aproximada entre la CDF teórica y la empírica,
+    evaluada en los escalones (y en su límite izquierdo).
+    """
+    cdf = dist.cdf(ecdf_x)
+    cdf_left = dist.cdf(ecdf_x - 1) if discrete else cdf
+    y_left = np.r_[0.0, ecdf_y[:-1]]
+    return float(max(np.max(np.abs(ecdf_y - cdf)), np.max(np.abs(y_left - cdf_left))))
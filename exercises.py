@@ -0,0 +1,311 @@
+import glob
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import scipy
+import scipy.stats as stats
+
+# --- Generador de Ejercicios Aleatorios con Banco de Respuestas ---
+# Cada plantilla define un enunciado con parámetros, cómo sortearlos y la
+# respuesta como una llamada vectorizada de SciPy. 'build_bank' sortea
+# N_VARIANTS variantes de todas las plantillas con una semilla fija y
+# calcula todas las respuestas de una familia en una sola llamada. El
+# banco se guarda en un único .npz (un arreglo de parámetros y uno de
+# respuestas por plantilla, indexados por su id), así que corregir es una
+# búsqueda: banco[id][variante].
+#
+# Cada estudiante recibe una variante determinista (hash de su id y de la
+# plantilla): el mismo estudiante ve siempre el mismo enunciado.
+#
+# La versión del banco es el hash de este archivo (las plantillas) y de la
+# versión de SciPy (las respuestas), como 'code_version' en disk_cache.py:
+# cualquier cambio en una plantilla genera un banco nuevo sin tocar nada
+# a mano.
+
+
+def bank_version():
+    """Hash de las plantillas (este archivo) y de la versión de SciPy."""
+    digest = hashlib.sha256(scipy.__version__.encode('utf-8'))
+    with open(os.path.abspath(__file__), 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+BANK_VERSION = bank_version()
+N_VARIANTS = 512
+DEFAULT_SEED = 2024
+ANSWER_RTOL = 1e-3
+ANSWER_ATOL = 5e-4   # media unidad en el 4.º decimal (formato de las respuestas)
+
+_CACHE_DIR = os.path.join(tempfile.gettempdir(), "distribuciones_ejercicios")
+
+_P_VALUES = np.round(np.arange(0.05, 0.96, 0.05), 2)
+
+
+def _choice(values):
+    return lambda rng, size, drawn: rng.choice(values, size)
+
+
+def _integers(low, high):
+    return lambda rng, size, drawn: rng.integers(low, high + 1, size)
+
+
+def _uniform(low, high, decimals=1):
+    return lambda rng, size, drawn: np.round(rng.uniform(low, high, size), decimals)
+
+
+# Plantillas: los parámetros se sortean en orden y cada sorteo puede
+# depender de los anteriores ('drawn'). Los valores k se sortean de la
+# propia distribución para que las preguntas caigan en valores probables.
+# 'answer' recibe arreglos.
+TEMPLATES = [
+    {
+        'id': 'bern_var', 'page': 'bernoulli',
+        'question': "Un experimento tiene probabilidad de éxito p = {p:.2f}. ¿Cuál es la varianza σ² de la Bernoulli?",
+        'params': {'p': _choice(_P_VALUES)},
+        'answer': lambda p: stats.bernoulli.var(p),
+    },
+    {
+        'id': 'bin_pmf', 'page': 'binomial',
+        'question': "Se realizan n = {n} ensayos con p = {p:.2f}. ¿Cuál es P(X = {k})?",
+        'params': {'n': _integers(5, 30), 'p': _choice(_P_VALUES),
+                   'k': lambda rng, size, drawn: rng.binomial(drawn['n'], drawn['p'])},
+        'answer': lambda n, p, k: stats.binom.pmf(k, n, p),
+    },
+    {
+        'id': 'bin_cdf', 'page': 'binomial',
+        'question': "Se realizan n = {n} ensayos con p = {p:.2f}. ¿Cuál es P(X ≤ {k})?",
+        'params': {'n': _integers(5, 30), 'p': _choice(_P_VALUES),
+                   'k': lambda rng, size, drawn: rng.binomial(drawn['n'], drawn['p'])},
+        'answer': lambda n, p, k: stats.binom.cdf(k, n, p),
+    },
+    {
+        'id': 'geom_pmf', 'page': 'geometrica',
+        'question': "La probabilidad de éxito en cada ensayo es p = {p:.2f}. ¿Cuál es la probabilidad de que el primer éxito ocurra en el ensayo {k}?",
+        'params': {'p': _choice(_P_VALUES), 'k': lambda rng, size, drawn: np.minimum(rng.geometric(drawn['p']), 10)},
+        'answer': lambda p, k: stats.geom.pmf(k, p),
+    },
+    {
+        'id': 'hyp_pmf', 'page': 'hipergeometrica',
+        'question': "Una población de N = {N} tiene K = {K} éxitos. Se extraen n = {n} sin reemplazo. ¿Cuál es P(X = {k})?",
+        'params': {'N': _integers(20, 60),
+                   'K': lambda rng, size, drawn: rng.integers(2, drawn['N'] // 2 + 1),
+                   'n': lambda rng, size, drawn: rng.integers(2, np.minimum(drawn['N'] // 3, 12) + 1),
+                   'k': lambda rng, size, drawn: rng.hypergeometric(drawn['K'], drawn['N'] - drawn['K'], drawn['n'])},
+        # SciPy: hypergeom(M=población, n=éxitos, N=muestra)
+        'answer': lambda N, K, n, k: stats.hypergeom.pmf(k, N, K, n),
+    },
+    {
+        'id': 'unif_cdf', 'page': 'uniforme_discreta',
+        'question': "X es Uniforme Discreta en {{{a}, ..., {b}}}. ¿Cuál es P(X ≤ {k})?",
+        'params': {'a': _integers(0, 5),
+                   'b': lambda rng, size, drawn: drawn['a'] + rng.integers(3, 15, size),
+                   'k': lambda rng, size, drawn: rng.integers(drawn['a'], drawn['b'] + 1)},
+        'answer': lambda a, b, k: stats.randint.cdf(k, a, b + 1),
+    },
+    {
+        'id': 'poisson_pmf', 'page': 'poisson',
+        'question': "Llegan en promedio λ = {lam:.1f} clientes por hora. ¿Cuál es la probabilidad de que lleguen exactamente {k}?",
+        'params': {'lam': _uniform(0.5, 12.0), 'k': lambda rng, size, drawn: rng.poisson(drawn['lam'])},
+        'answer': lambda lam, k: stats.poisson.pmf(k, lam),
+    },
+    {
+        'id': 'poisson_sf', 'page': 'poisson',
+        'question': "Llegan en promedio λ = {lam:.1f} clientes por hora. ¿Cuál es la probabilidad de que lleguen más de {k}?",
+        'params': {'lam': _uniform(0.5, 12.0), 'k': lambda rng, size, drawn: rng.poisson(drawn['lam'])},
+        'answer': lambda lam, k: stats.poisson.sf(k, lam),
+    },
+    {
+        'id': 'unif_c_interval', 'page': 'uniforme_continua',
+        'question': "X es Uniforme Continua en [{a:.1f}, {b:.1f}]. ¿Cuál es P({x1:.1f} ≤ X ≤ {x2:.1f})?",
+        'params': {'a': _uniform(0, 10),
+                   'b': lambda rng, size, drawn: drawn['a'] + np.round(rng.uniform(2, 20, size), 1),
+                   'x1': lambda rng, size, drawn: np.round(rng.uniform(drawn['a'], drawn['b'] - 1), 1),
+                   'x2': lambda rng, size, drawn: np.round(rng.uniform(drawn['x1'] + 0.5, drawn['b']), 1)},
+        'answer': lambda a, b, x1, x2: stats.uniform.cdf(x2, a, b - a) - stats.uniform.cdf(x1, a, b - a),
+    },
+    {
+        'id': 'tri_mean', 'page': 'triangular',
+        'question': "Una tarea dura como mínimo a = {a:.1f}, lo más probable c = {c:.1f} y como máximo b = {b:.1f} días. ¿Cuál es la duración media?",
+        'params': {'a': _uniform(1, 5),
+                   'c': lambda rng, size, drawn: drawn['a'] + np.round(rng.uniform(0.5, 5, size), 1),
+                   'b': lambda rng, size, drawn: drawn['c'] + np.round(rng.uniform(0.5, 10, size), 1)},
+        'answer': lambda a, c, b: (a + c + b) / 3,
+    },
+    {
+        'id': 'exp_sf', 'page': 'exponencial',
+        'question': "Los fallos ocurren a una tasa de λ = {lam:.1f} por hora. ¿Cuál es la probabilidad de esperar más de {x:.1f} horas al siguiente fallo?",
+        'params': {'lam': _uniform(0.2, 3.0), 'x': lambda rng, size, drawn: np.round(rng.uniform(0.1, 3 / drawn['lam']), 1)},
+        'answer': lambda lam, x: stats.expon.sf(x, scale=1 / lam),
+    },
+    {
+        'id': 'norm_interval', 'page': 'normal',
+        'question': "X ~ N(μ = {mu:.0f}, σ = {sigma:.0f}). ¿Cuál es P({x1:.0f} ≤ X ≤ {x2:.0f})?",
+        'params': {'mu': _integers(50, 150), 'sigma': _integers(5, 20),
+                   'x1': lambda rng, size, drawn: drawn['mu'] - np.round(rng.uniform(0, 2.5, size) * drawn['sigma']),
+                   'x2': lambda rng, size, drawn: drawn['mu'] + np.round(rng.uniform(0.2, 2.5, size) * drawn['sigma'])},
+        'answer': lambda mu, sigma, x1, x2: stats.norm.cdf(x2, mu, sigma) - stats.norm.cdf(x1, mu, sigma),
+    },
+    {
+        'id': 'lognorm_mean', 'page': 'lognormal',
+        'question': "ln(X) ~ N(μ = {mu_log:.1f}, σ = {sigma_log:.1f}). ¿Cuál es la media E[X]?",
+        'params': {'mu_log': _uniform(-1.0, 2.0), 'sigma_log': _uniform(0.1, 1.0)},
+        'answer': lambda mu_log, sigma_log: stats.lognorm.mean(sigma_log, scale=np.exp(mu_log)),
+    },
+    {
+        'id': 'gamma_var', 'page': 'gamma',
+        'question': "El tiempo hasta {alpha} eventos sigue una Gamma con escala β = {beta:.1f}. ¿Cuál es la varianza σ²?",
+        'params': {'alpha': _integers(1, 10), 'beta': _uniform(0.5, 5.0)},
+        'answer': lambda alpha, beta: stats.gamma.var(alpha, scale=beta),
+    },
+    {
+        'id': 'beta_mean', 'page': 'beta',
+        'question': "Una campaña tuvo {alpha} clics y {beta} no-clics; se modela p ~ Beta(α = {alpha}, β = {beta}). ¿Cuál es la media de p?",
+        'params': {'alpha': _integers(1, 50), 'beta': _integers(1, 200)},
+        'answer': lambda alpha, beta: stats.beta.mean(alpha, beta),
+    },
+    {
+        'id': 'weibull_sf', 'page': 'weibull',
+        'question': "La vida útil (años) sigue una Weibull con forma k = {k:.1f} y escala λ = {lam:.0f}. ¿Cuál es la probabilidad de sobrevivir más de {x:.0f} años?",
+        'params': {'k': _uniform(0.5, 3.0), 'lam': _integers(5, 20),
+                   'x': lambda rng, size, drawn: rng.integers(1, drawn['lam'] + 1)},
+        'answer': lambda k, lam, x: stats.weibull_min.sf(x, k, scale=lam),
+    },
+    {
+        'id': 't_critical', 'page': 't',
+        'question': "Con df = {df} grados de libertad, ¿cuál es el valor crítico t que deja un área de {alpha:.3f} a la derecha?",
+        'params': {'df': _integers(2, 40), 'alpha': _choice(np.array([0.1, 0.05, 0.025, 0.01, 0.005]))},
+        'answer': lambda df, alpha: stats.t.isf(alpha, df),
+    },
+    {
+        'id': 'chi2_critical', 'page': 'chi2',
+        'question': "Con k = {k} grados de libertad, ¿cuál es el valor crítico χ² que deja un área de {alpha:.3f} a la derecha?",
+        'params': {'k': _integers(1, 30), 'alpha': _choice(np.array([0.1, 0.05, 0.025, 0.01]))},
+        'answer': lambda k, alpha: stats.chi2.isf(alpha, k),
+    },
+    {
+        'id': 'f_critical', 'page': 'f',
+        'question': "Con df1 = {df1} y df2 = {df2}, ¿cuál es el valor crítico F que deja un área de {alpha:.3f} a la derecha?",
+        'params': {'df1': _integers(1, 15), 'df2': _integers(5, 60), 'alpha': _choice(np.array([0.1, 0.05, 0.01]))},
+        'answer': lambda df1, df2, alpha: stats.f.isf(alpha, df1, df2),
+    },
+]
+
+TEMPLATES_BY_ID = {t['id']: t for t in TEMPLATES}
+
+
+def templates_for_page(page):
+    """Plantillas de una página (clave del registro de familias)."""
+    return [t for t in TEMPLATES if t['page'] == page]
+
+
+def default_bank_path(seed=DEFAULT_SEED, n_variants=N_VARIANTS):
+    return os.path.join(_CACHE_DIR, f"banco_v{BANK_VERSION}_{seed}_{n_variants}.npz")
+
+
+def build_bank(path=None, seed=DEFAULT_SEED, n_variants=N_VARIANTS):
+    """
+    Sortea y resuelve todas las variantes y guarda el banco en 'path'.
+
+    Cada plantilla usa su propio generador (semilla + índice), de modo que
+    añadir una plantilla no cambia las variantes de las demás.
+    """
+    path = path or default_bank_path(seed, n_variants)
+    arrays = {}
+    for index, template in enumerate(TEMPLATES):
+        rng = np.random.default_rng([seed, index])
+        drawn = {}
+        for name, sampler in template['params'].items():
+            drawn[name] = np.asarray(sampler(rng, n_variants, drawn))
+        arrays[f"{template['id']}/params"] = np.column_stack([drawn[name].astype(float) for name in template['params']])
+        arrays[f"{template['id']}/answers"] = np.asarray(template['answer'](**drawn), dtype=float)
+
+    meta = {'version': BANK_VERSION, 'seed': seed, 'n_variants': n_variants,
+            'params': {t['id']: list(t['params']) for t in TEMPLATES}}
+    arrays['meta'] = np.array(json.dumps(meta))
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.npz')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+def _remove_stale_banks():
+    # Bancos de versiones anteriores en el directorio por defecto
+    for stale in glob.glob(os.path.join(_CACHE_DIR, "banco_v*.npz")):
+        if not os.path.basename(stale).startswith(f"banco_v{BANK_VERSION}_"):
+            try:
+                os.unlink(stale)
+            except OSError:
+                pass
+
+
+class AnswerBank:
+    """Banco de respuestas cargado desde el .npz; corregir es una búsqueda."""
+
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.meta = json.loads(str(data['meta']))
+            if self.meta['version'] != BANK_VERSION:
+                raise ValueError("El banco de ejercicios es de otra versión; vuelve a generarlo.")
+            self._params = {key.split('/')[0]: data[key] for key in data.files if key.endswith('/params')}
+            self._answers = {key.split('/')[0]: data[key] for key in data.files if key.endswith('/answers')}
+        missing = set(TEMPLATES_BY_ID) - set(self._params)
+        if missing:
+            raise ValueError(f"Al banco de ejercicios le faltan plantillas: {', '.join(sorted(missing))}.")
+        self.n_variants = self.meta['n_variants']
+
+    def variant_for(self, student, template_id, round_=0):
+        """Variante determinista para un estudiante y ronda (hash estable)."""
+        digest = hashlib.sha256(f"{student}:{template_id}:{round_}".encode('utf-8')).digest()
+        return int.from_bytes(digest[:8], 'little') % self.n_variants
+
+    def params(self, template_id, variant):
+        names = self.meta['params'][template_id]
+        values = self._params[template_id][variant]
+        # Los parámetros enteros se guardan como float; se restauran para el enunciado
+        return {name: int(v) if float(v).is_integer() else float(v) for name, v in zip(names, values)}
+
+    def question(self, template_id, variant):
+        return TEMPLATES_BY_ID[template_id]['question'].format(**self.params(template_id, variant))
+
+    def answer(self, template_id, variant):
+        return float(self._answers[template_id][variant])
+
+    def check(self, template_id, variant, response):
+        """True si 'response' coincide con la respuesta (vectorizado sobre 'variant' y 'response')."""
+        expected = self._answers[template_id][np.asarray(variant)]
+        return np.isclose(response, expected, rtol=ANSWER_RTOL, atol=ANSWER_ATOL)
+
+
+def load_bank(path=None, seed=DEFAULT_SEED, n_variants=N_VARIANTS):
+    """Carga el banco; si no existe (o es de otra versión) lo genera."""
+    if path is None:
+        path = default_bank_path(seed, n_variants)
+        _remove_stale_banks()
+    if not os.path.exists(path):
+        build_bank(path, seed, n_variants)
+    try:
+        return AnswerBank(path)
+    except (ValueError, KeyError):
+        build_bank(path, seed, n_variants)
+        return AnswerBank(path)
+
+
+if __name__ == '__main__':
+    # Generación en tiempo de construcción: python exercises.py [ruta]
+    import sys
+    print(build_bank(sys.argv[1] if len(sys.argv) > 1 else None))
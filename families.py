@@ -0,0 +1,121 @@
+import numpy as np
+import scipy.stats as stats
+
+# --- Registro de Familias ---
+# Una entrada por página del explorador. Los parámetros usan la misma
+# notación que las páginas (ej. Exponencial con tasa λ, Gamma con forma α
+# y escala β) y 'build' traduce esa notación a la de SciPy.
+# Los valores por defecto son los de los sliders de "Visualización".
+
+
+def _triang(a, c, b):
+    # SciPy usa 'c' como un factor (c-a)/(b-a)
+    return stats.triang(c=(c - a) / (b - a), loc=a, scale=b - a)
+
+
+FAMILIES = {
+    'bernoulli': {
+        'label': "Bernoulli", 'page': "01_Bernoulli", 'kind': 'discrete',
+        'params': ('p',), 'defaults': {'p': 0.5},
+        'build': lambda p: stats.bernoulli(p=p),
+    },
+    'binomial': {
+        'label': "Binomial", 'page': "02_Binomial", 'kind': 'discrete',
+        'params': ('n', 'p'), 'defaults': {'n': 20, 'p': 0.5},
+        'build': lambda n, p: stats.binom(n=n, p=p),
+    },
+    'geometrica': {
+        'label': "Geométrica", 'page': "03_Geometrica", 'kind': 'discrete',
+        'params': ('p',), 'defaults': {'p': 0.25},
+        'build': lambda p: stats.geom(p=p),
+    },
+    'hipergeometrica': {
+        'label': "Hipergeométrica", 'page': "04_Hipergeometrica", 'kind': 'discrete',
+        'params': ('N', 'K', 'n'), 'defaults': {'N': 52, 'K': 4, 'n': 5},
+        # SciPy usa M=N (Pob), n=K (Éxitos), N=n (Muestra)
+        'build': lambda N, K, n: stats.hypergeom(M=N, n=K, N=n),
+    },
+    'uniforme_discreta': {
+        'label': "Uniforme Discreta", 'page': "05_Uniforme_Discreta", 'kind': 'discrete',
+        'params': ('a', 'b'), 'defaults': {'a': 1, 'b': 6},
+        'build': lambda a, b: stats.randint(low=a, high=b + 1),
+    },
+    'poisson': {
+        'label': "Poisson", 'page': "06_Poisson", 'kind': 'discrete',
+        'params': ('lam',), 'defaults': {'lam': 5.0},
+        'build': lambda lam: stats.poisson(mu=lam),
+    },
+    'uniforme_continua': {
+        'label': "Uniforme Continua", 'page': "07_Uniforme_Continua", 'kind': 'continuous',
+        'params': ('a', 'b'), 'defaults': {'a': 0.0, 'b': 10.0},
+        'build': lambda a, b: stats.uniform(loc=a, scale=b - a),
+    },
+    'triangular': {
+        'label': "Triangular", 'page': "08_Triangular", 'kind': 'continuous',
+        'params': ('a', 'c', 'b'), 'defaults': {'a': 0.0, 'c': 5.0, 'b': 10.0},
+        'build': _triang,
+    },
+    'exponencial': {
+        'label': "Exponencial", 'page': "09_Exponencial", 'kind': 'continuous',
+        'params': ('lam',), 'defaults': {'lam': 1.0},
+        'build': lambda lam: stats.expon(scale=1.0 / lam),
+    },
+    'normal': {
+        'label': "Normal", 'page': "10_Normal", 'kind': 'continuous',
+        'params': ('mu', 'sigma'), 'defaults': {'mu': 0.0, 'sigma': 1.0},
+        'build': lambda mu, sigma: stats.norm(loc=mu, scale=sigma),
+    },
+    'lognormal': {
+        'label': "Lognormal", 'page': "11_Lognormal", 'kind': 'continuous',
+        'params': ('mu_log', 'sigma_log'), 'defaults': {'mu_log': 0.0, 'sigma_log': 1.0},
+        'build': lambda mu_log, sigma_log: stats.lognorm(s=sigma_log, scale=np.exp(mu_log)),
+    },
+    'gamma': {
+        'label': "Gamma", 'page': "12_Gamma", 'kind': 'continuous',
+        'params': ('alpha', 'beta'), 'defaults': {'alpha': 2.0, 'beta': 1.0},
+        'build': lambda alpha, beta: stats.gamma(a=alpha, scale=beta),
+    },
+    'beta': {
+        'label': "Beta", 'page': "13_Beta", 'kind': 'continuous',
+        'params': ('alpha', 'beta'), 'defaults': {'alpha': 2.0, 'beta': 5.0},
+        'build': lambda alpha, beta: stats.beta(a=alpha, b=beta),
+    },
+    'weibull': {
+        'label': "Weibull", 'page': "14_Weibull", 'kind': 'continuous',
+        'params': ('k', 'lam'), 'defaults': {'k': 2.0, 'lam': 10.0},
+        'build': lambda k, lam: stats.weibull_min(c=k, scale=lam),
+    },
+    't': {
+        'label': "t de Student", 'page': "15_t_de_Student", 'kind': 'continuous',
+        'params': ('df',), 'defaults': {'df': 5},
+        'build': lambda df: stats.t(df=df),
+    },
+    'chi2': {
+        'label': "Chi-Cuadrado", 'page': "16_Chi_Cuadrado", 'kind': 'continuous',
+        'params': ('k',), 'defaults': {'k': 5},
+        'build': lambda k: stats.chi2(df=k),
+    },
+    'f': {
+        'label': "F de Fisher-Snedecor", 'page': "17_F", 'kind': 'continuous',
+        'params': ('df1', 'df2'), 'defaults': {'df1': 5, 'df2': 20},
+        'build': lambda df1, df2: stats.f(dfn=df1, dfd=df2),
+    },
+}
+
+
+def make_distribution(family, **params):
+    """
+    Construye el objeto congelado de SciPy para 'family' a partir de los
+    parámetros en la notación de la página. Los que falten toman el
+    valor por defecto del slider.
+    """
+    if family not in FAMILIES:
+        raise KeyError(f"Familia desconocida: '{family}'.")
+    spec = FAMILIES[family]
+    values = {**spec['defaults'], **params}
+    return spec['build'](*(values[name] for name in spec['params']))
+
+
+def format_params(family, params):
+    """Texto corto 'alpha=2, beta=1' para títulos y tablas."""
+    return ", ".join(f"{name}={params[name]:.4g}" for name in FAMILIES[family]['params'])
@@ -0,0 +1,77 @@
+import contextlib
+import threading
+
+import matplotlib.pyplot as plt
+
+from timing import REGISTRY
+
+# --- Ciclo de Vida de las Figuras de matplotlib ---
+# pyplot guarda cada figura creada con plt.subplots en un registro global
+# hasta que alguien llama a plt.close. Si st.pyplot, una superposición o
+# la rasterización fallan antes de ese plt.close, la figura queda viva
+# para siempre y la memoria del proceso crece con cada error.
+#
+# managed_figure() garantiza el cierre:
+#
+#   with managed_figure(plot_continuous_distribution(...)) as fig:
+#       fig.gca().hist(...)          # si esto falla, la figura se cierra
+#       show_figure(fig)
+#
+# y, con keep=True, sirve también a las funciones que construyen y
+# devuelven una figura: solo se cierra si la construcción falla.
+#
+# Las figuras vivas (las que pyplot todavía guarda, de cualquier origen)
+# y los cierres se exportan junto con los tiempos (timing.REGISTRY): un
+# número de figuras vivas que crece sin bajar en un proceso de larga
+# duración es una fuga.
+
+
+class FigureTracker:
+    """Contadores de cierres hechos por managed_figure (seguro para hilos)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.closed = 0
+        self.closed_on_error = 0
+
+    def close(self, fig, error=False):
+        plt.close(fig)
+        with self._lock:
+            self.closed += 1
+            if error:
+                self.closed_on_error += 1
+
+    @staticmethod
+    def live():
+        """Figuras registradas en pyplot en este momento."""
+        return len(plt.get_fignums())
+
+    def metrics(self):
+        with self._lock:
+            return {'live': self.live(), 'closed': self.closed, 'closed_on_error': self.closed_on_error}
+
+
+TRACKER = FigureTracker()
+
+REGISTRY.register('distribuciones_live_figures', 'gauge',
+                  "Figuras de matplotlib registradas en pyplot.", TRACKER.live)
+REGISTRY.register('distribuciones_figures_closed_total', 'counter',
+                  "Figuras cerradas por managed_figure.", lambda: TRACKER.closed)
+REGISTRY.register('distribuciones_figures_closed_on_error_total', 'counter',
+                  "Figuras cerradas por managed_figure tras un error.", lambda: TRACKER.closed_on_error)
+
+
+@contextlib.contextmanager
+def managed_figure(fig, keep=False):
+    """
+    Context manager que cierra 'fig' al salir del bloque, haya o no una
+    excepción. Con keep=True la figura solo se cierra si hay una
+    excepción (para funciones que la devuelven).
+    """
+    try:
+        yield fig
+    except BaseException:
+        TRACKER.close(fig, error=True)
+        raise
+    if not keep:
+        TRACKER.close(fig)
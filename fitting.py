@@ -0,0 +1,266 @@
+import multiprocessing
+import multiprocessing.connection
+import time
+
+import numpy as np
+import scipy.stats as stats
+
+from families import make_distribution
+from streaming_stats import RunningMoments, moment_estimates
+
+# --- Ajuste de Familias por Máxima Verosimilitud ---
+# Cada familia se ajusta en un proceso propio (contexto 'spawn': el
+# proceso de Streamlit tiene hilos y un 'fork' podría heredar sus locks
+# tomados), con a lo sumo 'max_workers' procesos a la vez. El tiempo
+# límite de cada familia cuenta desde que su proceso empieza a ajustar,
+# no desde que se encola: las familias que esperan turno no lo gastan.
+# Los resultados se ordenan por AIC y se acompañan de BIC y del
+# estadístico de Kolmogorov-Smirnov.
+#
+# Con datos enteros las familias continuas se evalúan como Discretized:
+# la probabilidad de cada dato es la del redondeo, F(x + 1/2) - F(x - 1/2),
+# en lugar de la densidad. Así la log-verosimilitud de todas las familias
+# es una suma de log-probabilidades y sus AIC se pueden comparar (los
+# parámetros siguen siendo los de máxima verosimilitud continua). El valor-p
+# de KS solo vale para datos continuos; con datos enteros es conservador,
+# así que se informa solo el estadístico.
+
+CONTINUOUS_FIT_FAMILIES = ('exponencial', 'gamma', 'weibull', 'lognormal', 'normal', 'beta')
+DISCRETE_FIT_FAMILIES = ('poisson', 'geometrica')
+# Segundos que se dan a un proceso para importar SciPy y empezar a ajustar
+SPAWN_TIMEOUT = 30.0
+
+
+class Discretized:
+    """
+    Distribución continua 'parent' redondeada al entero más cercano:
+    P(Y = k) = P(k - 1/2 < X ≤ k + 1/2), restando cdf o sf según el lado de
+    la mediana para no perder precisión en las colas.
+    """
+
+    def __init__(self, parent):
+        self.parent = parent
+        self._median = float(parent.median())
+
+    def pmf(self, k):
+        k = np.asarray(k, dtype=float)
+        lo, hi = k - 0.5, k + 0.5
+        with np.errstate(invalid='ignore'):
+            mass = np.where(lo >= self._median, self.parent.sf(lo) - self.parent.sf(hi),
+                            self.parent.cdf(hi) - self.parent.cdf(lo))
+        return np.where(k == np.floor(k), np.clip(mass, 0.0, 1.0), 0.0)
+
+    def logpmf(self, k):
+        with np.errstate(divide='ignore'):
+            return np.log(self.pmf(k))
+
+    def cdf(self, k):
+        return self.parent.cdf(np.floor(np.asarray(k, dtype=float)) + 0.5)
+
+    def sf(self, k):
+        return self.parent.sf(np.floor(np.asarray(k, dtype=float)) + 0.5)
+
+    def mean(self):
+        k = np.arange(np.floor(self.parent.ppf(1e-12)), np.ceil(self.parent.ppf(1 - 1e-12)) + 1)
+        return float(np.sum(k * self.pmf(k)))
+
+
+def fitted_distribution(result):
+    """Distribución de un resultado de fit_family (Discretized si corresponde)."""
+    dist = make_distribution(result['family'], **result['params'])
+    return Discretized(dist) if result.get('discretized') else dist
+
+
+def _fit_params(family, data):
+    """
+    Estimadores de máxima verosimilitud en la notación de la página.
+    Lanza ValueError si la familia no admite los datos. Los estimadores
+    por momentos se usan como punto de partida de los ajustes numéricos.
+    """
+    start = moment_estimates(RunningMoments().update(data)).get(family, {})
+    if family in ('exponencial', 'gamma', 'weibull', 'lognormal') and np.any(data <= 0):
+        raise ValueError("Requiere datos estrictamente positivos.")
+
+    if family == 'exponencial':
+        return {'lam': 1.0 / np.mean(data)}
+    if family == 'normal':
+        mu, sigma = stats.norm.fit(data)
+        return {'mu': mu, 'sigma': sigma}
+    if family == 'gamma':
+        alpha, _, beta = stats.gamma.fit(data, start.get('alpha', 1.0), floc=0, scale=start.get('beta', 1.0))
+        return {'alpha': alpha, 'beta': beta}
+    if family == 'weibull':
+        k, _, lam = stats.weibull_min.fit(data, start.get('k', 1.0), floc=0, scale=start.get('lam', 1.0))
+        return {'k': k, 'lam': lam}
+    if family == 'lognormal':
+        log_data = np.log(data)
+        return {'mu_log': np.mean(log_data), 'sigma_log': np.std(log_data)}
+    if family == 'beta':
+        if np.any(data <= 0) or np.any(data >= 1):
+            raise ValueError("Requiere datos en el intervalo (0, 1).")
+        alpha, beta, _, _ = stats.beta.fit(data, start.get('alpha', 1.0), start.get('beta', 1.0), floc=0, fscale=1)
+        return {'alpha': alpha, 'beta': beta}
+
+    if not np.all(data == np.round(data)):
+        raise ValueError("Requiere datos enteros.")
+    if family == 'poisson':
+        if np.any(data < 0):
+            raise ValueError("Requiere conteos >= 0.")
+        return {'lam': np.mean(data)}
+    if family == 'geometrica':
+        if np.any(data < 1):
+            raise ValueError("Requiere número de ensayos >= 1.")
+        return {'p': 1.0 / np.mean(data)}
+
+    raise ValueError(f"No hay estimador para la familia '{family}'.")
+
+
+def fit_family(family, data):
+    """
+    Ajusta una familia y devuelve un diccionario con sus parámetros,
+    log-verosimilitud, AIC, BIC y el estadístico KS (con su valor-p, o
+    None si los datos son enteros). Con datos enteros, una familia continua
+    se evalúa discretizada ('discretized': True).
+    """
+    data = np.asarray(data, dtype=float)
+    params = _fit_params(family, data)
+    dist = make_distribution(family, **params)
+    integer = bool(np.all(data == np.round(data)))
+    discretized = integer and family not in DISCRETE_FIT_FAMILIES
+    if discretized:
+        dist = Discretized(dist)
+
+    if integer:
+        loglik = np.sum(dist.logpmf(data))
+    else:
+        loglik = np.sum(dist.logpdf(data))
+
+    n_params = len(params)
+    n_obs = len(data)
+    ks = stats.kstest(data, dist.cdf)
+    return {
+        'family': family,
+        'params': {name: float(value) for name, value in params.items()},
+        'loglik': float(loglik),
+        'aic': float(2 * n_params - 2 * loglik),
+        'bic': float(n_params * np.log(n_obs) - 2 * loglik),
+        'ks': float(ks.statistic),
+        'ks_pvalue': None if integer else float(ks.pvalue),
+        'discretized': discretized,
+    }
+
+
+def _fit_worker(family, data):
+    # Las excepciones se devuelven como resultado para no perder el resto
+    try:
+        return fit_family(family, data)
+    except Exception as e:
+        return {'family': family, 'error': str(e)}
+
+
+def _fit_process(conn, family, data):
+    # Proceso hijo: avisa que empieza (ya importó SciPy) y envía el resultado
+    conn.send('start')
+    conn.send(_fit_worker(family, data))
+    conn.close()
+
+
+def _supports(family, data):
+    if family in ('exponencial', 'gamma', 'weibull', 'lognormal'):
+        return np.all(data > 0)
+    if family == 'beta':
+        return np.all((data > 0) & (data < 1))
+    if family == 'poisson':
+        return np.all(data >= 0)
+    if family == 'geometrica':
+        return np.all(data >= 1)
+    return True
+
+
+def default_families(data):
+    """
+    Familias candidatas cuyo soporte contiene los datos. Con datos enteros
+    se incluyen también las continuas (discretizadas, ver fit_family):
+    conteos grandes o edades suelen describirse bien con ellas.
+    """
+    data = np.asarray(data, dtype=float)
+    families = CONTINUOUS_FIT_FAMILIES
+    if np.all(data == np.round(data)):
+        families = DISCRETE_FIT_FAMILIES + CONTINUOUS_FIT_FAMILIES
+    return tuple(f for f in families if _supports(f, data))
+
+
+def fit_all(data, families=None, timeout=10.0, max_workers=None, max_sample=200_000, seed=0):
+    """
+    Ajusta todas las familias en paralelo y las ordena por AIC.
+
+    - timeout: segundos por familia (número o diccionario {familia: segundos}),
+      contados desde que el proceso de la familia empieza a ajustar. Las
+      familias que no terminan a tiempo se reportan con error 'timeout' y
+      su proceso se termina.
+    - max_sample: si hay más datos, se ajusta sobre una submuestra aleatoria
+      sin reemplazo de ese tamaño (None para usar todos).
+
+    Devuelve (ranking, fallidos, n_usados).
+    """
+    data = np.asarray(data, dtype=float)
+    data = data[np.isfinite(data)]
+    if len(data) < 2:
+        raise ValueError("Se necesitan al menos 2 datos finitos.")
+    if max_sample is not None and len(data) > max_sample:
+        rng = np.random.default_rng(seed)
+        data = rng.choice(data, size=max_sample, replace=False)
+
+    families = tuple(families or default_families(data))
+    if not isinstance(timeout, dict):
+        timeout = {family: timeout for family in families}
+    n_workers = max_workers or min(len(families), multiprocessing.cpu_count())
+
+    context = multiprocessing.get_context('spawn')
+    waiting = list(families)
+    running = {}    # familia -> [proceso, conexión, instante límite]
+    results = {}
+    try:
+        while waiting or running:
+            while waiting and len(running) < n_workers:
+                family = waiting.pop(0)
+                recv, send = context.Pipe(duplex=False)
+                process = context.Process(target=_fit_process, args=(send, family, data), daemon=True)
+                process.start()
+                send.close()
+                running[family] = [process, recv, time.monotonic() + SPAWN_TIMEOUT]
+
+            now = time.monotonic()
+            wait = max(0.0, min(deadline for _, _, deadline in running.values()) - now)
+            ready = multiprocessing.connection.wait([recv for _, recv, _ in running.values()], timeout=wait)
+            now = time.monotonic()
+            for family, job in list(running.items()):
+                process, recv, deadline = job
+                if recv in ready:
+                    try:
+                        message = recv.recv()
+                    except EOFError:
+                        message = {'family': family, 'error': f"el proceso terminó sin resultado (código {process.exitcode})"}
+                    if message == 'start':
+                        # El tiempo límite empieza a contar ahora
+                        job[2] = now + timeout.get(family, 10.0)
+                        continue
+                    results[family] = message
+                elif now >= deadline:
+                    results[family] = {'family': family, 'error': 'timeout'}
+                else:
+                    continue
+                process.terminate()
+                process.join()
+                recv.close()
+                del running[family]
+    finally:
+        for process, recv, _ in running.values():
+            process.terminate()
+            process.join()
+            recv.close()
+
+    results = [results[family] for family in families]
+    ranking = sorted((r for r in results if 'error' not in r), key=lambda r: r['aic'])
+    failed = [r for r in results if 'error' in r]
+    return ranking, failed, len(data)
@@ -0,0 +1,206 @@
+import numpy as np
+import scipy.stats as stats
+
+from families import FAMILIES, make_distribution
+
+# --- Pruebas de Bondad de Ajuste por Lotes ---
+# Kolmogorov-Smirnov, Anderson-Darling y Chi-Cuadrado contra familias del
+# registro con parámetros totalmente especificados.
+#
+# - gof_batch: un conjunto de datos contra muchas parametrizaciones. Los
+#   datos se ordenan una sola vez y la CDF se evalúa como una matriz
+#   (candidatos x datos) gracias al broadcasting de SciPy.
+# - gof_many_datasets: muchos conjuntos de datos contra un solo modelo. Se
+#   concatenan, se ordenan una vez por (grupo, valor) y la CDF se evalúa
+#   en una sola llamada; los estadísticos se reducen por grupo.
+#
+# En familias discretas el estadístico KS se informa, pero no su valor-p:
+# la distribución de Kolmogorov (stats.kstwo) supone una CDF continua y con
+# saltos da valores-p conservadores. Anderson-Darling tampoco aplica.
+
+DEFAULT_CHI2_BINS = 10
+
+
+def _ad_pvalue(a2):
+    """
+    Valor-p asintótico de Anderson-Darling para parámetros conocidos
+    (aproximación de Marsaglia & Marsaglia, 2004).
+    """
+    z = np.asarray(a2, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        small = (np.exp(-1.2337141 / z) / np.sqrt(z)
+                 * (2.00012 + (0.247105 - (0.0649821 - (0.0347962 - (0.011672 - 0.00168691 * z) * z) * z) * z) * z))
+        large = np.exp(-np.exp(1.0776 - (2.30695 - (0.43424 - (0.082433 - (0.008056 - 0.0003146 * z) * z) * z) * z) * z))
+    cdf = np.where(z < 2, small, large)
+    cdf = np.where(z <= 0, 0.0, cdf)
+    return np.clip(1.0 - cdf, 0.0, 1.0)
+
+
+def _log_cdf_sf(dist, x, cdf):
+    """
+    log F(x) y log S(x). Se reutiliza la CDF ya calculada y solo se
+    recurre a logcdf/logsf (más lentas en SciPy) si alguna probabilidad
+    se anula por desbordamiento en las colas.
+    """
+    sf = dist.sf(x)
+    with np.errstate(divide='ignore'):
+        log_cdf = np.log(cdf)
+        log_sf = np.log(sf)
+        if np.any(cdf == 0):
+            log_cdf = dist.logcdf(x)
+        if np.any(sf == 0):
+            log_sf = dist.logsf(x)
+    return log_cdf, log_sf
+
+
+def _chi2_edges(sorted_data, n_bins, discrete):
+    """
+    Bordes interiores compartidos por todos los candidatos: cuantiles de
+    los datos, de modo que los conteos observados sean parecidos entre
+    cubos. Los cubos son (e_{j-1}, e_j] con e_0 = -inf y e_B = +inf.
+    """
+    probs = np.linspace(0, 1, n_bins + 1)[1:-1]
+    edges = np.quantile(sorted_data, probs)
+    if discrete:
+        edges = np.floor(edges)
+    edges = np.unique(edges)
+    return edges[edges < sorted_data[-1]]
+
+
+def _grid_params(family, params):
+    # Cada parámetro como columna (m, 1) para que la CDF haga broadcasting
+    names = FAMILIES[family]['params']
+    columns = {name: np.atleast_1d(np.asarray(params[name], dtype=float)) for name in names}
+    size = np.broadcast(*columns.values()).size
+    return {name: np.broadcast_to(col, (size,)).reshape(-1, 1) for name, col in columns.items()}, size
+
+
+def gof_batch(data, family, params, n_bins=DEFAULT_CHI2_BINS, ddof=0):
+    """
+    Prueba un conjunto de datos contra m parametrizaciones de 'family'.
+
+    'params' es {parámetro: escalar o arreglo}; los arreglos deben tener la
+    misma longitud m (o ser escalares). 'ddof' resta grados de libertad
+    a la prueba Chi-Cuadrado si los parámetros se estimaron de los datos.
+
+    Devuelve un diccionario de arreglos de longitud m con: ks, ks_pvalue,
+    ad, ad_pvalue (los tres últimos NaN en familias discretas), chi2,
+    chi2_df, chi2_pvalue y min_expected (la prueba Chi-Cuadrado es fiable
+    si es >= 5).
+    """
+    x = np.sort(np.asarray(data, dtype=float).ravel())
+    x = x[np.isfinite(x)]
+    n = len(x)
+    if n < 2:
+        raise ValueError("Se necesitan al menos 2 datos finitos.")
+
+    grid, m = _grid_params(family, params)
+    dist = make_distribution(family, **grid)
+    discrete = FAMILIES[family]['kind'] == 'discrete'
+
+    # --- Kolmogorov-Smirnov ---
+    cdf = dist.cdf(x[None, :])                       # (m, n)
+    i = np.arange(1, n + 1)
+    if discrete:
+        # La CDF empírica a la izquierda de cada salto es F(x-1)
+        cdf_left = dist.cdf(x[None, :] - 1)
+        d_plus = np.max(i / n - cdf, axis=1)
+        d_minus = np.max(cdf_left - (i - 1) / n, axis=1)
+    else:
+        d_plus = np.max(i / n - cdf, axis=1)
+        d_minus = np.max(cdf - (i - 1) / n, axis=1)
+    ks = np.maximum(d_plus, d_minus)
+    ks_pvalue = np.full(m, np.nan) if discrete else stats.kstwo.sf(ks, n)
+
+    # --- Anderson-Darling (solo continuas; log-CDF y log-SF para las colas) ---
+    if discrete:
+        ad = np.full(m, np.nan)
+        ad_pvalue = np.full(m, np.nan)
+    else:
+        log_cdf, log_sf = _log_cdf_sf(dist, x[None, :], cdf)
+        weights = (2 * i - 1) / n
+        ad = -n - np.sum(weights * (log_cdf + log_sf[:, ::-1]), axis=1)
+        ad_pvalue = _ad_pvalue(ad)
+
+    # --- Chi-Cuadrado con cubos compartidos ---
+    edges = _chi2_edges(x, n_bins, discrete)
+    observed = np.diff(np.concatenate([[0], np.searchsorted(x, edges, side='right'), [n]]))
+    cdf_edges = dist.cdf(edges[None, :])             # (m, B-1)
+    probs = np.diff(np.concatenate([np.zeros((m, 1)), cdf_edges, np.ones((m, 1))], axis=1), axis=1)
+    expected = n * probs
+    with np.errstate(divide='ignore', invalid='ignore'):
+        chi2 = np.sum((observed - expected) ** 2 / expected, axis=1)
+    chi2_df = max(len(observed) - 1 - ddof, 1)
+    chi2_pvalue = stats.chi2.sf(chi2, chi2_df)
+
+    return {
+        'ks': ks, 'ks_pvalue': ks_pvalue,
+        'ad': ad, 'ad_pvalue': ad_pvalue,
+        'chi2': chi2, 'chi2_df': np.full(m, chi2_df), 'chi2_pvalue': chi2_pvalue,
+        'min_expected': np.min(expected, axis=1),
+    }
+
+
+def gof_many_datasets(datasets, family, params, n_bins=DEFAULT_CHI2_BINS, ddof=0):
+    """
+    Prueba muchos conjuntos de datos (lista de arreglos) contra un modelo.
+
+    Devuelve el mismo diccionario que 'gof_batch', con un elemento por
+    conjunto de datos.
+    """
+    arrays = [np.asarray(d, dtype=float).ravel() for d in datasets]
+    arrays = [a[np.isfinite(a)] for a in arrays]
+    sizes = np.array([len(a) for a in arrays])
+    if np.any(sizes < 2):
+        raise ValueError("Cada conjunto necesita al menos 2 datos finitos.")
+
+    values = np.concatenate(arrays)
+    groups = np.repeat(np.arange(len(arrays)), sizes)
+    order = np.lexsort((values, groups))
+    x = values[order]
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    dist = make_distribution(family, **params)
+    discrete = FAMILIES[family]['kind'] == 'discrete'
+    n = np.repeat(sizes, sizes).astype(float)
+    i = np.arange(len(x)) - np.repeat(starts, sizes) + 1
+
+    # --- Kolmogorov-Smirnov ---
+    cdf = dist.cdf(x)
+    cdf_left = dist.cdf(x - 1) if discrete else cdf
+    ks = np.maximum(np.maximum.reduceat(i / n - cdf, starts),
+                    np.maximum.reduceat(cdf_left - (i - 1) / n, starts))
+    ks_pvalue = np.full(len(arrays), np.nan) if discrete else stats.kstwo.sf(ks, sizes)
+
+    # --- Anderson-Darling ---
+    if discrete:
+        ad = np.full(len(arrays), np.nan)
+        ad_pvalue = np.full(len(arrays), np.nan)
+    else:
+        log_cdf, log_sf = _log_cdf_sf(dist, x, cdf)
+        # Índice espejo n+1-i dentro de cada grupo
+        mirror = np.repeat(starts, sizes) + (n.astype(int) - i)
+        terms = (2 * i - 1) / n * (log_cdf + log_sf[mirror])
+        ad = -sizes - np.add.reduceat(terms, starts)
+        ad_pvalue = _ad_pvalue(ad)
+
+    # --- Chi-Cuadrado (cubos por conjunto, CDF de los bordes en una llamada) ---
+    edges_list = [_chi2_edges(x[s:s + k], n_bins, discrete) for s, k in zip(starts, sizes)]
+    cdf_edges = np.split(dist.cdf(np.concatenate(edges_list)), np.cumsum([len(e) for e in edges_list])[:-1])
+    chi2 = np.empty(len(arrays))
+    chi2_df = np.empty(len(arrays))
+    min_expected = np.empty(len(arrays))
+    for g, (s, k, edges, f_edges) in enumerate(zip(starts, sizes, edges_list, cdf_edges)):
+        observed = np.diff(np.concatenate([[0], np.searchsorted(x[s:s + k], edges, side='right'), [k]]))
+        expected = k * np.diff(np.concatenate([[0.0], f_edges, [1.0]]))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            chi2[g] = np.sum((observed - expected) ** 2 / expected)
+        chi2_df[g] = max(len(observed) - 1 - ddof, 1)
+        min_expected[g] = np.min(expected)
+
+    return {
+        'ks': ks, 'ks_pvalue': ks_pvalue,
+        'ad': ad, 'ad_pvalue': ad_pvalue,
+        'chi2': chi2, 'chi2_df': chi2_df, 'chi2_pvalue': stats.chi2.sf(chi2, chi2_df),
+        'min_expected': min_expected,
+    }
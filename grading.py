@@ -0,0 +1,171 @@
+import argparse
+import csv
+import gc
+import sys
+import time
+
+import numpy as np
+
+from exercises import TEMPLATES_BY_ID, ANSWER_RTOL, ANSWER_ATOL
+
+# --- Corrección Masiva sin Streamlit ---
+# Lee un CSV con columnas student, page, exercise, parameters, answer:
+#
+#     student,page,exercise,parameters,answer
+#     ana,binomial,bin_pmf,n=15;p=0.5;k=7,0.1964
+#
+# 'exercise' es el id de una plantilla de 'exercises.py' y 'parameters'
+# los valores que vio el estudiante (nombre=valor separados por ';').
+# Solo se pueden corregir los ejercicios generados a partir de esas
+# plantillas: los ejercicios fijos de cada página (ex1, ex2, ex3...) no
+# tienen plantilla y cuentan como inválidos. 'page' debe ser la página de
+# la plantilla (su clave en families.py); si no coincide, la fila también
+# cuenta como inválida.
+# Las respuestas correctas se recalculan agrupando por ejercicio: los
+# textos de parámetros se deduplican (muchos estudiantes comparten
+# variante) y cada grupo se resuelve con una sola llamada vectorizada de
+# SciPy. La tolerancia es la misma np.isclose de los ejercicios generados.
+#
+# Uso:  python grading.py respuestas.csv resultados.csv [--details detalle.csv]
+
+COLUMNS = ('student', 'page', 'exercise', 'parameters', 'answer')
+
+
+def read_submissions(path):
+    """Lee el CSV y devuelve un diccionario de arreglos por columna."""
+    # Millones de listas pequeñas disparan el recolector cíclico una y otra
+    # vez sin liberar nada; se pausa mientras se lee.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = [name.strip().lower() for name in next(reader)]
+            missing = [name for name in COLUMNS if name not in header]
+            if missing:
+                raise ValueError(f"Faltan columnas en el CSV: {', '.join(missing)}")
+            rows = [row for row in reader if len(row) >= len(header)]
+        index = {name: header.index(name) for name in COLUMNS}
+        data = {name: np.array([row[index[name]] for row in rows], dtype=str) for name in COLUMNS}
+    finally:
+        if gc_enabled:
+            gc.enable()
+    data['answer'] = _to_float(data['answer'])
+    return data
+
+
+def _to_float(values):
+    # Conversión vectorizada; si hay textos no numéricos se recurre a la
+    # conversión fila a fila y esas respuestas cuentan como incorrectas (NaN)
+    values = np.char.replace(np.char.strip(values), ',', '.')
+    try:
+        return values.astype(float)
+    except ValueError:
+        out = np.full(len(values), np.nan)
+        for i, value in enumerate(values):
+            try:
+                out[i] = float(value)
+            except ValueError:
+                pass
+        return out
+
+
+def _parse_parameters(text, names):
+    # 'n=15;p=0.5;k=7' -> (15.0, 0.5, 7.0) en el orden de la plantilla
+    pairs = dict(item.split('=', 1) for item in str(text).replace(' ', '').split(';') if item)
+    return tuple(float(pairs[name]) for name in names)
+
+
+def expected_answers(exercise, parameters, page=None):
+    """
+    Respuesta correcta de cada fila (NaN si el ejercicio no existe, los
+    parámetros no se pueden leer o 'page' no es la página de la
+    plantilla). Una llamada vectorizada por ejercicio.
+    """
+    exercise = np.asarray(exercise, dtype=str)
+    parameters = np.asarray(parameters, dtype=str)
+    expected = np.full(len(exercise), np.nan)
+
+    exercise_ids, exercise_inverse = np.unique(exercise, return_inverse=True)
+    for group, template_id in enumerate(exercise_ids):
+        template = TEMPLATES_BY_ID.get(template_id)
+        if template is None:
+            continue
+        rows = np.nonzero(exercise_inverse == group)[0]
+        texts, inverse = np.unique(parameters[rows], return_inverse=True)
+
+        names = list(template['params'])
+        values = np.full((len(texts), len(names)), np.nan)
+        for i, text in enumerate(texts):
+            try:
+                values[i] = _parse_parameters(text, names)
+            except (KeyError, ValueError):
+                pass
+        valid = ~np.isnan(values).any(axis=1)
+
+        answers = np.full(len(texts), np.nan)
+        if np.any(valid):
+            with np.errstate(all='ignore'):
+                answers[valid] = template['answer'](**{name: values[valid, j] for j, name in enumerate(names)})
+        expected[rows] = answers[inverse]
+        if page is not None:
+            wrong_page = rows[np.asarray(page, dtype=str)[rows] != template['page']]
+            expected[wrong_page] = np.nan
+    return expected
+
+
+def grade(exercise, parameters, answer, page=None):
+    """Devuelve (esperada, correcta) por fila."""
+    expected = expected_answers(exercise, parameters, page)
+    correct = np.isclose(answer, expected, rtol=ANSWER_RTOL, atol=ANSWER_ATOL)
+    return expected, correct
+
+
+def summarize_by_student(student, expected, correct):
+    """
+    Resumen por estudiante: filas (student, respondidas, correctas,
+    inválidas, puntaje) ordenadas por estudiante.
+    """
+    students, inverse = np.unique(np.asarray(student, dtype=str), return_inverse=True)
+    answered = np.bincount(inverse, minlength=len(students))
+    n_correct = np.bincount(inverse, weights=correct, minlength=len(students)).astype(int)
+    invalid = np.bincount(inverse, weights=np.isnan(expected), minlength=len(students)).astype(int)
+    score = n_correct / answered
+    return list(zip(students, answered, n_correct, invalid, np.round(score, 4)))
+
+
+def grade_file(input_path, output_path, details_path=None):
+    """Corrige 'input_path' y escribe el resumen (y opcionalmente el detalle)."""
+    data = read_submissions(input_path)
+    expected, correct = grade(data['exercise'], data['parameters'], data['answer'], np.char.lower(np.char.strip(data['page'])))
+
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['student', 'respondidas', 'correctas', 'invalidas', 'puntaje'])
+        writer.writerows(summarize_by_student(data['student'], expected, correct))
+
+    if details_path:
+        with open(details_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(list(COLUMNS) + ['esperada', 'correcta'])
+            # .tolist(): escribir tipos de Python es mucho más rápido que escalares numpy
+            writer.writerows(zip(*(column.tolist() for column in (
+                data['student'], data['page'], data['exercise'], data['parameters'],
+                data['answer'], np.round(expected, 6), correct.astype(int)))))
+    return len(expected), int(correct.sum())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Corrige en bloque las respuestas de los estudiantes (sin Streamlit).")
+    parser.add_argument('input', help="CSV con columnas student, page, exercise, parameters, answer")
+    parser.add_argument('output', help="CSV de salida con el resumen por estudiante")
+    parser.add_argument('--details', help="CSV opcional con la corrección de cada fila")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    n_rows, n_correct = grade_file(args.input, args.output, args.details)
+    print(f"{n_rows} respuestas corregidas ({n_correct} correctas) en {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
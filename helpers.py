@@ -2,11 +2,139 @@ import streamlit as st
 import numpy as np
 import scipy.stats as stats
 import matplotlib.pyplot as plt
+import os
+import stat
+
+from streaming_stats import summarize_source, moment_estimates, DEFAULT_CHUNK
+from ecdf import load_values, compute_ecdf, file_digest, ks_distance
+from truncation import Truncated
+from queries import IntervalQuery
+from exercises import load_bank, templates_for_page, BANK_VERSION
+from progress import ProgressStore
+from conjugate import POSTERIORS, simulated_feed, file_feed, run_stream
+from disk_cache import DiskCache, make_key, dist_fingerprint
+from shm_store import SharedStore, SHM_ENABLED
+from timing import timer, timed, counted_cache, CACHE_COUNTERS, REGISTRY, STAGES, BUCKETS, finish_rerun, rerun_trace, current_page
+from figures import managed_figure, TRACKER
+from rendering import FORMATS, DEFAULT_OPTIONS, MOBILE_WIDTH, DEFAULT_WIDTH, SENT, render_image, options_for_width, is_mobile
+
+DEBUG_PANEL = os.environ.get('DISTRIBUCIONES_DEBUG', '0') not in ('0', 'false', 'no')
+# Directorio del servidor con archivos de datos grandes que las páginas
+# pueden leer sin subirlos. Sin definir, solo se admiten archivos subidos.
+DATA_DIR = os.environ.get('DISTRIBUCIONES_DATA_DIR', '')
 
 # --- Funciones de Ayuda (Helpers) ---
 # Este archivo contiene las correcciones para AMBAS funciones.
 
-@st.cache_data
+@st.cache_resource
+def get_disk_cache():
+    """Caché en disco compartida por las sesiones (y por otros procesos)."""
+    return DiskCache()
+
+
+@st.cache_resource
+def get_shared_store():
+    """
+    Almacén en memoria compartida entre los procesos de Streamlit de esta
+    máquina (shm_store.py), o None si está desactivado o no se pudo abrir.
+    """
+    if not SHM_ENABLED:
+        return None
+    try:
+        store = SharedStore()
+    except OSError:
+        return None
+    REGISTRY.register('distribuciones_shm_hits_total', 'counter',
+                      "Lecturas servidas por la memoria compartida.", lambda: store.metrics()['hits'])
+    REGISTRY.register('distribuciones_shm_misses_total', 'counter',
+                      "Lecturas que no estaban en la memoria compartida.", lambda: store.metrics()['misses'])
+    REGISTRY.register('distribuciones_shm_bytes', 'gauge',
+                      "Bytes guardados en la memoria compartida.", lambda: store.metrics()['bytes'])
+    return store
+
+
+def _evaluate(_dist_obj, method, x):
+    """
+    _dist_obj.<method>(x), compartido con los demás procesos: si otro ya
+    evaluó la misma distribución en los mismos puntos, se usa su arreglo
+    (de solo lectura) sin volver a calcularlo.
+    """
+    store = get_shared_store()
+    fingerprint = dist_fingerprint(_dist_obj)
+    if store is None or fingerprint is None:
+        return getattr(_dist_obj, method)(x)
+    key = make_key('evaluacion', method, fingerprint, np.asarray(x))
+    values = store.get_array(key)
+    if values is None:
+        values = getattr(_dist_obj, method)(x)
+        store.put_array(key, values)
+    return values
+
+
+@timed('rasterizacion')
+def _render_image(fig, options=DEFAULT_OPTIONS):
+    return render_image(fig, options)
+
+
+def render_options():
+    """
+    Opciones de render (rendering.RenderOptions) para el navegador de
+    esta sesión: el ancho sale de ?ancho=<px> en la URL o, si no está, del
+    User-Agent (móvil o escritorio).
+    """
+    try:
+        width = int(st.query_params.get('ancho', ''))
+    except ValueError:
+        width = None
+    if width is None or width <= 0:
+        try:
+            user_agent = st.context.headers.get('User-Agent', '')
+        except Exception:
+            # Sin una sesión de navegador (scripts, pruebas)
+            user_agent = ''
+        width = MOBILE_WIDTH if is_mobile(user_agent) else DEFAULT_WIDTH
+    return options_for_width(width)
+
+
+def show_figure(fig, *key_parts):
+    """
+    Muestra 'fig' y la cierra (también si la rasterización o el envío
+    fallan).
+
+    La imagen se rasteriza con la resolución y la codificación que
+    corresponden al navegador de la sesión (render_options). Con
+    'key_parts' (familia, parámetros y opciones que determinan el
+    gráfico) la imagen se busca primero en la caché en disco; si no está,
+    se rasteriza una vez y se guarda para todos los procesos y reinicios
+    siguientes.
+    """
+    options = render_options()
+    with managed_figure(fig):
+        if key_parts:
+            image = cached_png(fig, *key_parts, options=options)
+        else:
+            image = _render_image(fig, options)
+        with timer('envio'):
+            st.image(image, width='stretch')
+        SENT.record(image)
+
+
+def cached_png(fig, *key_parts, options=DEFAULT_OPTIONS):
+    """
+    Imagen de 'fig' desde la memoria compartida o, si no está, desde la
+    caché en disco (se rasteriza solo si falta en ambas).
+    """
+    key = make_key('figura', *key_parts, *options)
+    store = get_shared_store()
+    image = store.get_bytes(key) if store is not None else None
+    if image is None:
+        image = get_disk_cache().get_or_compute(key, lambda: _render_image(fig, options), FORMATS[options.format])
+        if store is not None:
+            store.put_bytes(key, image)
+    return image
+
+
+@counted_cache('plot_discrete_distribution', st.cache_data)
 def plot_discrete_distribution(_dist_obj, k_values, title):
     """
     Genera un gráfico de barras (PMF) para una distribución discreta.
@@ -15,9 +143,21 @@ def plot_discrete_distribution(_dist_obj, k_values, title):
     indicarle a Streamlit que no intente hashearlo.
     """
     # Usamos la variable con guion bajo: _dist_obj
-    pmf_values = _dist_obj.pmf(k_values)
+    with timer('evaluacion'):
+        pmf_values = _evaluate(_dist_obj, 'pmf', k_values)
     
+    with timer('figura'):
+        return _pmf_figure(_dist_obj, k_values, pmf_values, title)
+
+
+def _pmf_figure(_dist_obj, k_values, pmf_values, title):
     fig, ax = plt.subplots(figsize=(10, 6))
+    with managed_figure(fig, keep=True):
+        _draw_pmf(ax, _dist_obj, k_values, pmf_values, title)
+    return fig
+
+
+def _draw_pmf(ax, _dist_obj, k_values, pmf_values, title):
     ax.bar(k_values, pmf_values, label=r'PMF P(X=k)', color='skyblue', edgecolor='black', zorder=2)
     
     # Añadir línea de la media
@@ -37,10 +177,8 @@ def plot_discrete_distribution(_dist_obj, k_values, title):
             ax.set_xticks(int_k_values)
         else:
             ax.xaxis.set_major_locator(plt.MaxNLocator(integer=True))
-    
-    return fig
 
-@st.cache_data
+@counted_cache('plot_continuous_distribution', st.cache_data)
 def plot_continuous_distribution(_dist_obj, x_min, x_max, title):
     """
     Genera un gráfico de línea (PDF) para una distribución continua.
@@ -51,9 +189,21 @@ def plot_continuous_distribution(_dist_obj, x_min, x_max, title):
     x_values = np.linspace(x_min, x_max, 500)
     # --- CORRECIÓN APLICADA ---
     # Usamos la variable con guion bajo: _dist_obj
-    pdf_values = _dist_obj.pdf(x_values)
+    with timer('evaluacion'):
+        pdf_values = _evaluate(_dist_obj, 'pdf', x_values)
     
+    with timer('figura'):
+        return _pdf_figure(_dist_obj, x_values, pdf_values, title)
+
+
+def _pdf_figure(_dist_obj, x_values, pdf_values, title):
     fig, ax = plt.subplots(figsize=(10, 6))
+    with managed_figure(fig, keep=True):
+        _draw_pdf(ax, _dist_obj, x_values, pdf_values, title)
+    return fig
+
+
+def _draw_pdf(ax, _dist_obj, x_values, pdf_values, title):
     ax.plot(x_values, pdf_values, label=r'PDF f(x)', color='royalblue', linewidth=2, zorder=2)
     ax.fill_between(x_values, pdf_values, color='royalblue', alpha=0.2, zorder=1)
     
@@ -67,5 +217,560 @@ def plot_continuous_distribution(_dist_obj, x_min, x_max, title):
     ax.legend()
     ax.grid(axis='y', linestyle='--', alpha=0.7, zorder=0)
     ax.set_ylim(bottom=0)
-    
+
+
+@counted_cache('summarize_data_source', st.cache_data(show_spinner="Resumiendo datos en una sola pasada..."))
+def summarize_data_source(source, column, mtime=None, size=None):
+    """
+    Resume un archivo (ruta de DATA_DIR o bytes subidos) con 'streaming_stats'.
+
+    Para rutas, 'mtime' y 'size' forman parte de la clave de caché para
+    detectar cambios en el archivo sin volver a leerlo.
+    """
+    return summarize_source(source, column=column)
+
+
+def data_dir_files():
+    """Archivos regulares de DATA_DIR (sin enlaces simbólicos ni subdirectorios)."""
+    if not DATA_DIR:
+        return []
+    try:
+        with os.scandir(DATA_DIR) as entries:
+            return sorted(e.name for e in entries if e.is_file(follow_symlinks=False))
+    except OSError:
+        return []
+
+
+def data_dir_select(label, key):
+    """
+    Selector de un archivo de DATA_DIR. Devuelve (ruta, os.stat) del
+    archivo elegido, o None si no hay directorio de datos, no se eligió
+    ninguno o ya no es un archivo regular. Solo se listan archivos de ese
+    directorio: el usuario no puede escribir rutas arbitrarias del servidor.
+    """
+    names = data_dir_files()
+    if not names:
+        return None
+    name = st.selectbox(label, [''] + names, format_func=lambda n: n or "(ninguno)", key=key)
+    if not name:
+        return None
+    path = os.path.join(DATA_DIR, name)
+    try:
+        info = os.lstat(path)
+    except OSError as e:
+        st.error(f"No se pudo leer el archivo: {e}")
+        return None
+    if not stat.S_ISREG(info.st_mode):
+        st.error(f"'{name}' no es un archivo regular.")
+        return None
+    return path, info
+
+
+def _apply_estimates(widget_keys, estimates):
+    # Callback: se ejecuta antes de la siguiente ejecución del script,
+    # así los number_input de la calculadora toman los nuevos valores.
+    for name, key in widget_keys.items():
+        st.session_state[key] = round(float(estimates[name]), 4)
+
+
+def moment_estimates_expander(family, widget_keys, key_prefix):
+    """
+    Expander "Estimar parámetros desde datos" para las calculadoras.
+
+    Lee un archivo subido o de DATA_DIR (CSV, .npy o binario) en una
+    sola pasada, muestra el resumen y ofrece copiar los estimadores por
+    momentos de 'family' en los campos indicados por 'widget_keys'
+    ({parámetro: key del widget}).
+    """
+    with st.expander("Estimar parámetros desde datos"):
+        uploaded = st.file_uploader("Archivo CSV / TXT", type=['csv', 'txt'], key=f'{key_prefix}_mom_file')
+        local = data_dir_select("...o archivo del servidor (archivos grandes: .csv, .npy, .bin)", f'{key_prefix}_mom_path')
+        column = st.number_input("Columna (empezando en 0)", min_value=0, value=0, step=1, key=f'{key_prefix}_mom_column')
+
+        try:
+            if local:
+                path, info = local
+                summary = summarize_data_source(path, column, info.st_mtime, info.st_size)
+            elif uploaded is not None:
+                summary = summarize_data_source(uploaded.getvalue(), column)
+            else:
+                return
+        except Exception as e:
+            st.error(f"No se pudo leer los datos: {e}")
+            return
+
+        moments = summary.moments
+        if moments.count < 2:
+            st.warning("Se necesitan al menos 2 datos numéricos.")
+            return
+
+        st.markdown(f"**n:** `{moments.count}` · **Media:** `{moments.mean:.4f}` · **Varianza:** `{moments.variance():.4f}`")
+        st.markdown(f"**Asimetría:** `{moments.skewness():.4f}` · **Curtosis (exceso):** `{moments.kurtosis():.4f}` · **Mín / Máx:** `{moments.min:.4f}` / `{moments.max:.4f}`")
+        st.markdown(f"**Mediana (aprox.):** `{float(summary.sketch.quantile(0.5)):.4f}`")
+
+        estimates = moment_estimates(moments).get(family)
+        if estimates is None:
+            st.warning("Los datos no son compatibles con esta distribución (revisa el rango de valores).")
+            return
+        st.markdown("**Estimación por momentos:** " + ", ".join(f"`{name} = {value:.4f}`" for name, value in estimates.items()))
+        st.button("Usar estos valores en la calculadora", key=f'{key_prefix}_mom_apply',
+                  on_click=_apply_estimates, args=(widget_keys, estimates))
+
+
+@counted_cache('empirical_cdf', st.cache_data(show_spinner="Calculando la CDF empírica..."))
+def empirical_cdf(file_key, column, _source, name=None):
+    """
+    CDF empírica reducida a resolución de pantalla.
+
+    Solo 'file_key' (hash del contenido, o ruta + fecha + tamaño) y
+    'column' forman la clave de caché: cambiar los parámetros del modelo
+    no vuelve a leer ni a ordenar los datos.
+    """
+    # Persistida en disco: tras un reinicio no se vuelve a leer ni ordenar el archivo
+    cache = get_disk_cache()
+    key = make_key('ecdf', file_key, column)
+    cached = cache.get_arrays(key)
+    if cached is not None:
+        x, y, n, method = cached
+        return x, y, int(n), str(method)
+    values = load_values(_source, column=column, name=name)
+    x, y, n, method = compute_ecdf(values)
+    cache.put_arrays(key, x, y, n, method)
+    return x, y, n, method
+
+
+@counted_cache('plot_cdf_comparison', st.cache_data)
+def plot_cdf_comparison(_dist_obj, x_min, x_max, title, discrete, ecdf_x, ecdf_y):
+    """
+    Grafica la CDF teórica y superpone la CDF empírica (escalones).
+    """
+    fig, ax = plt.subplots(figsize=(10, 6))
+    with managed_figure(fig, keep=True):
+        if discrete:
+            k_values = np.arange(np.floor(x_min), np.ceil(x_max) + 1)
+            ax.step(k_values, _dist_obj.cdf(k_values), where='post', label=r'CDF teórica F(x)', color='royalblue', linewidth=2, zorder=2)
+        else:
+            x_values = np.linspace(x_min, x_max, 500)
+            ax.plot(x_values, _dist_obj.cdf(x_values), label=r'CDF teórica F(x)', color='royalblue', linewidth=2, zorder=2)
+        ax.plot(ecdf_x, ecdf_y, drawstyle='steps-post', label=r'CDF empírica $F_n(x)$', color='darkorange', linewidth=1.5, zorder=3)
+
+        ax.set_title(title, fontsize=16)
+        ax.set_xlabel('Valor (x)', fontsize=12)
+        ax.set_ylabel(r'Probabilidad Acumulada P(X ≤ x)', fontsize=12)
+        ax.legend()
+        ax.grid(axis='y', linestyle='--', alpha=0.7, zorder=0)
+        ax.set_ylim(0, 1.05)
     return fig
+
+
+def empirical_cdf_expander(dist, x_min, x_max, title, key_prefix, discrete=False):
+    """
+    Expander "Comparar con tus datos" para la pestaña de Visualización:
+    superpone la CDF empírica de un archivo (.npy, .csv o .parquet) a la
+    CDF teórica de la página.
+    """
+    with st.expander("Comparar con tus datos (CDF empírica)"):
+        uploaded = st.file_uploader("Archivo de datos", type=['npy', 'csv', 'txt', 'parquet'], key=f'{key_prefix}_ecdf_file')
+        local = data_dir_select("...o archivo del servidor (archivos grandes)", f'{key_prefix}_ecdf_path')
+        column = st.number_input("Columna (empezando en 0)", min_value=0, value=0, step=1, key=f'{key_prefix}_ecdf_column')
+
+        try:
+            if local:
+                path, info = local
+                ecdf_x, ecdf_y, n, method = empirical_cdf(f"{path}:{info.st_mtime}:{info.st_size}", column, path)
+            elif uploaded is not None:
+                raw = uploaded.getvalue()
+                ecdf_x, ecdf_y, n, method = empirical_cdf(file_digest(raw), column, raw, name=uploaded.name)
+            else:
+                return
+        except Exception as e:
+            st.error(f"No se pudo leer los datos: {e}")
+            return
+
+        lo = min(x_min, ecdf_x[0])
+        hi = max(x_max, ecdf_x[-1])
+        with managed_figure(plot_cdf_comparison(dist, lo, hi, title, discrete, ecdf_x, ecdf_y)) as fig:
+            fingerprint = dist_fingerprint(dist)
+            if fingerprint is None:
+                show_figure(fig)
+            else:
+                show_figure(fig, 'ecdf', fingerprint, title, lo, hi, discrete, ecdf_x, ecdf_y)
+        st.markdown(f"**Datos (n):** `{n}` · **Método:** `{method}` · **Distancia máxima |F_n - F| (aprox.):** `{ks_distance(dist, ecdf_x, ecdf_y, discrete):.4f}`")
+
+
+def _parse_bound(text):
+    # Acepta números y también "inf" / "-inf" (sin límite)
+    return float(text.strip().replace(',', '.').replace('∞', 'inf'))
+
+
+def truncation_figure(dist, truncated, title, a, b, loc, scale, discrete):
+    """
+    Gráfico de la distribución truncada y las partes de su clave de caché
+    (vacías si 'dist' no se puede identificar por sus parámetros).
+    """
+    label = f"{title} | loc={loc:g}, escala={scale:g}, [{a:g}, {b:g}]"
+    if discrete:
+        k_values = np.arange(truncated.ppf(1e-4), truncated.ppf(1 - 1e-4) + 1)
+        fig = plot_discrete_distribution(truncated, k_values, label)
+    else:
+        fig = plot_continuous_distribution(truncated, float(truncated.ppf(0.001)), float(truncated.ppf(0.999)), label)
+    with managed_figure(fig, keep=True):
+        fingerprint = dist_fingerprint(dist)
+    if fingerprint is None:
+        return fig, ()
+    return fig, ('truncada', fingerprint, label, a, b, loc, scale, discrete)
+
+
+def truncation_expander(dist, title, key_prefix, discrete=False):
+    """
+    Expander "Truncar y trasladar" para la pestaña de Visualización:
+    Y = loc + scale · X restringida a [a, b], con masa retenida, gráfico,
+    cuantiles y muestreo por transformada inversa ('truncation.Truncated').
+    """
+    with st.expander("Truncar y trasladar (Y = loc + escala · X, a ≤ Y ≤ b)"):
+        cols = st.columns(4)
+        with cols[0]:
+            a_text = st.text_input("Límite inferior a", value="-inf", key=f'{key_prefix}_trunc_a')
+        with cols[1]:
+            b_text = st.text_input("Límite superior b", value="inf", key=f'{key_prefix}_trunc_b')
+        with cols[2]:
+            if discrete:
+                loc = st.number_input("Desplazamiento (loc)", value=0, step=1, key=f'{key_prefix}_trunc_loc')
+            else:
+                loc = st.number_input("Desplazamiento (loc)", value=0.0, step=0.1, key=f'{key_prefix}_trunc_loc')
+        with cols[3]:
+            if discrete:
+                scale = 1.0
+                st.caption("En distribuciones discretas la escala es 1.")
+            else:
+                scale = st.number_input("Escala", min_value=0.0001, value=1.0, step=0.1, key=f'{key_prefix}_trunc_scale')
+
+        try:
+            a, b = _parse_bound(a_text), _parse_bound(b_text)
+            truncated = Truncated(dist, a=a, b=b, loc=loc, scale=scale, discrete=discrete)
+        except ValueError as e:
+            st.error(f"Parámetros de truncación inválidos: {e}")
+            return
+
+        mass = truncated.mass
+        mass_text = f"{mass:.6f}" if mass >= 1e-4 else f"{mass:.4e} (log₁₀ = {truncated.log_mass / np.log(10):.2f})"
+        st.markdown(f"**Masa retenida P(a ≤ Y ≤ b):** `{mass_text}`")
+
+        fig, key_parts = truncation_figure(dist, truncated, title, a, b, loc, scale, discrete)
+        show_figure(fig, *key_parts)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            q = st.number_input("Probabilidad (q)", min_value=0.0, max_value=1.0, value=0.5, step=0.01, format="%.4f", key=f'{key_prefix}_trunc_q')
+            st.markdown(f"**Cuantil $y_{{{q:.4f}}}$:** `{float(truncated.ppf(q)):.6f}`")
+            st.markdown(f"**Media:** `{format_moment(truncated.mean())}` · **Desv. estándar:** `{format_moment(truncated.std())}`")
+        with col2:
+            n_samples = st.number_input("Tamaño de la muestra", min_value=1, max_value=1_000_000, value=10_000, step=1000, key=f'{key_prefix}_trunc_n')
+            samples = truncated.rvs(size=int(n_samples), random_state=0)
+            st.markdown(f"**Media muestral:** `{samples.mean():.4f}`")
+            st.markdown(f"**Mín / Máx muestral:** `{samples.min():.4f}` / `{samples.max():.4f}`")
+
+
+def _posterior_figure(prior, posterior, param_label):
+    # A priori y a posteriori en el rango donde la a posteriori tiene masa;
+    # con muchos datos la a posteriori es muy estrecha y la a priori se ve
+    # casi plana en esa ventana.
+    post = posterior.dist()
+    lo, hi = post.ppf(0.0005), post.ppf(0.9995)
+    pad = 0.1 * (hi - lo)
+    x_values = np.linspace(max(lo - pad, prior.support()[0]), hi + pad, 500)
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    with managed_figure(fig, keep=True):
+        ax.plot(x_values, prior.pdf(x_values), label='A priori', color='gray', linestyle='--', linewidth=1.5, zorder=2)
+        ax.plot(x_values, post.pdf(x_values), label='A posteriori', color='royalblue', linewidth=2, zorder=3)
+        ax.fill_between(x_values, post.pdf(x_values), color='royalblue', alpha=0.2, zorder=1)
+        ax.axvline(post.mean(), color='red', linestyle='--', linewidth=2, label=f'Media a posteriori ({post.mean():.4f})', zorder=4)
+        ax.set_title(f"{posterior.label}: {posterior.n_obs:,} observaciones", fontsize=16)
+        ax.set_xlabel(param_label, fontsize=12)
+        ax.set_ylabel('Densidad', fontsize=12)
+        ax.legend()
+        ax.grid(axis='y', linestyle='--', alpha=0.7, zorder=0)
+        ax.set_ylim(bottom=0)
+    return fig
+
+
+def bayesian_update_tab(model, key_prefix):
+    """
+    Contenido de la pestaña "Actualización Bayesiana": consume un flujo
+    (simulado o desde archivo) de resultados Bernoulli ('beta_binomial') o
+    conteos Poisson ('gamma_poisson') con 'conjugate.run_stream' y redibuja
+    la a posteriori a ritmo limitado. El estado (solo los hiperparámetros)
+    se guarda en session_state, así que cada flujo continúa el anterior.
+    """
+    is_beta = model == 'beta_binomial'
+    param_label = 'Probabilidad p' if is_beta else 'Tasa λ'
+
+    st.subheader("A priori")
+    col1, col2 = st.columns(2)
+    with col1:
+        prior_alpha = st.number_input("α a priori", min_value=0.01, value=1.0 if is_beta else 2.0, step=0.5, key=f'{key_prefix}_bayes_alpha')
+    with col2:
+        prior_beta = st.number_input("β a priori" + ("" if is_beta else " (escala)"), min_value=0.01, value=1.0, step=0.5, key=f'{key_prefix}_bayes_beta')
+
+    state_key = f'{key_prefix}_bayes_state'
+    prior_params = (prior_alpha, prior_beta)
+    if st.session_state.get(state_key, (None,))[0] != prior_params:
+        # Nueva a priori: se descarta la a posteriori acumulada
+        st.session_state[state_key] = (prior_params, POSTERIORS[model](*prior_params))
+    posterior = st.session_state[state_key][1]
+    prior = POSTERIORS[model](*prior_params).dist()
+
+    st.subheader("Flujo de observaciones")
+    source = st.radio("Origen", ['simulado', 'archivo'], format_func={'simulado': "Flujo simulado", 'archivo': "Archivo (CSV, .npy, .bin)"}.get,
+                      horizontal=True, key=f'{key_prefix}_bayes_source')
+    if source == 'simulado':
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if is_beta:
+                true_value = st.number_input("p verdadera", min_value=0.0, max_value=1.0, value=0.3, step=0.01, key=f'{key_prefix}_bayes_true')
+            else:
+                true_value = st.number_input("λ verdadera", min_value=0.0, value=4.0, step=0.5, key=f'{key_prefix}_bayes_true')
+        with col2:
+            total = st.number_input("Observaciones", min_value=1, max_value=100_000_000, value=1_000_000, step=100_000, key=f'{key_prefix}_bayes_total')
+        with col3:
+            batch_size = st.number_input("Tamaño de lote", min_value=1, max_value=DEFAULT_CHUNK, value=50_000, step=10_000, key=f'{key_prefix}_bayes_batch')
+        seed = st.session_state.get(f'{key_prefix}_bayes_runs', 0)
+        make_feed = lambda: simulated_feed(model, true_value, total, batch_size=int(batch_size), seed=seed)
+    else:
+        uploaded = st.file_uploader("Archivo (una observación por fila)", type=['csv', 'txt'], key=f'{key_prefix}_bayes_file')
+        local = data_dir_select("...o archivo del servidor (archivos grandes)", f'{key_prefix}_bayes_path')
+        column = st.number_input("Columna (empezando en 0)", min_value=0, value=0, step=1, key=f'{key_prefix}_bayes_column')
+        if local:
+            path = local[0]
+            make_feed = lambda: file_feed(path, column=column)
+        elif uploaded is not None:
+            make_feed = lambda: file_feed(uploaded.getvalue(), column=column)
+        else:
+            make_feed = None
+
+    col1, col2 = st.columns(2)
+    with col1:
+        run = st.button("Procesar flujo", key=f'{key_prefix}_bayes_run', disabled=make_feed is None)
+    with col2:
+        if st.button("Reiniciar a la a priori", key=f'{key_prefix}_bayes_reset'):
+            posterior = POSTERIORS[model](*prior_params)
+            st.session_state[state_key] = (prior_params, posterior)
+
+    placeholder = st.empty()
+
+    def render(current):
+        with placeholder.container():
+            show_figure(_posterior_figure(prior, current, param_label))
+            post = current.dist()
+            low, high = post.interval(0.95)
+            st.markdown(f"**Observaciones:** `{current.n_obs:,}` · **α:** `{current.alpha:.6g}` · **β:** `{current.beta:.6g}`")
+            st.markdown(f"**Media a posteriori:** `{post.mean():.6f}` · **Intervalo creíble 95%:** `[{low:.6f}, {high:.6f}]`")
+
+    if run:
+        try:
+            run_stream(posterior, make_feed(), on_render=render)
+        except Exception as e:
+            # Los lotes anteriores al error ya quedaron incorporados
+            st.error(f"Error al procesar el flujo: {e}")
+            render(posterior)
+        if source == 'simulado':
+            # Otra semilla: volver a pulsar simula observaciones nuevas
+            st.session_state[f'{key_prefix}_bayes_runs'] = seed + 1
+    else:
+        render(posterior)
+
+
+def format_prob(p):
+    """Probabilidad con 6 decimales, o en notación científica si es muy pequeña."""
+    p = float(p)
+    return f"{p:.6f}" if p == 0 or p >= 1e-4 else f"{p:.4e}"
+
+
+def format_moment(value, digits=4):
+    """Media o varianza: 'no definida' si no existe, '∞' si diverge."""
+    value = float(value)
+    if np.isnan(value):
+        return "no definida"
+    if np.isinf(value):
+        return "∞" if value > 0 else "-∞"
+    return f"{value:.{digits}f}"
+
+
+def _parse_intervals(text):
+    # '-1:1, 2:inf' -> ([-1, 2], [1, inf])
+    pairs = [item.split(':') for item in text.replace(';', ',').split(',') if item.strip()]
+    if any(len(pair) != 2 for pair in pairs):
+        raise ValueError("Cada intervalo debe tener la forma a:b.")
+    return [_parse_bound(a) for a, _ in pairs], [_parse_bound(b) for _, b in pairs]
+
+
+def probability_query_expander(dist, key_prefix, discrete=False):
+    """
+    Expander "Consultas múltiples" para las calculadoras: muchas x e
+    intervalos a la vez, evaluados en una sola pasada con 'IntervalQuery'
+    (cada borde una vez, cdf o sf según el lado para no perder precisión).
+    """
+    with st.expander("Consultas múltiples (varios valores e intervalos)"):
+        x_text = st.text_input("Valores de x (separados por comas)", placeholder="ej. 1, 2.5, 10", key=f'{key_prefix}_query_x')
+        interval_text = st.text_input("Intervalos a:b (separados por comas; admite -inf / inf)", placeholder="ej. -1:1, 2:inf", key=f'{key_prefix}_query_ab')
+        try:
+            x = [_parse_bound(v) for v in x_text.replace(';', ',').split(',') if v.strip()]
+            a, b = _parse_intervals(interval_text)
+        except ValueError as e:
+            st.error(f"Entrada inválida: {e}")
+            return
+        if not x and not a:
+            return
+
+        result = IntervalQuery(dist, discrete=discrete).query(x=x, a=a, b=b)
+        if x:
+            st.dataframe([
+                {"x": value, "P(X ≤ x)": format_prob(le), "P(X > x)": format_prob(gt), "P(X ≥ x)": format_prob(ge)}
+                for value, le, gt, ge in zip(x, result['le'], result['gt'], result['ge'])
+            ])
+        if a:
+            st.dataframe([
+                {"a": lo, "b": hi, "P(a ≤ X ≤ b)": format_prob(p)}
+                for lo, hi, p in zip(a, b, result['between'])
+            ])
+
+
+@st.cache_resource(show_spinner="Preparando el banco de ejercicios...")
+def get_answer_bank(version):
+    """
+    Banco de respuestas compartido por todas las sesiones (se genera una
+    vez). 'version' forma parte de la clave: si cambian las plantillas, el
+    recurso se vuelve a crear en lugar de servir el banco anterior.
+    """
+    return load_bank()
+
+
+def _remember_student(widget_key):
+    # El id se guarda fuera del widget para conservarlo al cambiar de página
+    st.session_state['student_id'] = st.session_state[widget_key].strip()
+
+
+def _next_round(round_key):
+    st.session_state[round_key] = st.session_state.get(round_key, 0) + 1
+
+
+def generated_exercises(page, key_prefix):
+    """
+    Sección "Ejercicios Generados" para la pestaña de Ejercicios: variantes
+    de las plantillas de 'page' (ver 'exercises.py') elegidas por el id del
+    estudiante. La corrección es una búsqueda en el banco precalculado.
+    """
+    templates = templates_for_page(page)
+    if not templates:
+        return
+
+    st.divider()
+    st.subheader("Ejercicios Generados")
+    student_key = f'{key_prefix}_student'
+    student = st.text_input("Tu identificador de estudiante", value=st.session_state.get('student_id', ''),
+                            key=student_key, on_change=_remember_student, args=(student_key,)).strip()
+    if not student:
+        st.info("Escribe tu identificador para recibir tus propias variantes de los ejercicios.")
+        return
+
+    round_key = f'{key_prefix}_gen_round'
+    round_ = st.session_state.get(round_key, 0)
+    bank = get_answer_bank(BANK_VERSION)
+    for i, template in enumerate(templates, start=1):
+        template_id = template['id']
+        variant = bank.variant_for(student, template_id, round_)
+        st.write(f"**Ejercicio generado {i}:** {bank.question(template_id, variant)}")
+        answer = st.number_input("Tu respuesta:", step=0.001, format="%.4f", key=f'{key_prefix}_gen_{template_id}_{round_}_ans')
+        if st.button(f"Revisar generado {i}", key=f'{key_prefix}_gen_{template_id}_{round_}_btn'):
+            correct_ans = bank.answer(template_id, variant)
+            if record_attempt(page, template_id, answer, bank.check(template_id, variant, answer)):
+                st.success(f"¡Correcto! La respuesta es {correct_ans:.4f}.")
+            else:
+                st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.4f}.")
+
+    st.button("Otras variantes", key=f'{key_prefix}_gen_next', on_click=_next_round, args=(round_key,))
+
+
+@st.cache_resource
+def get_progress_store():
+    """Almacén de progreso compartido por todas las sesiones (un hilo escritor)."""
+    return ProgressStore()
+
+
+def record_attempt(page, exercise, answer, correct):
+    """
+    Guarda un intento de "Revisar" (sin bloquear: se encola) y devuelve
+    'correct', para usarlo directamente en el if del botón.
+    """
+    student = st.session_state.get('student_id') or 'anónimo'
+    get_progress_store().record(student, page, exercise, answer, correct)
+    return correct
+
+
+def _bucket_label(i):
+    return f"≤ {1000 * BUCKETS[i]:g} ms" if i < len(BUCKETS) else f"> {1000 * BUCKETS[-1]:g} ms"
+
+
+def debug_panel():
+    """
+    Se llama al final de cada página: cierra la medición del rerun,
+    escribe las métricas en formato Prometheus (como mucho cada pocos
+    segundos) y, con ?debug=1 en la URL o DISTRIBUCIONES_DEBUG=1, muestra
+    en la barra lateral los tiempos de este rerun y los recientes.
+    """
+    total = finish_rerun()
+    try:
+        REGISTRY.maybe_export()
+    except OSError:
+        pass
+    if not (DEBUG_PANEL or st.query_params.get('debug') == '1'):
+        return
+
+    page = current_page()
+    with st.sidebar.expander("Depuración: tiempos", expanded=True):
+        if total is not None:
+            st.markdown(f"**Este rerun:** `{1000 * total:.1f} ms`")
+        figures = TRACKER.metrics()
+        st.markdown(f"**Figuras vivas:** `{figures['live']}` · **cerradas:** `{figures['closed']}` "
+                    f"(`{figures['closed_on_error']}` tras un error)")
+        options = render_options()
+        st.markdown(f"**Imágenes:** `{options.dpi}` dpi, `{options.format}`"
+                    f"{f', paleta de `{options.colors}` colores' if options.colors else ''} · "
+                    f"**enviadas:** `{SENT.images}` (`{SENT.bytes / 1024:.0f} KB`)")
+        store = get_shared_store()
+        if store is not None:
+            shared = store.metrics()
+            st.markdown(f"**Memoria compartida:** `{shared['entries']}` entradas, `{shared['bytes'] / 1024:.0f} KB` · "
+                        f"aciertos `{shared['hits']}` / fallos `{shared['misses']}`")
+        cached = [
+            {"Función": name, "Llamadas": m['calls'], "Ejecuciones": m['executions'], "Ahorradas": m['saved']}
+            for name, m in ((name, counter.metrics()) for name, counter in sorted(CACHE_COUNTERS.items()))
+            if m['calls']
+        ]
+        if cached:
+            st.markdown("**Cachés de este proceso** (desde el arranque)")
+            st.dataframe(cached, hide_index=True)
+        per_stage = {}
+        for stage, seconds in rerun_trace():
+            if stage != 'rerun':
+                calls, spent = per_stage.get(stage, (0, 0.0))
+                per_stage[stage] = (calls + 1, spent + seconds)
+        if per_stage:
+            st.dataframe([
+                {"Etapa": stage, "Llamadas": calls, "ms": round(1000 * spent, 2)}
+                for stage, (calls, spent) in sorted(per_stage.items(), key=lambda item: STAGES.index(item[0]))
+            ], hide_index=True)
+        else:
+            st.caption("Todo salió de las cachés en este rerun.")
+
+        st.markdown("**Últimos reruns de esta página**")
+        st.dataframe([
+            {"Etapa": stage, "n": m['n'], "p50 ms": round(1000 * m['p50'], 2),
+             "p95 ms": round(1000 * m['p95'], 2), "máx ms": round(1000 * m['max'], 2)}
+            for (_, stage), m in REGISTRY.summary(page).items()
+        ], hide_index=True)
+        stage = st.selectbox("Histograma de la etapa", STAGES, index=len(STAGES) - 1, key='debug_stage')
+        counts = REGISTRY.recent_counts(page, stage)
+        st.bar_chart({"Reruns": {_bucket_label(i): c for i, c in enumerate(counts)}}, horizontal=True)
+        st.download_button("Métricas (Prometheus)", REGISTRY.prometheus(), file_name='metrics.prom', mime='text/plain')
@@ -0,0 +1,186 @@
+import numpy as np
+import scipy.stats as stats
+from scipy.special import gammaln
+
+# --- Motor Hipergeométrico para Poblaciones Grandes ---
+# Calcula el vector completo de la PMF en un único barrido O(soporte)
+# usando la recurrencia de cocientes P(k+1)/P(k), partiendo de la moda.
+# Para poblaciones de millones (ej. auditoría de registros contables)
+# es más rápido y más estable que evaluar stats.hypergeom punto a punto.
+
+# Cola despreciable para recortar el soporte (cota de Hoeffding)
+_TAIL_LOG = 745.0
+
+
+def hypergeom_support(N, K, n):
+    """
+    Devuelve (k_min, k_max), el rango válido de éxitos en la muestra.
+    """
+    return max(0, n - (N - K)), min(n, K)
+
+
+def hypergeom_logpmf(k, N, K, n):
+    """
+    Log-PMF exacta usando log-gamma (vectorizada en k).
+
+    log P(X=k) = log C(K,k) + log C(N-K,n-k) - log C(N,n)
+    Fuera del soporte (o para k no entero, como SciPy) devuelve -inf.
+    """
+    k = np.asarray(k, dtype=float)
+    k_min, k_max = hypergeom_support(N, K, n)
+    inside = (k >= k_min) & (k <= k_max) & (k == np.floor(k))
+    kk = np.where(inside, k, k_min)
+
+    def log_comb(a, b):
+        return gammaln(a + 1) - gammaln(b + 1) - gammaln(a - b + 1)
+
+    logp = log_comb(K, kk) + log_comb(N - K, n - kk) - log_comb(N, n)
+    return np.where(inside, logp, -np.inf)
+
+
+def binomial_error_bound(N, n):
+    """
+    Cota de la distancia de variación total entre Hipergeométrica(N, K, n)
+    y Binomial(n, K/N): d_TV <= (n - 1) / (N - 1).
+
+    Acota el error absoluto de cualquier probabilidad P(X en A).
+    """
+    if N <= 1:
+        return 0.0
+    return max(0.0, (n - 1) / (N - 1))
+
+
+def hypergeom_pmf_vector(N, K, n):
+    """
+    Calcula la PMF sobre el soporte efectivo en un único barrido.
+
+    Parte de la moda m = floor((n+1)(K+1)/(N+2)) y aplica la recurrencia
+        P(k+1)/P(k) = (K-k)(n-k) / ((k+1)(N-K-n+k+1))
+    hacia ambos lados con sumas acumuladas de log-cocientes. El soporte
+    se recorta donde la cola (cota de Hoeffding) es menor que 1e-320,
+    y el vector se normaliza por su suma, por lo que no depende de la
+    precisión de log-gamma para números de millones.
+
+    Devuelve (k_values, pmf_values).
+    """
+    k_min, k_max = hypergeom_support(N, K, n)
+    mode = int(np.floor((n + 1) * (K + 1) / (N + 2)))
+    mode = min(max(mode, k_min), k_max)
+
+    # Recortar el soporte: P(|X - μ| >= t) <= 2 exp(-2 t² / n)
+    mean = n * K / N
+    t = np.sqrt(_TAIL_LOG * max(n, 1) / 2.0)
+    lo = max(k_min, int(np.floor(mean - t)))
+    hi = min(k_max, int(np.ceil(mean + t)))
+    lo = min(lo, mode)
+    hi = max(hi, mode)
+
+    # Log-cocientes hacia la derecha: log P(k+1)/P(k) para k = mode..hi-1
+    k_up = np.arange(mode, hi, dtype=float)
+    log_up = (np.log(K - k_up) + np.log(n - k_up)
+              - np.log(k_up + 1) - np.log(N - K - n + k_up + 1))
+
+    # Log-cocientes hacia la izquierda: log P(k-1)/P(k) para k = mode..lo+1
+    k_down = np.arange(mode, lo, -1, dtype=float)
+    log_down = (np.log(k_down) + np.log(N - K - n + k_down)
+                - np.log(K - k_down + 1) - np.log(n - k_down + 1))
+
+    log_w = np.concatenate([
+        np.cumsum(log_down)[::-1],
+        [0.0],
+        np.cumsum(log_up),
+    ])
+    weights = np.exp(log_w)
+    pmf_values = weights / weights.sum()
+    k_values = np.arange(lo, hi + 1)
+    return k_values, pmf_values
+
+
+class HypergeomEngine:
+    """
+    Distribución Hipergeométrica precalculada con la misma interfaz
+    básica que un objeto congelado de SciPy (pmf, cdf, sf, mean, var, std),
+    para poder pasarla directamente a 'plot_discrete_distribution'.
+
+    Parámetros (notación de la página, no de SciPy):
+        N: tamaño de la población.
+        K: éxitos en la población.
+        n: tamaño de la muestra.
+        mode: 'exact', 'binomial' o 'auto'. En 'auto' se usa la
+              aproximación Binomial(n, K/N) si la cota de error
+              (n-1)/(N-1) es menor o igual que 'tol'.
+    """
+
+    def __init__(self, N, K, n, mode='auto', tol=1e-3):
+        if N < 1:
+            raise ValueError("N debe ser al menos 1.")
+        if not (0 <= K <= N and 0 <= n <= N):
+            raise ValueError("K y n deben estar entre 0 y N.")
+        if mode not in ('auto', 'exact', 'binomial'):
+            raise ValueError("mode debe ser 'auto', 'exact' o 'binomial'.")
+
+        self.N, self.K, self.n = int(N), int(K), int(n)
+        self.error_bound = binomial_error_bound(self.N, self.n)
+        if mode == 'auto':
+            mode = 'binomial' if self.error_bound <= tol else 'exact'
+        self.mode = mode
+
+        if self.mode == 'binomial':
+            p = self.K / self.N
+            k_min, k_max = hypergeom_support(self.N, self.K, self.n)
+            self.k_values = np.arange(k_min, k_max + 1)
+            self.pmf_values = stats.binom.pmf(self.k_values, self.n, p)
+        else:
+            self.error_bound = 0.0
+            self.k_values, self.pmf_values = hypergeom_pmf_vector(self.N, self.K, self.n)
+
+        # CDF y función de supervivencia acumuladas desde cada extremo,
+        # para no perder precisión en la cola superior con 1 - cdf.
+        self._cdf = np.cumsum(self.pmf_values)
+        self._sf = np.cumsum(self.pmf_values[::-1])[::-1]
+
+    def _index(self, k):
+        k = np.asarray(k)
+        return k - self.k_values[0], (k >= self.k_values[0]) & (k <= self.k_values[-1])
+
+    def pmf(self, k):
+        """P(X = k); 0 fuera del soporte y para k no entero, como SciPy."""
+        k = np.asarray(k, dtype=float)
+        idx, inside = self._index(k)
+        inside &= k == np.floor(k)
+        idx = np.clip(idx, 0, len(self.k_values) - 1).astype(int)
+        return np.where(inside, self.pmf_values[idx], 0.0)
+
+    def logpmf(self, k):
+        if self.mode == 'binomial':
+            return stats.binom.logpmf(k, self.n, self.K / self.N)
+        return hypergeom_logpmf(k, self.N, self.K, self.n)
+
+    def cdf(self, k):
+        k = np.floor(np.asarray(k, dtype=float))
+        idx, inside = self._index(k)
+        idx = np.clip(idx, 0, len(self.k_values) - 1).astype(int)
+        below = k < self.k_values[0]
+        return np.where(inside, self._cdf[idx], np.where(below, 0.0, 1.0))
+
+    def sf(self, k):
+        """P(X > k), acumulada desde la cola derecha."""
+        k = np.floor(np.asarray(k, dtype=float)) + 1
+        idx, inside = self._index(k)
+        idx = np.clip(idx, 0, len(self.k_values) - 1).astype(int)
+        below = k < self.k_values[0]
+        return np.where(inside, self._sf[idx], np.where(below, 1.0, 0.0))
+
+    def mean(self):
+        return self.n * self.K / self.N
+
+    def var(self):
+        p = self.K / self.N
+        if self.mode == 'binomial':
+            return self.n * p * (1 - p)
+        if self.N <= 1:
+            return 0.0
+        return self.n * p * (1 - p) * (self.N - self.n) / (self.N - 1)
+
+    def std(self):
+        return np.sqrt(self.var())
@@ -0,0 +1,244 @@
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import threading
+import time
+
+import numpy as np
+
+# --- Prueba de Carga con Sesiones Concurrentes ---
+# Ejecuta cada página de 'pages/' sin navegador con
+# streamlit.testing.v1.AppTest, simulando N sesiones a la vez. Cada
+# sesión carga la página y luego repite 'steps' acciones: mover un
+# slider a un valor al azar (respetando su mínimo, máximo y paso) o
+# pulsar un botón "Revisar", con un tiempo de reflexión exponencial entre
+# acciones. Las sesiones arrancan escalonadas dentro del primer tiempo de
+# reflexión, como alumnos que entran a la clase.
+#
+# Cada página corre en un proceso nuevo ('spawn'), así el CPU y la memoria
+# medidos son solo suyos: CPU = tiempo de proceso / tiempo real, RSS =
+# máximo del proceso (y el actual al terminar). Las latencias de rerun se
+# resumen en p50/p95/p99; la primera carga de cada sesión se informa
+# aparte porque incluye las importaciones y la caché en frío. Al terminar
+# se cuentan las figuras de matplotlib que siguen vivas: debería ser 0.
+#
+# AppTest no informa un error de sintaxis de la página como excepción
+# (app.exception queda vacío), así que cada página se compila antes de
+# lanzar las sesiones, y una sesión cuya primera carga no muestra el
+# título de la página cuenta como fallida. Los mensajes de las sesiones
+# fallidas se guardan en 'session_errors'.
+#
+# Uso:  python load_test.py [--sessions 20] [--steps 10] [--think 1.0]
+#                           [--pages Normal Binomial] [--output carga.json]
+#
+# El precalentamiento (warmup.py) se controla con DISTRIBUCIONES_WARMUP,
+# igual que en el servidor.
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_SESSIONS = 10
+DEFAULT_STEPS = 10
+DEFAULT_THINK = 1.0         # segundos medios entre acciones de un alumno
+SCRIPT_TIMEOUT = 120.0      # segundos máximos por rerun
+SLIDER_PROBABILITY = 0.7    # el resto de las acciones pulsa "Revisar"
+
+
+def page_paths(names=None):
+    """Rutas de las páginas; 'names' filtra por subcadena ('Normal', '10_')."""
+    paths = sorted(glob.glob(os.path.join(_APP_DIR, 'pages', '*.py')))
+    if names:
+        paths = [p for p in paths if any(name.lower() in os.path.basename(p).lower() for name in names)]
+    return paths
+
+
+def compile_error(path):
+    """Mensaje del error de sintaxis de la página, o None si compila."""
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    try:
+        compile(source, path, 'exec')
+    except SyntaxError as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def _random_slider_value(slider, rng):
+    # Un valor de la rejilla del slider (enteros o flotantes)
+    low, high, step = slider.min, slider.max, slider.step or 1
+    if isinstance(low, (list, tuple)) or isinstance(slider.value, (list, tuple)):
+        return None
+    n_steps = int(round((high - low) / step))
+    value = low + step * int(rng.integers(0, n_steps + 1))
+    if isinstance(low, int) and isinstance(step, int):
+        return int(value)
+    return round(float(value), 10)
+
+
+def _session(path, steps, think, seed, latencies, first_loads, counters, lock):
+    """Una sesión simulada: carga la página y realiza 'steps' acciones."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = np.random.default_rng(seed)
+    time.sleep(rng.uniform(0, think))
+    app = AppTest.from_file(path, default_timeout=SCRIPT_TIMEOUT)
+
+    start = time.perf_counter()
+    app.run()
+    elapsed = time.perf_counter() - start
+    with lock:
+        first_loads.append(elapsed)
+        counters['exceptions'] += len(app.exception)
+    if not app.title:
+        errors = [e.value for e in app.error] + [e.value for e in app.exception]
+        raise RuntimeError("La página no mostró su título" + (f": {errors[0]}" if errors else "."))
+
+    for _ in range(steps):
+        time.sleep(rng.exponential(think))
+        sliders = [s for s in app.slider if _random_slider_value(s, rng) is not None]
+        buttons = [b for b in app.button if b.label.startswith("Revisar")]
+        if sliders and (not buttons or rng.random() < SLIDER_PROBABILITY):
+            slider = sliders[int(rng.integers(len(sliders)))]
+            slider.set_value(_random_slider_value(slider, rng))
+            action = 'sliders'
+        elif buttons:
+            buttons[int(rng.integers(len(buttons)))].click()
+            action = 'buttons'
+        else:
+            action = 'plain'
+
+        start = time.perf_counter()
+        app.run()
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            counters[action] += 1
+            counters['exceptions'] += len(app.exception)
+
+
+def _current_rss():
+    # RSS actual en bytes (solo Linux); None en otros sistemas
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def run_page(path, sessions, steps, think, seed=0):
+    """
+    Prueba una página con 'sessions' sesiones concurrentes (hilos) en el
+    proceso actual y devuelve las métricas.
+    """
+    if _APP_DIR not in sys.path:
+        # 'streamlit run app.py' pone la raíz en sys.path para los imports de las páginas
+        sys.path.insert(0, _APP_DIR)
+
+    latencies, first_loads, session_errors = [], [], []
+    counters = {'sliders': 0, 'buttons': 0, 'plain': 0, 'exceptions': 0}
+    lock = threading.Lock()
+
+    def target(i):
+        try:
+            _session(path, steps, think, [seed, i], latencies, first_loads, counters, lock)
+        except Exception as e:
+            with lock:
+                session_errors.append(f"sesión {i}: {type(e).__name__}: {e}")
+
+    error = compile_error(path)
+    if error is not None:
+        # Sin sesiones: todas fallarían igual
+        sessions = 0
+        session_errors.append(error)
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    threads = [threading.Thread(target=target, args=(i,), name=f'session-{i}') for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    from figures import TRACKER
+
+    def percentiles(values):
+        if not values:
+            return {'p50': None, 'p95': None, 'p99': None, 'max': None}
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99), 'max': float(np.max(values))}
+
+    return {
+        'page': os.path.splitext(os.path.basename(path))[0],
+        'sessions': sessions,
+        'reruns': len(latencies),
+        'rerun_latency': percentiles(latencies),
+        'first_load': percentiles(first_loads),
+        'throughput': len(latencies) / wall if wall else 0.0,
+        'wall_seconds': wall,
+        'cpu_seconds': cpu,
+        'cpu_percent': 100 * cpu / wall if wall else 0.0,
+        # ru_maxrss está en KB en Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'final_rss_mb': (_current_rss() or 0) / 1024 ** 2,
+        'live_figures': TRACKER.live(),
+        **counters,
+        'failed_sessions': len(session_errors),
+        'session_errors': session_errors,
+    }
+
+
+def run(paths, sessions=DEFAULT_SESSIONS, steps=DEFAULT_STEPS, think=DEFAULT_THINK, seed=0):
+    """Prueba cada página en un proceso nuevo, una después de otra."""
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for path in paths:
+        with context.Pool(processes=1) as pool:
+            results.append(pool.apply(run_page, (path, sessions, steps, think, seed)))
+    return results
+
+
+def _ms(value):
+    return f"{'-':>8}" if value is None else f"{1000 * value:8.1f}"
+
+
+def format_report(results):
+    """Tabla de texto con una fila por página."""
+    lines = [f"{'Página':<24} {'reruns':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'carga ms':>8} "
+             f"{'CPU %':>6} {'RSS MB':>7} {'figuras':>7} {'errores':>7}"]
+    for r in results:
+        latency = r['rerun_latency']
+        lines.append(f"{r['page']:<24} {r['reruns']:>6} {_ms(latency['p50'])} {_ms(latency['p95'])} {_ms(latency['p99'])} "
+                     f"{_ms(r['first_load']['p50'])} {r['cpu_percent']:6.0f} {r['peak_rss_mb']:7.0f} {r['live_figures']:>7} "
+                     f"{r['exceptions'] + r['failed_sessions']:>7}")
+    for r in results:
+        # Un mensaje por página basta: las sesiones suelen fallar igual
+        if r['session_errors']:
+            lines.append(f"{r['page']}: {r['session_errors'][0]}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga de las páginas con sesiones concurrentes (AppTest).")
+    parser.add_argument('--sessions', type=int, default=DEFAULT_SESSIONS, help="Sesiones concurrentes por página")
+    parser.add_argument('--steps', type=int, default=DEFAULT_STEPS, help="Acciones por sesión")
+    parser.add_argument('--think', type=float, default=DEFAULT_THINK, help="Tiempo medio de reflexión (s)")
+    parser.add_argument('--pages', nargs='*', help="Subcadenas de los nombres de página (por defecto, todas)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Guarda los resultados en JSON")
+    args = parser.parse_args(argv)
+
+    paths = page_paths(args.pages)
+    if not paths:
+        parser.error("Ninguna página coincide con --pages.")
+    results = run(paths, args.sessions, args.steps, args.think, args.seed)
+    print(format_report(results))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+import numpy as np
+
+from families import FAMILIES, make_distribution
+
+# --- Distribuciones de Mezcla ---
+# Una mezcla ponderada f(x) = Σ w_i f_i(x) de familias del registro
+# (todas continuas o todas discretas). pdf/pmf, cdf y sf se evalúan de
+# forma vectorizada sumando las componentes; la ppf usa una tabla inversa
+# monótona que se construye una sola vez por mezcla (interpolación y un
+# paso de Newton), en lugar de buscar raíces punto a punto.
+
+TABLE_POINTS = 4096
+TAIL = 1e-12
+
+
+class Mixture:
+    """
+    Mezcla de distribuciones con interfaz parecida a un objeto congelado
+    de SciPy (pdf o pmf, cdf, sf, ppf, rvs, mean, var, std).
+
+    components: lista de (familia, {parámetro: valor}).
+    weights: pesos no negativos; se normalizan para sumar 1.
+    """
+
+    def __init__(self, components, weights):
+        if len(components) == 0 or len(components) != len(weights):
+            raise ValueError("Se necesita el mismo número de componentes y pesos (al menos uno).")
+        weights = np.asarray(weights, dtype=float)
+        if np.any(weights < 0) or weights.sum() <= 0:
+            raise ValueError("Los pesos deben ser no negativos y no todos cero.")
+
+        kinds = {FAMILIES[family]['kind'] for family, _ in components}
+        if len(kinds) > 1:
+            raise ValueError("No se pueden mezclar familias discretas y continuas.")
+        self.kind = kinds.pop()
+        self.components = [(family, dict(params)) for family, params in components]
+        self.weights = weights / weights.sum()
+        self.dists = [make_distribution(family, **params) for family, params in self.components]
+
+        if any(not np.isfinite(d.ppf(0.5)) for d in self.dists):
+            raise ValueError("Parámetros inválidos en alguna componente.")
+        self._table = None
+
+    def _weighted(self, method, x):
+        x = np.asarray(x, dtype=float)
+        total = np.zeros(x.shape)
+        for w, d in zip(self.weights, self.dists):
+            total += w * getattr(d, method)(x)
+        return total
+
+    def pdf(self, x):
+        return self._weighted('pdf', x)
+
+    def pmf(self, k):
+        return self._weighted('pmf', k)
+
+    def cdf(self, x):
+        return self._weighted('cdf', x)
+
+    def sf(self, x):
+        # Suma de colas derechas: precisa aunque la cdf esté cerca de 1
+        return self._weighted('sf', x)
+
+    def mean(self):
+        return float(np.sum([w * d.mean() for w, d in zip(self.weights, self.dists)]))
+
+    def var(self):
+        means = np.array([d.mean() for d in self.dists])
+        second = np.array([d.var() for d in self.dists]) + means ** 2
+        return float(np.sum(self.weights * second) - self.mean() ** 2)
+
+    def std(self):
+        return np.sqrt(self.var())
+
+    def support_range(self, tail=0.001):
+        """Intervalo [lo, hi] que deja 'tail' de masa fuera en cada componente."""
+        lo = min(d.ppf(tail) for d in self.dists)
+        hi = max(d.isf(tail) for d in self.dists)
+        return lo, hi
+
+    def _inverse_table(self):
+        # Puntos de la tabla: cuantiles de cada componente (se adaptan a
+        # la escala de cada una) más una rejilla uniforme del rango total.
+        if self._table is None:
+            probs = np.linspace(TAIL, 1 - TAIL, TABLE_POINTS)
+            if self.kind == 'discrete':
+                lo, hi = self.support_range(TAIL)
+                x = np.arange(np.floor(lo), np.ceil(hi) + 1)
+            else:
+                lo, hi = self.support_range(TAIL)
+                x = np.concatenate([d.ppf(probs) for d in self.dists] + [np.linspace(lo, hi, TABLE_POINTS)])
+                x = np.unique(x[np.isfinite(x)])
+            cdf = self.cdf(x)
+            # Forzar monotonía estricta para que la interpolación sea válida
+            cdf = np.maximum.accumulate(cdf)
+            self._table = (x, cdf)
+        return self._table
+
+    def ppf(self, q):
+        """Función cuantil vía la tabla inversa (sin búsqueda de raíces)."""
+        q = np.asarray(q, dtype=float)
+        x_table, cdf_table = self._inverse_table()
+
+        if self.kind == 'discrete':
+            idx = np.searchsorted(cdf_table, q - 1e-12, side='left')
+            result = x_table[np.clip(idx, 0, len(x_table) - 1)].astype(float)
+        else:
+            keep = np.r_[True, np.diff(cdf_table) > 0]
+            result = np.interp(q, cdf_table[keep], x_table[keep])
+            # Un paso de Newton corrige el error de interpolación
+            density = self.pdf(result)
+            step = np.where(density > 0, (self.cdf(result) - q) / np.where(density > 0, density, 1.0), 0.0)
+            result = result - step
+        return np.where((q < 0) | (q > 1), np.nan, result)
+
+    def rvs(self, size=1, random_state=None):
+        """Muestra: primero la componente (multinomial), luego cada una."""
+        rng = np.random.default_rng(random_state)
+        counts = rng.multinomial(size, self.weights)
+        samples = np.concatenate([
+            d.rvs(size=count, random_state=rng) for d, count in zip(self.dists, counts) if count > 0
+        ])
+        rng.shuffle(samples)
+        return samples
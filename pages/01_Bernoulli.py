@@ -1,18 +1,26 @@
 import streamlit as st
 import numpy as np
-import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda desde el archivo helpers.py
 # El '..' le dice a Python que suba un nivel de directorio para encontrar helpers.py
 # (Esto puede variar según el entorno, si falla, prueba 'from helpers import ...')
 try:
-    from helpers import plot_discrete_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import empirical_cdf_expander, truncation_expander, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('bernoulli')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página de Bernoulli ---
 # Nota: No hay 'def show_bernoulli():'
 # El archivo se ejecuta directamente.
@@ -81,12 +89,14 @@ with tab2:
         st.error("La probabilidad 'p' debe estar entre 0 y 1.")
     else:
         try:
-            dist = stats.bernoulli(p=p_slider)
-            k_values = [0, 1]
-            # Usamos la función de ayuda importada
-            fig = plot_discrete_distribution(dist, k_values, f"PMF de Bernoulli (p={p_slider:.2f})")
-            st.pyplot(fig)
-            plt.close(fig) # Liberar memoria
+            view = visualization('bernoulli', p=p_slider)
+            show_figure(view.fig, 'bernoulli', p_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'bern', discrete=True)
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PMF {view.label}", 'bern', discrete=True)
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -101,16 +111,19 @@ with tab3:
         st.error("La probabilidad 'p' debe estar entre 0 y 1.")
     else:
         try:
-            dist = stats.bernoulli(p=calc_p)
+            calc = calculator('bernoulli', p=calc_p)
+            moments = calc.moments()
             st.subheader("Resultados:")
-            st.markdown(f"**P(X = 1) (Éxito):** `{dist.pmf(1):.4f}`")
-            st.markdown(f"**P(X = 0) (Fracaso):** `{dist.pmf(0):.4f}`")
+            st.markdown(f"**P(X = 1) (Éxito):** `{calc.at(1)['pmf']:.4f}`")
+            st.markdown(f"**P(X = 0) (Fracaso):** `{calc.at(0)['pmf']:.4f}`")
             
             st.subheader("Estadísticos:")
-            st.markdown(f"**Media (μ):** `{dist.mean():.4f}`")
-            st.markdown(f"**Varianza (σ²):** `{dist.var():.4f}`")
-            st.markdown(f"**Desviación Estándar (σ):** `{dist.std():.4f}`")
-            
+            st.markdown(f"**Media (μ):** `{moments['mean']:.4f}`")
+            st.markdown(f"**Varianza (σ²):** `{moments['var']:.4f}`")
+            st.markdown(f"**Desviación Estándar (σ):** `{moments['std']:.4f}`")
+
+            # Varias x e intervalos en una sola evaluación
+            probability_query_expander(calc.dist, 'bern', discrete=True)
         except Exception as e:
             st.error(f"Error en el cálculo: {e}")
 
@@ -129,7 +142,7 @@ with tab5:
     st.write("Si la probabilidad de que un estudiante apruebe un examen es del 80% (p=0.8), ¿cuál es la probabilidad de que *falle* (k=0)?")
     ans1 = st.number_input("Tu respuesta (P(X=0)):", min_value=0.0, max_value=1.0, step=0.01, format="%.2f", key='bern_ex1_ans')
     if st.button("Revisar 1", key='bern_ex1_btn'):
-        if np.isclose(ans1, 0.20):
+        if record_attempt('bernoulli', 'ex1', ans1, np.isclose(ans1, 0.20)):
             st.success("¡Correcto!")
         else:
             st.error(f"Incorrecto. La respuesta correcta es 0.20.")
@@ -140,7 +153,7 @@ with tab5:
     st.write("Un ensayo de Bernoulli tiene una varianza de 0.21. ¿Cuál es la probabilidad de éxito $p$? (Pista: $p(1-p) = 0.21$).")
     ans2 = st.number_input("Tu respuesta (p > 0.5):", min_value=0.0, max_value=1.0, step=0.01, format="%.2f", key='bern_ex2_ans')
     if st.button("Revisar 2", key='bern_ex2_btn'):
-        if np.isclose(ans2, 0.70) or np.isclose(ans2, 0.30):
+        if record_attempt('bernoulli', 'ex2', ans2, np.isclose(ans2, 0.70) or np.isclose(ans2, 0.30)):
             st.success("¡Correcto! Las dos posibles soluciones son 0.3 y 0.7. Si asumimos p > 0.5, es 0.7.")
         else:
             st.error(f"Incorrecto. Intenta resolver $p - p^2 = 0.21$.")
@@ -151,9 +164,14 @@ with tab5:
     st.write("¿Cuál es la media (valor esperado) de una distribución de Bernoulli con p=0.45?")
     ans3 = st.number_input("Tu respuesta (Media μ):", min_value=0.0, max_value=1.0, step=0.01, format="%.2f", key='bern_ex3_ans')
     if st.button("Revisar 3", key='bern_ex3_btn'):
-        if np.isclose(ans3, 0.45):
+        if record_attempt('bernoulli', 'ex3', ans3, np.isclose(ans3, 0.45)):
             st.success("¡Correcto!")
         else:
             st.error(f"Incorrecto. La respuesta es 0.45.")
         with st.expander("Ver Solución"):
             st.write("Para una distribución de Bernoulli, la media (μ) es simplemente igual a $p$. Por lo tanto, μ = 0.45.")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('bernoulli', 'bern')
+
+debug_panel()
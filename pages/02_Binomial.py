@@ -1,15 +1,24 @@
 import streamlit as st
 import numpy as np
 import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda
 try:
-    from helpers import plot_discrete_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import empirical_cdf_expander, truncation_expander, format_prob, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('binomial')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página Binomial ---
 
 st.title("Distribución Binomial")
@@ -73,11 +82,14 @@ with tab2:
         st.error("Parámetros inválidos. 'n' debe ser >= 1 y 'p' debe estar en [0.01, 0.99].")
     else:
         try:
-            dist = stats.binom(n=n_slider, p=p_slider)
-            k_values = np.arange(0, n_slider + 1)
-            fig = plot_discrete_distribution(dist, k_values, f"PMF Binomial (n={n_slider}, p={p_slider:.2f})")
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('binomial', n=n_slider, p=p_slider)
+            show_figure(view.fig, 'binomial', n_slider, p_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'bin', discrete=True)
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PMF {view.label}", 'bin', discrete=True)
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -103,22 +115,24 @@ with tab3:
         st.error("'k' no puede ser negativo.")
     else:
         try:
-            dist = stats.binom(n=calc_n, p=calc_p)
-            prob_k = dist.pmf(calc_k)
-            prob_cdf = dist.cdf(calc_k)
-            prob_gt_k = 1 - prob_cdf
-            prob_gte_k = 1 - dist.cdf(calc_k - 1) if calc_k > 0 else 1.0
+            calc = calculator('binomial', n=calc_n, p=calc_p)
+            moments = calc.moments()
+            # cdf o sf según el lado: las colas superiores no pierden precisión
+            at_k = calc.at(calc_k)
+            prob_k, prob_cdf, prob_gt_k, prob_gte_k = at_k['pmf'], at_k['le'], at_k['gt'], at_k['ge']
             
             st.subheader("Resultados:")
-            st.markdown(f"**$P(X = {calc_k})$:** `{prob_k:.6f}` (Prob. de *exactamente* {calc_k} éxitos)")
-            st.markdown(f"**$P(X \le {calc_k})$:** `{prob_cdf:.6f}` (Prob. de *como máximo* {calc_k} éxitos)")
-            st.markdown(f"**$P(X > {calc_k})$:** `{prob_gt_k:.6f}` (Prob. de *más de* {calc_k} éxitos)")
-            st.markdown(f"**$P(X \ge {calc_k})$:** `{prob_gte_k:.6f}` (Prob. de *al menos* {calc_k} éxitos)")
+            st.markdown(f"**$P(X = {calc_k})$:** `{format_prob(prob_k)}` (Prob. de *exactamente* {calc_k} éxitos)")
+            st.markdown(f"**$P(X \le {calc_k})$:** `{format_prob(prob_cdf)}` (Prob. de *como máximo* {calc_k} éxitos)")
+            st.markdown(f"**$P(X > {calc_k})$:** `{format_prob(prob_gt_k)}` (Prob. de *más de* {calc_k} éxitos)")
+            st.markdown(f"**$P(X \ge {calc_k})$:** `{format_prob(prob_gte_k)}` (Prob. de *al menos* {calc_k} éxitos)")
             
             st.subheader("Estadísticos:")
-            st.markdown(f"**Media (μ):** `{dist.mean():.4f}`")
-            st.markdown(f"**Varianza (σ²):** `{dist.var():.4f}`")
-            
+            st.markdown(f"**Media (μ):** `{moments['mean']:.4f}`")
+            st.markdown(f"**Varianza (σ²):** `{moments['var']:.4f}`")
+
+            # Varias x e intervalos en una sola evaluación
+            probability_query_expander(calc.dist, 'bin', discrete=True)
         except Exception as e:
             st.error(f"Error en el cálculo: {e}")
 
@@ -138,7 +152,7 @@ with tab5:
     ans1 = st.number_input("Tu respuesta (P(X=7)):", min_value=0.0, max_value=1.0, step=0.001, format="%.4f", key='bin_ex1_ans')
     if st.button("Revisar 1", key='bin_ex1_btn'):
         correct_ans = stats.binom.pmf(k=7, n=15, p=0.5)
-        if np.isclose(ans1, correct_ans):
+        if record_attempt('binomial', 'ex1', ans1, np.isclose(ans1, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.4f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.4f}.")
@@ -151,7 +165,7 @@ with tab5:
     ans2 = st.number_input("Tu respuesta (P(X≤2)):", min_value=0.0, max_value=1.0, step=0.001, format="%.4f", key='bin_ex2_ans')
     if st.button("Revisar 2", key='bin_ex2_btn'):
         correct_ans = stats.binom.cdf(k=2, n=20, p=0.1)
-        if np.isclose(ans2, correct_ans):
+        if record_attempt('binomial', 'ex2', ans2, np.isclose(ans2, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.4f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.4f}.")
@@ -164,10 +178,15 @@ with tab5:
     ans3 = st.number_input("Tu respuesta (Media μ):", min_value=0.0, max_value=20.0, step=0.1, format="%.1f", key='bin_ex3_ans')
     if st.button("Revisar 3", key='bin_ex3_btn'):
         correct_ans = 20 * 0.1
-        if np.isclose(ans3, correct_ans):
+        if record_attempt('binomial', 'ex3', ans3, np.isclose(ans3, correct_ans)):
             st.success(f"¡Correcto! La media es {correct_ans:.1f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.1f}.")
         with st.expander("Ver Solución"):
             st.write(f"La media de una binomial es $\mu = np$.")
             st.code(f"20 * 0.1 = 2.0")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('binomial', 'bin')
+
+debug_panel()
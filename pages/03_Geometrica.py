@@ -1,15 +1,24 @@
 import streamlit as st
 import numpy as np
 import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda
 try:
-    from helpers import plot_discrete_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import empirical_cdf_expander, truncation_expander, format_prob, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('geometrica')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página ---
 
 st.title("Distribución Geométrica")
@@ -67,14 +76,14 @@ with tab2:
         st.error("La probabilidad 'p' debe estar en [0.01, 0.99].")
     else:
         try:
-            dist = stats.geom(p=p_slider)
-            # Graficar los primeros 25 ensayos o hasta que la prob. sea muy baja
-            k_max = max(25, int(dist.mean() * 3))
-            k_values = np.arange(1, k_max + 1)
-            
-            fig = plot_discrete_distribution(dist, k_values, f"PMF Geométrica (p={p_slider:.2f})")
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('geometrica', p=p_slider)
+            show_figure(view.fig, 'geometrica', p_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'geom', discrete=True)
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PMF {view.label}", 'geom', discrete=True)
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -94,19 +103,21 @@ with tab3:
         st.error("'k' debe ser >= 1.")
     else:
         try:
-            dist = stats.geom(p=calc_p)
-            prob_k = dist.pmf(calc_k)
-            prob_cdf = dist.cdf(calc_k)
-            prob_gt_k = 1 - prob_cdf # P(X > k)
+            calc = calculator('geometrica', p=calc_p)
+            # cdf o sf según el lado: las colas superiores no pierden precisión
+            at_k = calc.at(calc_k)
+            prob_k, prob_cdf, prob_gt_k = at_k['pmf'], at_k['le'], at_k['gt']
             
             st.subheader("Resultados:")
-            st.markdown(f"**$P(X = {calc_k})$:** `{prob_k:.6f}` (Prob. del 1er éxito *exactamente* en el ensayo {calc_k})")
-            st.markdown(f"**$P(X \le {calc_k})$:** `{prob_cdf:.6f}` (Prob. del 1er éxito *en o antes* del ensayo {calc_k})")
-            st.markdown(f"**$P(X > {calc_k})$:** `{prob_gt_k:.6f}` (Prob. de necesitar *más de* {calc_k} ensayos)")
+            st.markdown(f"**$P(X = {calc_k})$:** `{format_prob(prob_k)}` (Prob. del 1er éxito *exactamente* en el ensayo {calc_k})")
+            st.markdown(f"**$P(X \le {calc_k})$:** `{format_prob(prob_cdf)}` (Prob. del 1er éxito *en o antes* del ensayo {calc_k})")
+            st.markdown(f"**$P(X > {calc_k})$:** `{format_prob(prob_gt_k)}` (Prob. de necesitar *más de* {calc_k} ensayos)")
             
             st.subheader("Estadísticos:")
-            st.markdown(f"**Media (μ):** `{dist.mean():.4f}` (Número esperado de ensayos hasta el éxito)")
-            
+            st.markdown(f"**Media (μ):** `{calc.moments()['mean']:.4f}` (Número esperado de ensayos hasta el éxito)")
+
+            # Varias x e intervalos en una sola evaluación
+            probability_query_expander(calc.dist, 'geom', discrete=True)
         except Exception as e:
             st.error(f"Error en el cálculo: {e}")
 
@@ -126,7 +137,7 @@ with tab5:
     ans1 = st.number_input("Tu respuesta (P(X=3)):", min_value=0.0, max_value=1.0, step=0.001, format="%.4f", key='geom_ex1_ans')
     if st.button("Revisar 1", key='geom_ex1_btn'):
         correct_ans = stats.geom.pmf(k=3, p=0.7)
-        if np.isclose(ans1, correct_ans):
+        if record_attempt('geometrica', 'ex1', ans1, np.isclose(ans1, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.4f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.4f}.")
@@ -139,7 +150,7 @@ with tab5:
     ans2 = st.number_input("Tu respuesta (P(X≤2)):", min_value=0.0, max_value=1.0, step=0.001, format="%.4f", key='geom_ex2_ans')
     if st.button("Revisar 2", key='geom_ex2_btn'):
         correct_ans = stats.geom.cdf(k=2, p=0.7)
-        if np.isclose(ans2, correct_ans):
+        if record_attempt('geometrica', 'ex2', ans2, np.isclose(ans2, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.4f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.4f}.")
@@ -152,10 +163,15 @@ with tab5:
     ans3 = st.number_input("Tu respuesta (Media μ):", min_value=0.0, step=1.0, format="%.1f", key='geom_ex3_ans')
     if st.button("Revisar 3", key='geom_ex3_btn'):
         correct_ans = 1 / 0.02
-        if np.isclose(ans3, correct_ans):
+        if record_attempt('geometrica', 'ex3', ans3, np.isclose(ans3, correct_ans)):
             st.success(f"¡Correcto! La media es {correct_ans:.1f} días.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.1f} días.")
         with st.expander("Ver Solución"):
             st.write(f"La media de una geométrica es $\mu = 1/p$.")
             st.code(f"1 / 0.02 = 50.0")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('geometrica', 'geom')
+
+debug_panel()
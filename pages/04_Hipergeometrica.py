@@ -1,15 +1,24 @@
 import streamlit as st
 import numpy as np
 import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda
 try:
-    from helpers import plot_discrete_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import empirical_cdf_expander, truncation_expander, format_prob, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('hipergeometrica')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página ---
 
 st.title("Distribución Hipergeométrica")
@@ -78,17 +87,14 @@ with tab2:
         st.error("K y n no pueden ser mayores que N.")
     else:
         try:
-            # SciPy usa M=N (Pob), n=K (Éxitos), N=n (Muestra)
-            dist = stats.hypergeom(M=N_slider, n=K_slider, N=n_slider)
-            
-            # Calcular rango válido de k
-            k_min = max(0, n_slider - (N_slider - K_slider))
-            k_max = min(n_slider, K_slider)
-            k_values = np.arange(k_min, k_max + 1)
-            
-            fig = plot_discrete_distribution(dist, k_values, f"PMF Hipergeométrica (N={N_slider}, K={K_slider}, n={n_slider})")
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('hipergeometrica', N=N_slider, K=K_slider, n=n_slider)
+            show_figure(view.fig, 'hipergeometrica', N_slider, K_slider, n_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'hyp', discrete=True)
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PMF {view.label}", 'hyp', discrete=True)
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -110,24 +116,43 @@ with tab3:
     k_max_calc = min(calc_n, calc_K)
     calc_k = st.number_input(f"Número de éxitos en muestra (k)", min_value=k_min_calc, max_value=k_max_calc, value=max(k_min_calc, min(2, k_max_calc)), step=1, key='hyp_calc_k')
 
+    # Para poblaciones muy grandes (N >> n) la Binomial(n, K/N) es una
+    # aproximación con error acotado por (n-1)/(N-1).
+    calc_mode = st.radio(
+        "Método de cálculo",
+        options=['auto', 'exact', 'binomial'],
+        format_func={'auto': "Automático", 'exact': "Exacto", 'binomial': "Aproximación Binomial"}.get,
+        horizontal=True, key='hyp_calc_mode'
+    )
+
     # Validación
     if calc_K > calc_N or calc_n > calc_N:
         st.error("K y n no pueden ser mayores que N.")
     else:
         try:
-            # SciPy usa M=N (Pob), n=K (Éxitos), N=n (Muestra)
-            dist = stats.hypergeom(M=calc_N, n=calc_K, N=calc_n)
-            prob_k = dist.pmf(calc_k)
-            prob_cdf = dist.cdf(calc_k)
+            calc = calculator('hipergeometrica', N=calc_N, K=calc_K, n=calc_n, mode=calc_mode)
+            dist = calc.dist
+            moments = calc.moments()
+            at_k = calc.at(calc_k)
+            prob_k, prob_cdf, prob_gt_k = at_k['pmf'], at_k['le'], at_k['gt']
             
             st.subheader("Resultados:")
-            st.markdown(f"**$P(X = {calc_k})$:** `{prob_k:.6f}`")
-            st.markdown(f"**$P(X \le {calc_k})$:** `{prob_cdf:.6f}`")
+            st.markdown(f"**$P(X = {calc_k})$:** `{format_prob(prob_k)}`")
+            st.markdown(f"**$P(X \le {calc_k})$:** `{format_prob(prob_cdf)}`")
+            st.markdown(f"**$P(X > {calc_k})$:** `{format_prob(prob_gt_k)}`")
             
-            st.subheader("Estadísticos:")
-            st.markdown(f"**Media (μ):** `{dist.mean():.4f}`")
-            st.markdown(f"**Varianza (σ²):** `{dist.var():.4f}`")
+            if dist.mode == 'binomial':
+                st.info(f"Se usó la aproximación Binomial(n={calc_n}, p={calc_K / calc_N:.6f}). "
+                        f"Error máximo en cualquier probabilidad: `{dist.error_bound:.2e}`.")
+            else:
+                st.caption("Cálculo exacto (recurrencia de cocientes desde la moda).")
             
+            st.subheader("Estadísticos:")
+            st.markdown(f"**Media (μ):** `{moments['mean']:.4f}`")
+            st.markdown(f"**Varianza (σ²):** `{moments['var']:.4f}`")
+
+            # Varias x e intervalos en una sola evaluación
+            probability_query_expander(dist, 'hyp', discrete=True)
         except Exception as e:
             st.error(f"Error en el cálculo: {e}")
 
@@ -147,7 +172,7 @@ with tab5:
     ans1 = st.number_input("Tu respuesta (P(X=2)):", min_value=0.0, max_value=1.0, step=0.001, format="%.4f", key='hyp_ex1_ans')
     if st.button("Revisar 1", key='hyp_ex1_btn'):
         correct_ans = stats.hypergeom.pmf(k=2, M=52, n=13, N=5)
-        if np.isclose(ans1, correct_ans):
+        if record_attempt('hipergeometrica', 'ex1', ans1, np.isclose(ans1, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.4f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.4f}.")
@@ -160,7 +185,7 @@ with tab5:
     ans2 = st.number_input("Tu respuesta (P(X=4)):", min_value=0.0, max_value=1.0, step=0.001, format="%.4f", key='hyp_ex2_ans')
     if st.button("Revisar 2", key='hyp_ex2_btn'):
         correct_ans = stats.hypergeom.pmf(k=4, M=15, n=10, N=4)
-        if np.isclose(ans2, correct_ans):
+        if record_attempt('hipergeometrica', 'ex2', ans2, np.isclose(ans2, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.4f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.4f}.")
@@ -173,10 +198,15 @@ with tab5:
     ans3 = st.number_input("Tu respuesta (Media μ):", min_value=0.0, step=0.1, format="%.2f", key='hyp_ex3_ans')
     if st.button("Revisar 3", key='hyp_ex3_btn'):
         correct_ans = stats.hypergeom.mean(M=15, n=10, N=4)
-        if np.isclose(ans3, correct_ans):
+        if record_attempt('hipergeometrica', 'ex3', ans3, np.isclose(ans3, correct_ans)):
             st.success(f"¡Correcto! La media es {correct_ans:.2f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.2f}.")
         with st.expander("Ver Solución"):
             st.write(r"La media es $\mu = n \left( \frac{K}{N} \right) = 4 \times (10 / 15)$")
             st.code(f"4 * (10 / 15) = 2.67")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('hipergeometrica', 'hyp')
+
+debug_panel()
@@ -1,15 +1,24 @@
 import streamlit as st
 import numpy as np
 import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda
 try:
-    from helpers import plot_discrete_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import empirical_cdf_expander, truncation_expander, format_prob, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('uniforme_discreta')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página ---
 
 st.title("Distribución Uniforme (Discreta)")
@@ -70,16 +79,14 @@ with tab2:
         st.error("El mínimo 'a' no puede ser mayor que el máximo 'b'.")
     else:
         try:
-            # SciPy usa randint(low, high+1)
-            dist = stats.randint(low=a_slider, high=b_slider + 1)
-            k_values = np.arange(a_slider, b_slider + 1)
-            
-            fig = plot_discrete_distribution(dist, k_values, f"PMF Uniforme Discreta (a={a_slider}, b={b_slider})")
-            ax = fig.gca()
-            # Ajustar el eje Y para que se vea mejor
-            ax.set_ylim(bottom=0, top=dist.pmf(a_slider) * 1.2)
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('uniforme_discreta', a=a_slider, b=b_slider)
+            show_figure(view.fig, 'uniforme_discreta', a_slider, b_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'unif', discrete=True)
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PMF {view.label}", 'unif', discrete=True)
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -100,19 +107,22 @@ with tab3:
         st.error("'a' no puede ser mayor que 'b'.")
     else:
         try:
-            dist = stats.randint(low=calc_a, high=calc_b + 1)
-            prob_k = dist.pmf(calc_k)
-            prob_cdf = dist.cdf(calc_k)
+            calc = calculator('uniforme_discreta', a=calc_a, b=calc_b)
+            moments = calc.moments()
+            at_k = calc.at(calc_k)
+            prob_k, prob_cdf = at_k['pmf'], at_k['le']
             
             st.subheader("Resultados:")
             st.markdown(f"**Número de resultados (n):** `{n_outcomes}`")
-            st.markdown(f"**$P(X = {calc_k})$:** `{prob_k:.6f}`")
-            st.markdown(f"**$P(X \le {calc_k})$:** `{prob_cdf:.6f}`")
+            st.markdown(f"**$P(X = {calc_k})$:** `{format_prob(prob_k)}`")
+            st.markdown(f"**$P(X \le {calc_k})$:** `{format_prob(prob_cdf)}`")
             
             st.subheader("Estadísticos:")
-            st.markdown(f"**Media (μ):** `{dist.mean():.4f}`")
-            st.markdown(f"**Varianza (σ²):** `{dist.var():.4f}`")
-            
+            st.markdown(f"**Media (μ):** `{moments['mean']:.4f}`")
+            st.markdown(f"**Varianza (σ²):** `{moments['var']:.4f}`")
+
+            # Varias x e intervalos en una sola evaluación
+            probability_query_expander(calc.dist, 'unif', discrete=True)
         except Exception as e:
             st.error(f"Error en el cálculo: {e}")
 
@@ -132,7 +142,7 @@ with tab5:
     ans1 = st.number_input("Tu respuesta (P(X=17)):", min_value=0.0, max_value=1.0, step=0.001, format="%.3f", key='unif_ex1_ans')
     if st.button("Revisar 1", key='unif_ex1_btn'):
         correct_ans = 1/20
-        if np.isclose(ans1, correct_ans):
+        if record_attempt('uniforme_discreta', 'ex1', ans1, np.isclose(ans1, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.3f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.3f}.")
@@ -145,7 +155,7 @@ with tab5:
     ans2 = st.number_input("Tu respuesta (P(X≤5)):", min_value=0.0, max_value=1.0, step=0.001, format="%.3f", key='unif_ex2_ans')
     if st.button("Revisar 2", key='unif_ex2_btn'):
         correct_ans = stats.randint.cdf(k=5, low=1, high=21)
-        if np.isclose(ans2, correct_ans):
+        if record_attempt('uniforme_discreta', 'ex2', ans2, np.isclose(ans2, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.3f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.3f}.")
@@ -159,10 +169,15 @@ with tab5:
     ans3 = st.number_input("Tu respuesta (Media μ):", min_value=0.0, step=0.1, format="%.1f", key='unif_ex3_ans')
     if st.button("Revisar 3", key='unif_ex3_btn'):
         correct_ans = (1 + 6) / 2
-        if np.isclose(ans3, correct_ans):
+        if record_attempt('uniforme_discreta', 'ex3', ans3, np.isclose(ans3, correct_ans)):
             st.success(f"¡Correcto! La media es {correct_ans:.1f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.1f}.")
         with st.expander("Ver Solución"):
             st.write(f"La media es $\mu = (a+b)/2$.")
             st.code(f"(1 + 6) / 2 = 3.5")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('uniforme_discreta', 'unif')
+
+debug_panel()
@@ -1,15 +1,24 @@
 import streamlit as st
 import numpy as np
 import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda
 try:
-    from helpers import plot_discrete_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import moment_estimates_expander, empirical_cdf_expander, truncation_expander, format_prob, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('poisson')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página ---
 
 st.title("Distribución de Poisson")
@@ -66,14 +75,14 @@ with tab2:
         st.error("Lambda (λ) debe ser positiva.")
     else:
         try:
-            dist = stats.poisson(mu=lambda_slider)
-            # Graficar hasta k = media + 3 desviaciones estándar (sigma = sqrt(lambda))
-            k_max = int(lambda_slider + 4 * np.sqrt(lambda_slider))
-            k_values = np.arange(0, k_max + 1)
-            
-            fig = plot_discrete_distribution(dist, k_values, f"PMF de Poisson (λ={lambda_slider:.1f})")
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('poisson', lam=lambda_slider)
+            show_figure(view.fig, 'poisson', lambda_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'poisson', discrete=True)
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PMF {view.label}", 'poisson', discrete=True)
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -84,6 +93,9 @@ with tab3:
     col1, col2 = st.columns(2)
     with col1:
         calc_lambda = st.number_input("Tasa media (λ)", min_value=0.01, value=5.0, step=0.1, key='poisson_calc_lambda')
+
+    # Valores iniciales por el método de los momentos a partir de datos
+    moment_estimates_expander('poisson', {'lam': 'poisson_calc_lambda'}, 'poisson')
     with col2:
         calc_k = st.number_input("Número de eventos (k)", min_value=0, value=5, step=1, key='poisson_calc_k')
 
@@ -93,20 +105,23 @@ with tab3:
         st.error("'k' debe ser >= 0.")
     else:
         try:
-            dist = stats.poisson(mu=calc_lambda)
-            prob_k = dist.pmf(calc_k)
-            prob_cdf = dist.cdf(calc_k)
-            prob_gt_k = 1 - prob_cdf # P(X > k)
+            calc = calculator('poisson', lam=calc_lambda)
+            moments = calc.moments()
+            # cdf o sf según el lado: las colas superiores no pierden precisión
+            at_k = calc.at(calc_k)
+            prob_k, prob_cdf, prob_gt_k = at_k['pmf'], at_k['le'], at_k['gt']
             
             st.subheader("Resultados:")
-            st.markdown(f"**$P(X = {calc_k})$:** `{prob_k:.6f}` (Prob. de *exactamente* {calc_k} eventos)")
-            st.markdown(f"**$P(X \le {calc_k})$:** `{prob_cdf:.6f}` (Prob. de *como máximo* {calc_k} eventos)")
-            st.markdown(f"**$P(X > {calc_k})$:** `{prob_gt_k:.6f}` (Prob. de *más de* {calc_k} eventos)")
+            st.markdown(f"**$P(X = {calc_k})$:** `{format_prob(prob_k)}` (Prob. de *exactamente* {calc_k} eventos)")
+            st.markdown(f"**$P(X \le {calc_k})$:** `{format_prob(prob_cdf)}` (Prob. de *como máximo* {calc_k} eventos)")
+            st.markdown(f"**$P(X > {calc_k})$:** `{format_prob(prob_gt_k)}` (Prob. de *más de* {calc_k} eventos)")
             
             st.subheader("Estadísticos:")
-            st.markdown(f"**Media (μ):** `{dist.mean():.4f}`")
-            st.markdown(f"**Varianza (σ²):** `{dist.var():.4f}`")
-            
+            st.markdown(f"**Media (μ):** `{moments['mean']:.4f}`")
+            st.markdown(f"**Varianza (σ²):** `{moments['var']:.4f}`")
+
+            # Varias x e intervalos en una sola evaluación
+            probability_query_expander(calc.dist, 'poisson', discrete=True)
         except Exception as e:
             st.error(f"Error en el cálculo: {e}")
 
@@ -126,7 +141,7 @@ with tab5:
     ans1 = st.number_input("Tu respuesta (P(X=4)):", min_value=0.0, max_value=1.0, step=0.001, format="%.4f", key='poisson_ex1_ans')
     if st.button("Revisar 1", key='poisson_ex1_btn'):
         correct_ans = stats.poisson.pmf(k=4, mu=4)
-        if np.isclose(ans1, correct_ans):
+        if record_attempt('poisson', 'ex1', ans1, np.isclose(ans1, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.4f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.4f}.")
@@ -139,7 +154,7 @@ with tab5:
     ans2 = st.number_input("Tu respuesta (P(X≤2)):", min_value=0.0, max_value=1.0, step=0.001, format="%.4f", key='poisson_ex2_ans')
     if st.button("Revisar 2", key='poisson_ex2_btn'):
         correct_ans = stats.poisson.cdf(k=2, mu=4)
-        if np.isclose(ans2, correct_ans):
+        if record_attempt('poisson', 'ex2', ans2, np.isclose(ans2, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.4f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.4f}.")
@@ -152,10 +167,15 @@ with tab5:
     ans3 = st.number_input("Tu respuesta (Varianza σ²):", min_value=0.0, step=0.1, format="%.1f", key='poisson_ex3_ans')
     if st.button("Revisar 3", key='poisson_ex3_btn'):
         correct_ans = 9.0
-        if np.isclose(ans3, correct_ans):
+        if record_attempt('poisson', 'ex3', ans3, np.isclose(ans3, correct_ans)):
             st.success(f"¡Correcto! La varianza es {correct_ans:.1f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.1f}.")
         with st.expander("Ver Solución"):
             st.write(f"Para una distribución de Poisson, la varianza es siempre igual a la media.")
             st.code(f"μ = λ = 9, por lo tanto σ² = λ = 9.0")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('poisson', 'poisson')
+
+debug_panel()
@@ -1,15 +1,23 @@
 import streamlit as st
 import numpy as np
-import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda para distribuciones continuas
 try:
-    from helpers import plot_continuous_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import empirical_cdf_expander, truncation_expander, format_prob, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('uniforme_continua')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página ---
 
 st.title("Distribución Uniforme (Continua)")
@@ -79,20 +87,14 @@ with tab2:
         st.error("El máximo 'b' debe ser estrictamente mayor que 'a'.")
     else:
         try:
-            # SciPy usa loc=a, scale=(b-a)
-            dist = stats.uniform(loc=a_slider, scale=b_slider - a_slider)
-            
-            # Definir rango del gráfico con un margen
-            x_min = a_slider - (b_slider - a_slider) * 0.2
-            x_max = b_slider + (b_slider - a_slider) * 0.2
-            
-            fig = plot_continuous_distribution(dist, x_min, x_max, f"PDF Uniforme Continua (a={a_slider:.1f}, b={b_slider:.1f})")
-            ax = fig.gca()
-            # Ajustar el eje Y para que se vea mejor
-            pdf_height = 1 / (b_slider - a_slider)
-            ax.set_ylim(bottom=0, top=pdf_height * 1.2)
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('uniforme_continua', a=a_slider, b=b_slider)
+            show_figure(view.fig, 'uniforme_continua', a_slider, b_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'unif_c')
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PDF {view.label}", 'unif_c')
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -111,14 +113,14 @@ with tab3:
         st.error("'b' debe ser mayor que 'a'.")
     else:
         try:
-            dist = stats.uniform(loc=calc_a, scale=calc_b - calc_a)
+            calc = calculator('uniforme_continua', a=calc_a, b=calc_b)
             
             st.subheader("Cálculo de Probabilidad")
             
             st.write("**1. Probabilidad Acumulada $P(X \le x)$**")
             calc_x = st.number_input("Valor de x", value=(calc_a + calc_b) / 2, step=0.1, key='unif_c_calc_x')
-            prob_cdf = dist.cdf(calc_x)
-            st.markdown(f"**$P(X \le {calc_x:.2f})$:** `{prob_cdf:.6f}`")
+            prob_cdf = calc.at(calc_x)['le']
+            st.markdown(f"**$P(X \le {calc_x:.2f})$:** `{format_prob(prob_cdf)}`")
 
             st.write("**2. Probabilidad de Rango $P(x_1 \le X \le x_2)$**")
             col_a, col_b = st.columns(2)
@@ -130,13 +132,16 @@ with tab3:
             if calc_x1 >= calc_x2:
                 st.warning("El límite inferior 'x₁' debe ser menor que 'x₂'.")
             else:
-                prob_range = dist.cdf(calc_x2) - dist.cdf(calc_x1)
-                st.markdown(f"**$P({calc_x1:.2f} \le X \le {calc_x2:.2f})$:** `{prob_range:.6f}`")
+                prob_range = calc.between(calc_x1, calc_x2)
+                st.markdown(f"**$P({calc_x1:.2f} \le X \le {calc_x2:.2f})$:** `{format_prob(prob_range)}`")
 
             st.subheader("Estadísticos:")
-            st.markdown(f"**Media (μ):** `{dist.mean():.4f}`")
-            st.markdown(f"**Varianza (σ²):** `{dist.var():.4f}`")
-                
+            moments = calc.moments()
+            st.markdown(f"**Media (μ):** `{moments['mean']:.4f}`")
+            st.markdown(f"**Varianza (σ²):** `{moments['var']:.4f}`")
+
+            # Varias x e intervalos en una sola evaluación
+            probability_query_expander(calc.dist, 'unif_c')
         except Exception as e:
             st.error(f"Error en el cálculo: {e}")
 
@@ -156,7 +161,7 @@ with tab5:
     ans1 = st.number_input("Tu respuesta (f(x)):", min_value=0.0, step=0.1, format="%.1f", key='unif_c_ex1_ans')
     if st.button("Revisar 1", key='unif_c_ex1_btn'):
         correct_ans = 1.0
-        if np.isclose(ans1, correct_ans):
+        if record_attempt('uniforme_continua', 'ex1', ans1, np.isclose(ans1, correct_ans)):
             st.success(f"¡Correcto! La altura es {correct_ans:.1f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.1f}.")
@@ -169,7 +174,7 @@ with tab5:
     ans2 = st.number_input("Tu respuesta (P(5≤X≤10)):", min_value=0.0, max_value=1.0, step=0.001, format="%.3f", key='unif_c_ex2_ans')
     if st.button("Revisar 2", key='unif_c_ex2_btn'):
         correct_ans = (10 - 5) / (15 - 0)
-        if np.isclose(ans1, correct_ans):
+        if record_attempt('uniforme_continua', 'ex2', ans2, np.isclose(ans2, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.3f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.3f}.")
@@ -182,10 +187,15 @@ with tab5:
     ans3 = st.number_input("Tu respuesta (Media μ):", min_value=0.0, step=0.1, format="%.1f", key='unif_c_ex3_ans')
     if st.button("Revisar 3", key='unif_c_ex3_btn'):
         correct_ans = (0 + 15) / 2
-        if np.isclose(ans3, correct_ans):
+        if record_attempt('uniforme_continua', 'ex3', ans3, np.isclose(ans3, correct_ans)):
             st.success(f"¡Correcto! La media es {correct_ans:.1f} minutos.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.1f} minutos.")
         with st.expander("Ver Solución"):
             st.write(f"La media es $\mu = (a+b)/2$.")
             st.code(f"(0 + 15) / 2 = 7.5")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('uniforme_continua', 'unif_c')
+
+debug_panel()
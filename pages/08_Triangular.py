@@ -1,15 +1,24 @@
 import streamlit as st
 import numpy as np
 import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda
 try:
-    from helpers import plot_continuous_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import empirical_cdf_expander, truncation_expander, format_prob, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('triangular')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página ---
 
 st.title("Distribución Triangular")
@@ -33,7 +42,7 @@ with tab1:
     """)
 
     st.header("Contexto Histórico y Casos de Uso")
-    st.write("Su popularidad no viene de un origen físico (como la Normal), sino de su utilidad práctica en la estimación y simulación. Es una "distribución de bajo conocimiento", útil cuando no hay datos suficientes para justificar una distribución más compleja.")
+    st.write("Su popularidad no viene de un origen físico (como la Normal), sino de su utilidad práctica en la estimación y simulación. Es una «distribución de bajo conocimiento», útil cuando no hay datos suficientes para justificar una distribución más compleja.")
     st.markdown("""
     **Casos de Uso:**
     - **Gestión de Proyectos:** Estimar la duración de una tarea (optimista $a$, pesimista $b$, más probable $c$).
@@ -82,16 +91,14 @@ with tab2:
         st.error("Parámetros inválidos. Asegúrate de que $a \le c \le b$ y $a < b$.")
     else:
         try:
-            # SciPy usa 'c' como un factor (c-a)/(b-a)
-            c_scaled = (c_slider - a_slider) / (b_slider - a_slider)
-            dist = stats.triang(c=c_scaled, loc=a_slider, scale=b_slider - a_slider)
-            
-            x_min = a_slider - (b_slider - a_slider) * 0.1
-            x_max = b_slider + (b_slider - a_slider) * 0.1
-            
-            fig = plot_continuous_distribution(dist, x_min, x_max, f"PDF Triangular (a={a_slider:.1f}, c={c_slider:.1f}, b={b_slider:.1f})")
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('triangular', a=a_slider, c=c_slider, b=b_slider)
+            show_figure(view.fig, 'triangular', a_slider, c_slider, b_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'tri')
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PDF {view.label}", 'tri')
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -112,15 +119,14 @@ with tab3:
         st.error("Parámetros inválidos. Asegúrate de que $a \le c \le b$ y $a < b$.")
     else:
         try:
-            c_scaled_calc = (calc_c - calc_a) / (calc_b - calc_a)
-            dist = stats.triang(c=c_scaled_calc, loc=calc_a, scale=calc_b - calc_a)
+            calc = calculator('triangular', a=calc_a, c=calc_c, b=calc_b)
             
             st.subheader("Cálculo de Probabilidad")
             
             st.write("**1. Probabilidad Acumulada $P(X \le x)$**")
             calc_x = st.number_input("Valor de x", value=(calc_a + calc_b) / 2, step=0.1, key='tri_calc_x')
-            prob_cdf = dist.cdf(calc_x)
-            st.markdown(f"**$P(X \le {calc_x:.2f})$:** `{prob_cdf:.6f}`")
+            prob_cdf = calc.at(calc_x)['le']
+            st.markdown(f"**$P(X \le {calc_x:.2f})$:** `{format_prob(prob_cdf)}`")
 
             st.write("**2. Probabilidad de Rango $P(x_1 \le X \le x_2)$**")
             col_a, col_b = st.columns(2)
@@ -132,13 +138,16 @@ with tab3:
             if calc_x1 >= calc_x2:
                 st.warning("El límite inferior 'x₁' debe ser menor que 'x₂'.")
             else:
-                prob_range = dist.cdf(calc_x2) - dist.cdf(calc_x1)
-                st.markdown(f"**$P({calc_x1:.2f} \le X \le {calc_x2:.2f})$:** `{prob_range:.6f}`")
+                prob_range = calc.between(calc_x1, calc_x2)
+                st.markdown(f"**$P({calc_x1:.2f} \le X \le {calc_x2:.2f})$:** `{format_prob(prob_range)}`")
 
             st.subheader("Estadísticos:")
-            st.markdown(f"**Media (μ):** `{dist.mean():.4f}`")
-            st.markdown(f"**Varianza (σ²):** `{dist.var():.4f}`")
-                
+            moments = calc.moments()
+            st.markdown(f"**Media (μ):** `{moments['mean']:.4f}`")
+            st.markdown(f"**Varianza (σ²):** `{moments['var']:.4f}`")
+
+            # Varias x e intervalos en una sola evaluación
+            probability_query_expander(calc.dist, 'tri')
         except Exception as e:
             st.error(f"Error en el cálculo: {e}")
 
@@ -158,7 +167,7 @@ with tab5:
     ans1 = st.number_input("Tu respuesta (Media μ):", min_value=0.0, step=0.1, format="%.2f", key='tri_ex1_ans')
     if st.button("Revisar 1", key='tri_ex1_btn'):
         correct_ans = (10 + 30 + 15) / 3
-        if np.isclose(ans1, correct_ans):
+        if record_attempt('triangular', 'ex1', ans1, np.isclose(ans1, correct_ans)):
             st.success(f"¡Correcto! La media es {correct_ans:.2f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.2f}.")
@@ -170,7 +179,7 @@ with tab5:
     st.write("Un proyecto tiene $a=5, b=15, c=10$ (distribución simétrica). ¿Cuál es la probabilidad de que dure *exactamente* 10 días?")
     ans2 = st.number_input("Tu respuesta (P(X=10)):", min_value=0.0, max_value=1.0, step=0.1, format="%.1f", key='tri_ex2_ans')
     if st.button("Revisar 2", key='tri_ex2_btn'):
-        if np.isclose(ans2, 0.0):
+        if record_attempt('triangular', 'ex2', ans2, np.isclose(ans2, 0.0)):
             st.success("¡Correcto! La probabilidad es 0.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es 0.")
@@ -184,10 +193,15 @@ with tab5:
         c_scaled_ex = (10 - 5) / (15 - 5)
         dist_ex = stats.triang(c=c_scaled_ex, loc=5, scale=15 - 5)
         correct_ans = dist_ex.cdf(10) # Debería ser 0.5
-        if np.isclose(ans3, correct_ans):
+        if record_attempt('triangular', 'ex3', ans3, np.isclose(ans3, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.2f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.2f}.")
         with st.expander("Ver Solución"):
             st.write(f"Dado que la distribución es simétrica ($c$ está justo en el medio de $a$ y $b$), la media y el modo son 10. La probabilidad de estar por debajo de la media es 0.5 (50%).")
             st.code(f"stats.triang(c=0.5, loc=5, scale=10).cdf(10) = 0.50")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('triangular', 'tri')
+
+debug_panel()
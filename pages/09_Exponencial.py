@@ -1,15 +1,24 @@
 import streamlit as st
 import numpy as np
 import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda
 try:
-    from helpers import plot_continuous_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import moment_estimates_expander, empirical_cdf_expander, truncation_expander, format_prob, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('exponencial')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página ---
 
 st.title("Distribución Exponencial")
@@ -73,16 +82,14 @@ with tab2:
         st.error("Lambda (λ) debe ser positiva.")
     else:
         try:
-            # SciPy usa scale = 1 / lambda
-            beta_scale = 1.0 / lambda_slider
-            dist = stats.expon(scale=beta_scale)
-            
-            # Graficar hasta 3 veces la media
-            x_max = 3 * dist.mean()
-            
-            fig = plot_continuous_distribution(dist, 0, x_max, f"PDF Exponencial (λ={lambda_slider:.1f}, media β={beta_scale:.2f})")
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('exponencial', lam=lambda_slider)
+            show_figure(view.fig, 'exponencial', lambda_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'exp')
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PDF {view.label}", 'exp')
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -92,6 +99,9 @@ with tab3:
     
     st.subheader("Parámetros")
     calc_lambda = st.number_input("Tasa (λ) (eventos por unidad de tiempo)", min_value=0.01, value=1.0, step=0.1, key='exp_calc_lambda')
+
+    # Valores iniciales por el método de los momentos a partir de datos
+    moment_estimates_expander('exponencial', {'lam': 'exp_calc_lambda'}, 'exp')
     
     st.subheader("Cálculo de Probabilidad")
     calc_x = st.number_input("Tiempo (x)", min_value=0.0, value=1.0, step=0.1, key='exp_calc_x')
@@ -100,20 +110,22 @@ with tab3:
         st.error("'λ' debe ser positiva y 'x' debe ser >= 0.")
     else:
         try:
-            beta_scale_calc = 1.0 / calc_lambda
-            dist = stats.expon(scale=beta_scale_calc)
+            calc = calculator('exponencial', lam=calc_lambda)
+            moments = calc.moments()
             
-            prob_cdf = dist.cdf(calc_x)
-            prob_sf = dist.sf(calc_x) # Survival function (1 - cdf)
+            at_x = calc.at(calc_x)
+            prob_cdf, prob_sf = at_x['le'], at_x['gt'] # sf: P(X > x) sin usar 1 - cdf
             
             st.subheader("Resultados:")
-            st.markdown(f"**$P(X \le {calc_x:.2f})$:** `{prob_cdf:.6f}` (Prob. de que el evento ocurra *antes* de {calc_x})")
-            st.markdown(f"**$P(X > {calc_x:.2f})$:** `{prob_sf:.6f}` (Prob. de que el evento ocurra *después* de {calc_x})")
+            st.markdown(f"**$P(X \le {calc_x:.2f})$:** `{format_prob(prob_cdf)}` (Prob. de que el evento ocurra *antes* de {calc_x})")
+            st.markdown(f"**$P(X > {calc_x:.2f})$:** `{format_prob(prob_sf)}` (Prob. de que el evento ocurra *después* de {calc_x})")
             
             st.subheader("Estadísticos:")
-            st.markdown(f"**Media (μ = 1/λ):** `{dist.mean():.4f}` (Tiempo medio entre eventos)")
-            st.markdown(f"**Varianza (σ² = 1/λ²):** `{dist.var():.4f}`")
-                
+            st.markdown(f"**Media (μ = 1/λ):** `{moments['mean']:.4f}` (Tiempo medio entre eventos)")
+            st.markdown(f"**Varianza (σ² = 1/λ²):** `{moments['var']:.4f}`")
+
+            # Varias x e intervalos en una sola evaluación
+            probability_query_expander(calc.dist, 'exp')
         except Exception as e:
             st.error(f"Error en el cálculo: {e}")
 
@@ -133,7 +145,7 @@ with tab5:
     ans1 = st.number_input("Tu respuesta (Media μ en horas):", min_value=0.0, step=0.01, format="%.2f", key='exp_ex1_ans')
     if st.button("Revisar 1", key='exp_ex1_btn'):
         correct_ans = 1 / 4
-        if np.isclose(ans1, correct_ans):
+        if record_attempt('exponencial', 'ex1', ans1, np.isclose(ans1, correct_ans)):
             st.success(f"¡Correcto! La media es {correct_ans:.2f} horas (o 15 min).")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.2f}.")
@@ -147,7 +159,7 @@ with tab5:
     if st.button("Revisar 2", key='exp_ex2_btn'):
         dist_ex = stats.expon(scale=1/0.5)
         correct_ans = dist_ex.sf(3)
-        if np.isclose(ans2, correct_ans):
+        if record_attempt('exponencial', 'ex2', ans2, np.isclose(ans2, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.4f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.4f}.")
@@ -162,7 +174,7 @@ with tab5:
     if st.button("Revisar 3", key='exp_ex3_btn'):
         dist_ex = stats.expon(scale=1/0.5)
         correct_ans = dist_ex.sf(3) # ¡Es la misma que el Ej. 2!
-        if np.isclose(ans3, correct_ans):
+        if record_attempt('exponencial', 'ex3', ans3, np.isclose(ans3, correct_ans)):
             st.success(f"¡Correcto! La prob. es {correct_ans:.4f}. Es la misma que $P(X > 3)$.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.4f}.")
@@ -170,3 +182,8 @@ with tab5:
             st.write(f"Por la propiedad de falta de memoria, $P(X > s+t | X > s) = P(X > t)$.")
             st.write("El hecho de que haya sobrevivido 2 años no importa. Buscamos la prob. de que sobreviva 3 años *adicionales*.")
             st.code(f"P(X > 2+3 | X > 2) = P(X > 3) = {correct_ans:.4f}")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('exponencial', 'exp')
+
+debug_panel()
@@ -1,15 +1,23 @@
 import streamlit as st
 import numpy as np
-import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda
 try:
-    from helpers import plot_continuous_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import moment_estimates_expander, empirical_cdf_expander, truncation_expander, format_prob, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('normal')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página ---
 
 st.title("Distribución Normal (Gaussiana)")
@@ -82,24 +90,14 @@ with tab2:
         st.error("Sigma (σ) debe ser positiva.")
     else:
         try:
-            dist = stats.norm(loc=mu_slider, scale=sigma_slider)
-            
-            # Graficar +/- 4 desviaciones estándar
-            x_min = mu_slider - 4 * sigma_slider
-            x_max = mu_slider + 4 * sigma_slider
-            
-            fig = plot_continuous_distribution(dist, x_min, x_max, f"PDF Normal (μ={mu_slider:.1f}, σ={sigma_slider:.1f})")
-            
-            # Añadir líneas de la regla empírica
-            ax = fig.gca()
-            ax.axvline(mu_slider + sigma_slider, color='gray', linestyle='--', linewidth=1, label='μ ± 1σ (68%)')
-            ax.axvline(mu_slider - sigma_slider, color='gray', linestyle='--', linewidth=1)
-            ax.axvline(mu_slider + 2*sigma_slider, color='dimgray', linestyle=':', linewidth=1, label='μ ± 2σ (95%)')
-            ax.axvline(mu_slider - 2*sigma_slider, color='dimgray', linestyle=':', linewidth=1)
-            ax.legend()
-            
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('normal', mu=mu_slider, sigma=sigma_slider)
+            show_figure(view.fig, 'normal', mu_slider, sigma_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'norm')
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PDF {view.label}", 'norm')
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -114,11 +112,15 @@ with tab3:
     with col2:
         calc_sigma = st.number_input("Desviación Estándar (σ)", min_value=0.01, value=1.0, step=0.01, key='norm_calc_sigma')
 
+    # Valores iniciales por el método de los momentos a partir de datos
+    moment_estimates_expander('normal', {'mu': 'norm_calc_mu', 'sigma': 'norm_calc_sigma'}, 'norm')
+
     if calc_sigma <= 0:
         st.error("'σ' debe ser positiva.")
     else:
         try:
-            dist = stats.norm(loc=calc_mu, scale=calc_sigma)
+            # Resta en el lado de las colas (sf - sf a la derecha de μ)
+            calc = calculator('normal', mu=calc_mu, sigma=calc_sigma)
             
             st.subheader("Cálculo de Probabilidad")
             
@@ -132,16 +134,18 @@ with tab3:
             if calc_x1 >= calc_x2:
                 st.warning("El límite inferior 'x₁' debe ser menor que 'x₂'.")
             else:
-                prob_range = dist.cdf(calc_x2) - dist.cdf(calc_x1)
-                st.markdown(f"**$P({calc_x1:.2f} \le X \le {calc_x2:.2f})$:** `{prob_range:.6f}`")
+                prob_range = calc.between(calc_x1, calc_x2)
+                st.markdown(f"**$P({calc_x1:.2f} \le X \le {calc_x2:.2f})$:** `{format_prob(prob_range)}`")
 
             st.write("**2. Probabilidad Acumulada $P(X \le x)$**")
             calc_x = st.number_input("Valor de x", value=calc_mu, step=0.1, key='norm_calc_x')
-            prob_cdf = dist.cdf(calc_x)
-            prob_sf = dist.sf(calc_x)
-            st.markdown(f"**$P(X \le {calc_x:.2f})$:** `{prob_cdf:.6f}` (Área a la izquierda de x)")
-            st.markdown(f"**$P(X > {calc_x:.2f})$:** `{prob_sf:.6f}` (Área a la derecha de x)")
-                
+            tails = calc.at(calc_x)
+            prob_cdf, prob_sf = tails['le'], tails['gt']
+            st.markdown(f"**$P(X \le {calc_x:.2f})$:** `{format_prob(prob_cdf)}` (Área a la izquierda de x)")
+            st.markdown(f"**$P(X > {calc_x:.2f})$:** `{format_prob(prob_sf)}` (Área a la derecha de x)")
+
+            # Varias x e intervalos en una sola evaluación
+            probability_query_expander(calc.dist, 'norm')
         except Exception as e:
             st.error(f"Error en el cálculo: {e}")
 
@@ -161,7 +165,7 @@ with tab5:
     ans1 = st.number_input("Tu respuesta (Z-score):", min_value=-5.0, max_value=5.0, step=0.1, format="%.1f", key='norm_ex1_ans')
     if st.button("Revisar 1", key='norm_ex1_btn'):
         correct_ans = (65 - 50) / 10
-        if np.isclose(ans1, correct_ans):
+        if record_attempt('normal', 'ex1', ans1, np.isclose(ans1, correct_ans)):
             st.success(f"¡Correcto! El Z-score es {correct_ans:.1f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.1f}.")
@@ -173,7 +177,7 @@ with tab5:
     st.write("Usando N(50, 10), ¿qué porcentaje aproximado de datos cae entre 40 y 60?")
     ans2 = st.number_input("Tu respuesta (%):", min_value=0, max_value=100, step=1, key='norm_ex2_ans')
     if st.button("Revisar 2", key='norm_ex2_btn'):
-        if ans2 == 68:
+        if record_attempt('normal', 'ex2', ans2, ans2 == 68):
             st.success("¡Correcto! Cae el 68%.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es 68%.")
@@ -186,7 +190,7 @@ with tab5:
     ans3 = st.number_input("Tu respuesta (Probabilidad):", min_value=0.0, max_value=1.0, step=0.01, format="%.2f", key='norm_ex3_ans')
     if st.button("Revisar 3", key='norm_ex3_btn'):
         correct_ans = 0.5
-        if np.isclose(ans3, correct_ans):
+        if record_attempt('normal', 'ex3', ans3, np.isclose(ans3, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.2f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.2f}.")
@@ -194,3 +198,8 @@ with tab5:
             st.write(f"La distribución normal es simétrica. La media ($\mu=50$) divide la distribución exactamente a la mitad.")
             st.write("Por lo tanto, 50% del área está a la izquierda y 50% a la derecha.")
             st.code(f"stats.norm(loc=50, scale=10).cdf(50) = 0.5")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('normal', 'norm')
+
+debug_panel()
@@ -1,15 +1,23 @@
 import streamlit as st
 import numpy as np
-import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda
 try:
-    from helpers import plot_continuous_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import moment_estimates_expander, empirical_cdf_expander, truncation_expander, format_prob, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('lognormal')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página ---
 
 st.title("Distribución Lognormal")
@@ -74,19 +82,14 @@ with tab2:
         st.error("Sigma (σ_log) debe ser positiva.")
     else:
         try:
-            # SciPy usa s=sigma_log, scale=exp(mu_log)
-            dist = stats.lognorm(s=sigma_log_slider, scale=np.exp(mu_log_slider))
-            
-            # Graficar hasta el percentil 99.5
-            x_min = 0
-            x_max = dist.ppf(0.995)
-            # Asegurar que x_max no sea demasiado grande o inf
-            if x_max > 50 or np.isinf(x_max) or np.isnan(x_max):
-                x_max = 50 
-            
-            fig = plot_continuous_distribution(dist, x_min, x_max, f"PDF Lognormal (μ_log={mu_log_slider:.1f}, σ_log={sigma_log_slider:.1f})")
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('lognormal', mu_log=mu_log_slider, sigma_log=sigma_log_slider)
+            show_figure(view.fig, 'lognormal', mu_log_slider, sigma_log_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'lognorm')
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PDF {view.label}", 'lognorm')
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -101,25 +104,31 @@ with tab3:
     with col2:
         calc_sigma_log = st.number_input("Desv. Est. Log (σ_log)", min_value=0.01, value=1.0, step=0.01, key='lognorm_calc_sigma')
 
+    # Valores iniciales por el método de los momentos a partir de datos
+    moment_estimates_expander('lognormal', {'mu_log': 'lognorm_calc_mu', 'sigma_log': 'lognorm_calc_sigma'}, 'lognorm')
+
     if calc_sigma_log <= 0:
         st.error("'σ_log' debe ser positiva.")
     else:
         try:
-            dist = stats.lognorm(s=calc_sigma_log, scale=np.exp(calc_mu_log))
+            calc = calculator('lognormal', mu_log=calc_mu_log, sigma_log=calc_sigma_log)
+            moments = calc.moments()
             
             st.subheader("Cálculo de Probabilidad (para $X$)")
             
             st.write("**1. Probabilidad Acumulada $P(X \le x)$**")
             calc_x = st.number_input("Valor de X (debe ser > 0)", min_value=0.01, value=1.0, step=0.1, key='lognorm_calc_x')
-            prob_cdf = dist.cdf(calc_x)
-            prob_sf = dist.sf(calc_x)
-            st.markdown(f"**$P(X \le {calc_x:.2f})$:** `{prob_cdf:.6f}`")
-            st.markdown(f"**$P(X > {calc_x:.2f})$:** `{prob_sf:.6f}`")
+            at_x = calc.at(calc_x)
+            prob_cdf, prob_sf = at_x['le'], at_x['gt']
+            st.markdown(f"**$P(X \le {calc_x:.2f})$:** `{format_prob(prob_cdf)}`")
+            st.markdown(f"**$P(X > {calc_x:.2f})$:** `{format_prob(prob_sf)}`")
 
             st.subheader("Estadísticos (de $X$, no de $\ln(X)$):")
-            st.markdown(f"**Media (μ):** `{dist.mean():.4f}`")
-            st.markdown(f"**Varianza (σ²):** `{dist.var():.4f}`")
-                
+            st.markdown(f"**Media (μ):** `{moments['mean']:.4f}`")
+            st.markdown(f"**Varianza (σ²):** `{moments['var']:.4f}`")
+
+            # Varias x e intervalos en una sola evaluación
+            probability_query_expander(calc.dist, 'lognorm')
         except Exception as e:
             st.error(f"Error en el cálculo: {e}")
 
@@ -139,7 +148,7 @@ with tab5:
     ans1 = st.number_input("Tu respuesta (P(X≤1)):", min_value=0.0, max_value=1.0, step=0.01, format="%.2f", key='lognorm_ex1_ans')
     if st.button("Revisar 1", key='lognorm_ex1_btn'):
         correct_ans = 0.5
-        if np.isclose(ans1, correct_ans):
+        if record_attempt('lognormal', 'ex1', ans1, np.isclose(ans1, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.2f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.2f}.")
@@ -152,12 +161,12 @@ with tab5:
     ans2 = st.number_input("Tu respuesta (Media E[X]):", min_value=0.0, step=0.01, format="%.3f", key='lognorm_ex2_ans')
     if st.button("Revisar 2", key='lognorm_ex2_btn'):
         correct_ans = np.exp(1 + (0.5**2 / 2))
-        if np.isclose(ans2, correct_ans):
+        if record_attempt('lognormal', 'ex2', ans2, np.isclose(ans2, correct_ans)):
             st.success(f"¡Correcto! La media es {correct_ans:.3f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.3f}.")
         with st.expander("Ver Solución"):
-            st.write(f"La media es $E[X] = e^{\mu_{\log} + \sigma_{\log}^2 / 2}$.")
+            st.write(r"La media es $E[X] = e^{\mu_{\log} + \sigma_{\log}^2 / 2}$.")
             st.code(f"np.exp(1 + 0.5**2 / 2) = np.exp(1 + 0.125) = np.exp(1.125) = {correct_ans:.3f}")
             
     st.subheader("Ejercicio 3")
@@ -165,11 +174,16 @@ with tab5:
     ans3 = st.number_input("Tu respuesta (Mediana de X):", min_value=0.0, step=0.1, format="%.2f", key='lognorm_ex3_ans')
     if st.button("Revisar 3", key='lognorm_ex3_btn'):
         correct_ans = np.exp(3)
-        if np.isclose(ans3, correct_ans):
+        if record_attempt('lognormal', 'ex3', ans3, np.isclose(ans3, correct_ans)):
             st.success(f"¡Correcto! La mediana es {correct_ans:.2f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.2f}.")
         with st.expander("Ver Solución"):
-            st.write(f"La mediana de $X$ es $e^{{\mu_{\log}}}$. La mediana de $\ln(X)$ es $\mu_{\log}$.")
+            st.write(r"La mediana de $X$ es $e^{\mu_{\log}}$. La mediana de $\ln(X)$ es $\mu_{\log}$.")
             st.write("Mediana($X$) = $e^{Mediana(\ln(X))}$ = $e^{\mu_{\log}}$")
             st.code(f"np.exp(3) = {correct_ans:.2f}")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('lognormal', 'lognorm')
+
+debug_panel()
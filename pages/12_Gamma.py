@@ -1,21 +1,29 @@
 import streamlit as st
 import numpy as np
-import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda
 try:
-    from helpers import plot_continuous_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import moment_estimates_expander, empirical_cdf_expander, truncation_expander, bayesian_update_tab, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('gamma')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página ---
 
 st.title("Distribución Gamma")
 
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "Teoría y Fórmulas", "Visualización", "Calculadora", "Ejemplos", "Ejercicios"
+tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+    "Teoría y Fórmulas", "Visualización", "Calculadora", "Ejemplos", "Ejercicios", "Actualización Bayesiana"
 ])
 
 with tab1:
@@ -76,15 +84,14 @@ with tab2:
         st.error("Alfa (α) y Beta (β) deben ser positivos.")
     else:
         try:
-            dist = stats.gamma(a=alpha_slider, scale=beta_slider)
-            
-            # Graficar hasta el percentil 99.8
-            x_min = 0
-            x_max = dist.ppf(0.998)
-            
-            fig = plot_continuous_distribution(dist, x_min, x_max, f"PDF Gamma (α={alpha_slider:.1f}, β={beta_slider:.1f})")
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('gamma', alpha=alpha_slider, beta=beta_slider)
+            show_figure(view.fig, 'gamma', alpha_slider, beta_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'gamma')
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PDF {view.label}", 'gamma')
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -99,16 +106,20 @@ with tab3:
     with col2:
         calc_beta = st.number_input("Escala (β)", min_value=0.01, value=1.0, step=0.1, key='gamma_calc_beta')
 
+    # Valores iniciales por el método de los momentos a partir de datos
+    moment_estimates_expander('gamma', {'alpha': 'gamma_calc_alpha', 'beta': 'gamma_calc_beta'}, 'gamma')
+
     if calc_alpha <= 0 or calc_beta <= 0:
         st.error("'α' y 'β' deben ser positivos.")
     else:
         try:
-            dist = stats.gamma(a=calc_alpha, scale=calc_beta)
+            calc = calculator('gamma', alpha=calc_alpha, beta=calc_beta)
+            moments = calc.moments()
             
             st.subheader("Estadísticos:")
-            st.markdown(f"**Media (μ = αβ):** `{dist.mean():.4f}`")
-            st.markdown(f"**Varianza (σ² = αβ²):** `{dist.var():.4f}`")
-            st.markdown(f"**Desviación Estándar (σ):** `{dist.std():.4f}`")
+            st.markdown(f"**Media (μ = αβ):** `{moments['mean']:.4f}`")
+            st.markdown(f"**Varianza (σ² = αβ²):** `{moments['var']:.4f}`")
+            st.markdown(f"**Desviación Estándar (σ):** `{moments['std']:.4f}`")
             
             st.subheader("Nota Pedagógica sobre Cálculo de Probabilidad")
             st.info("""
@@ -118,7 +129,9 @@ with tab3:
             
             Por esta razón, los valores se obtienen de tablas estándar o, más comúnmente, de **software estadístico** (como R, Python con SciPy, o Excel) que tienen estas funciones numéricas implementadas.
             """)
-                
+
+            # Varias x e intervalos en una sola evaluación
+            probability_query_expander(calc.dist, 'gamma')
         except Exception as e:
             st.error(f"Error en el cálculo: {e}")
 
@@ -138,7 +151,7 @@ with tab5:
     ans1 = st.number_input("Tu respuesta (Media μ):", min_value=0.0, step=1.0, format="%.1f", key='gamma_ex1_ans')
     if st.button("Revisar 1", key='gamma_ex1_btn'):
         correct_ans = 3 * 10
-        if np.isclose(ans1, correct_ans):
+        if record_attempt('gamma', 'ex1', ans1, np.isclose(ans1, correct_ans)):
             st.success(f"¡Correcto! La media es {correct_ans:.1f} minutos.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.1f} minutos.")
@@ -151,7 +164,7 @@ with tab5:
     ans2 = st.number_input("Tu respuesta (Varianza σ²):", min_value=0.0, step=1.0, format="%.1f", key='gamma_ex2_ans')
     if st.button("Revisar 2", key='gamma_ex2_btn'):
         correct_ans = 3 * (10**2)
-        if np.isclose(ans2, correct_ans):
+        if record_attempt('gamma', 'ex2', ans2, np.isclose(ans2, correct_ans)):
             st.success(f"¡Correcto! La varianza es {correct_ans:.1f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.1f}.")
@@ -163,10 +176,25 @@ with tab5:
     st.write("¿Qué distribución obtienes si configuras una Gamma con $\alpha=1$ y $\beta=5$?")
     ans3 = st.text_input("Tu respuesta (Nombre de la distribución):", key='gamma_ex3_ans').strip().lower()
     if st.button("Revisar 3", key='gamma_ex3_btn'):
-        if ans3 == "exponencial":
+        if record_attempt('gamma', 'ex3', ans3, ans3 == "exponencial"):
             st.success("¡Correcto! Es una Distribución Exponencial.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es 'Exponencial'.")
         with st.expander("Ver Solución"):
             st.write(f"La Distribución Exponencial es un caso especial de la Gamma con $\alpha=1$.")
             st.write("Gamma(1, $\beta$) = Exponencial(escala=$\beta$)")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('gamma', 'gamma')
+
+with tab6:
+    st.header("Actualización Bayesiana (Gamma–Poisson)")
+    st.write(r"""
+    La Gamma es la distribución *a priori* conjugada de la tasa $\lambda$ de una Poisson: si $\lambda \sim$ Gamma($\alpha, \beta$) y se observan
+    conteos $x_1, \dots, x_n$, la *a posteriori* vuelve a ser Gamma. Solo importan la suma de los conteos y cuántos hay, así que el flujo se
+    procesa por lotes sin guardar las observaciones.
+    """)
+    st.latex(r"\alpha' = \alpha + \sum_{i=1}^{n} x_i, \qquad \frac{1}{\beta'} = \frac{1}{\beta} + n")
+    bayesian_update_tab('gamma_poisson', 'gamma')
+
+debug_panel()
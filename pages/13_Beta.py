@@ -1,21 +1,29 @@
 import streamlit as st
 import numpy as np
-import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda
 try:
-    from helpers import plot_continuous_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import moment_estimates_expander, empirical_cdf_expander, truncation_expander, bayesian_update_tab, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('beta')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página ---
 
 st.title("Distribución Beta")
 
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "Teoría y Fórmulas", "Visualización", "Calculadora", "Ejemplos", "Ejercicios"
+tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+    "Teoría y Fórmulas", "Visualización", "Calculadora", "Ejemplos", "Ejercicios", "Actualización Bayesiana"
 ])
 
 with tab1:
@@ -80,15 +88,14 @@ with tab2:
         st.error("Alfa (α) y Beta (β) deben ser positivos.")
     else:
         try:
-            dist = stats.beta(a=alpha_slider, b=beta_slider)
-            
-            # El rango es siempre 0 a 1
-            x_min = 0
-            x_max = 1
-            
-            fig = plot_continuous_distribution(dist, x_min, x_max, f"PDF Beta (α={alpha_slider:.1f}, β={beta_slider:.1f})")
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('beta', alpha=alpha_slider, beta=beta_slider)
+            show_figure(view.fig, 'beta', alpha_slider, beta_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'beta')
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PDF {view.label}", 'beta')
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -103,15 +110,19 @@ with tab3:
     with col2:
         calc_beta = st.number_input("Forma (β)", min_value=0.01, value=5.0, step=0.1, key='beta_calc_beta')
 
+    # Valores iniciales por el método de los momentos a partir de datos
+    moment_estimates_expander('beta', {'alpha': 'beta_calc_alpha', 'beta': 'beta_calc_beta'}, 'beta')
+
     if calc_alpha <= 0 or calc_beta <= 0:
         st.error("'α' y 'β' deben ser positivos.")
     else:
         try:
-            dist = stats.beta(a=calc_alpha, b=calc_beta)
+            calc = calculator('beta', alpha=calc_alpha, beta=calc_beta)
+            moments = calc.moments()
             
             st.subheader("Estadísticos:")
-            st.markdown(f"**Media (μ = α / (α+β)):** `{dist.mean():.4f}`")
-            st.markdown(f"**Varianza (σ²):** `{dist.var():.4f}`")
+            st.markdown(f"**Media (μ = α / (α+β)):** `{moments['mean']:.4f}`")
+            st.markdown(f"**Varianza (σ²):** `{moments['var']:.4f}`")
             st.markdown(f"**Modo:** `{ (calc_alpha-1) / (calc_alpha + calc_beta - 2) :.4f}` (si $\alpha>1, \beta>1$)")
             
             st.subheader("Nota Pedagógica sobre Cálculo de Probabilidad")
@@ -122,7 +133,9 @@ with tab3:
             
             Por esta razón, los valores se obtienen de **software estadístico** (como R, Python con SciPy, o Excel) que tienen estas funciones implementadas.
             """)
-                
+
+            # Varias x e intervalos en una sola evaluación
+            probability_query_expander(calc.dist, 'beta')
         except Exception as e:
             st.error(f"Error en el cálculo: {e}")
 
@@ -143,7 +156,7 @@ with tab5:
     ans1 = st.number_input("Tu respuesta (Media μ):", min_value=0.0, max_value=1.0, step=0.001, format="%.3f", key='beta_ex1_ans')
     if st.button("Revisar 1", key='beta_ex1_btn'):
         correct_ans = 30 / (30 + 70)
-        if np.isclose(ans1, correct_ans):
+        if record_attempt('beta', 'ex1', ans1, np.isclose(ans1, correct_ans)):
             st.success(f"¡Correcto! La media es {correct_ans:.3f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.3f}.")
@@ -160,7 +173,7 @@ with tab5:
         ans_b = st.number_input("Valor de β:", min_value=0, step=1, key='beta_ex2_b')
     
     if st.button("Revisar 2", key='beta_ex2_btn'):
-        if ans_a == 1 and ans_b == 1:
+        if record_attempt('beta', 'ex2', f"{ans_a}, {ans_b}", ans_a == 1 and ans_b == 1):
             st.success("¡Correcto! Beta(1, 1) es la Distribución Uniforme.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es α=1 y β=1.")
@@ -169,9 +182,24 @@ with tab5:
     st.write("Si $\alpha=0.5$ y $\beta=0.5$, ¿dónde es más probable que esté el valor de $X$?")
     ans3 = st.text_input("Tu respuesta (Ej: 'cerca del centro', 'cerca de los extremos'):", key='beta_ex3_ans').strip().lower()
     if st.button("Revisar 3", key='beta_ex3_btn'):
-        if "extremos" in ans3 or "0 o 1" in ans3 or "cero o uno" in ans3:
+        if record_attempt('beta', 'ex3', ans3, "extremos" in ans3 or "0 o 1" in ans3 or "cero o uno" in ans3):
             st.success("¡Correcto! Es una forma de 'U', más probable cerca de 0 o 1.")
         else:
             st.error(f"Incorrecto. La respuesta es 'cerca de los extremos'.")
         with st.expander("Ver Solución"):
             st.write(f"Cuando $\alpha < 1$ y $\beta < 1$, la distribución tiene forma de U, lo que significa que los valores en el medio son *menos* probables que los valores en los extremos 0 y 1.")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('beta', 'beta')
+
+with tab6:
+    st.header("Actualización Bayesiana (Beta–Binomial)")
+    st.write(r"""
+    La Beta es la distribución *a priori* conjugada de la probabilidad $p$ de una Bernoulli/Binomial: si $p \sim$ Beta($\alpha, \beta$) y se
+    observan resultados $x_i \in \{0, 1\}$, la *a posteriori* vuelve a ser Beta. Solo importan los éxitos y los fracasos acumulados, así que el
+    flujo se procesa por lotes sin guardar las observaciones.
+    """)
+    st.latex(r"\alpha' = \alpha + \sum_{i=1}^{n} x_i, \qquad \beta' = \beta + n - \sum_{i=1}^{n} x_i")
+    bayesian_update_tab('beta_binomial', 'beta')
+
+debug_panel()
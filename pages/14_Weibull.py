@@ -1,15 +1,24 @@
 import streamlit as st
 import numpy as np
 import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda
 try:
-    from helpers import plot_continuous_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import moment_estimates_expander, empirical_cdf_expander, truncation_expander, format_prob, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('weibull')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página ---
 
 st.title("Distribución de Weibull")
@@ -79,15 +88,14 @@ with tab2:
         st.error("k y λ deben ser positivos.")
     else:
         try:
-            # SciPy usa c=k, scale=lambda
-            dist = stats.weibull_min(c=k_slider, scale=lambda_slider)
-            
-            x_min = 0
-            x_max = dist.ppf(0.995) # Graficar hasta el 99.5%
-            
-            fig = plot_continuous_distribution(dist, x_min, x_max, f"PDF Weibull (k={k_slider:.1f}, λ={lambda_slider:.1f})")
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('weibull', k=k_slider, lam=lambda_slider)
+            show_figure(view.fig, 'weibull', k_slider, lambda_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'weibull')
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PDF {view.label}", 'weibull')
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -101,6 +109,9 @@ with tab3:
         calc_k = st.number_input("Forma (k)", min_value=0.01, value=2.0, step=0.1, key='weibull_calc_k')
     with col2:
         calc_lambda = st.number_input("Escala (λ)", min_value=0.01, value=10.0, step=0.1, key='weibull_calc_lambda')
+
+    # Valores iniciales por el método de los momentos a partir de datos
+    moment_estimates_expander('weibull', {'k': 'weibull_calc_k', 'lam': 'weibull_calc_lambda'}, 'weibull')
     
     st.subheader("Cálculo de Probabilidad")
     calc_x = st.number_input("Tiempo (x)", min_value=0.0, value=10.0, step=0.1, key='weibull_calc_x')
@@ -109,19 +120,22 @@ with tab3:
         st.error("'k' y 'λ' deben ser positivos, 'x' debe ser >= 0.")
     else:
         try:
-            dist = stats.weibull_min(c=calc_k, scale=calc_lambda)
+            calc = calculator('weibull', k=calc_k, lam=calc_lambda)
+            moments = calc.moments()
             
-            prob_cdf = dist.cdf(calc_x)
-            prob_sf = dist.sf(calc_x) # Survival function (1 - cdf)
+            at_x = calc.at(calc_x)
+            prob_cdf, prob_sf = at_x['le'], at_x['gt'] # sf: P(X > x) sin usar 1 - cdf
             
             st.subheader("Resultados:")
-            st.markdown(f"**$P(X \le {calc_x:.2f})$:** `{prob_cdf:.6f}` (Prob. de fallo *antes* de {calc_x})")
-            st.markdown(f"**$P(X > {calc_x:.2f})$:** `{prob_sf:.6f}` (Prob. de *sobrevivir más allá* de {calc_x})")
+            st.markdown(f"**$P(X \le {calc_x:.2f})$:** `{format_prob(prob_cdf)}` (Prob. de fallo *antes* de {calc_x})")
+            st.markdown(f"**$P(X > {calc_x:.2f})$:** `{format_prob(prob_sf)}` (Prob. de *sobrevivir más allá* de {calc_x})")
             
             st.subheader("Estadísticos:")
-            st.markdown(f"**Media (μ):** `{dist.mean():.4f}` (Tiempo medio de fallo)")
-            st.markdown(f"**Varianza (σ²):** `{dist.var():.4f}`")
-                
+            st.markdown(f"**Media (μ):** `{moments['mean']:.4f}` (Tiempo medio de fallo)")
+            st.markdown(f"**Varianza (σ²):** `{moments['var']:.4f}`")
+
+            # Varias x e intervalos en una sola evaluación
+            probability_query_expander(calc.dist, 'weibull')
         except Exception as e:
             st.error(f"Error en el cálculo: {e}")
 
@@ -140,7 +154,7 @@ with tab5:
     st.write("¿Qué distribución es idéntica a una Weibull con parámetro de forma $k=1$?")
     ans1 = st.text_input("Tu respuesta (Nombre de la distribución):", key='weibull_ex1_ans').strip().lower()
     if st.button("Revisar 1", key='weibull_ex1_btn'):
-        if "exponencial" in ans1:
+        if record_attempt('weibull', 'ex1', ans1, "exponencial" in ans1):
             st.success("¡Correcto! Es la Distribución Exponencial.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es 'Exponencial'.")
@@ -151,7 +165,7 @@ with tab5:
     st.write("Un ingeniero modela el tiempo de fallo de un motor. Observa que los fallos son raros al principio, pero aumentan drásticamente a medida que los motores envejecen. ¿Qué rango de $k$ debería usar?")
     ans2 = st.text_input("Tu respuesta (Ej: 'k=1', 'k<1', 'k>1'):", key='weibull_ex2_ans').strip().lower()
     if st.button("Revisar 2", key='weibull_ex2_btn'):
-        if ans2 == "k>1":
+        if record_attempt('weibull', 'ex2', ans2, ans2 == "k>1"):
             st.success("¡Correcto! $k>1$ modela fallos por desgaste (tasa de fallo creciente).")
         else:
             st.error(f"Incorrecto. La respuesta correcta es $k>1$.")
@@ -162,7 +176,7 @@ with tab5:
     if st.button("Revisar 3", key='weibull_ex3_btn'):
         dist_ex = stats.weibull_min(c=1, scale=500)
         correct_ans = dist_ex.cdf(500)
-        if np.isclose(ans3, correct_ans):
+        if record_attempt('weibull', 'ex3', ans3, np.isclose(ans3, correct_ans)):
             st.success(f"¡Correcto! La probabilidad es {correct_ans:.4f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.4f}.")
@@ -170,3 +184,8 @@ with tab5:
             st.write(f"Esto es una Exponencial con media $\lambda=500$. Buscamos $P(X \le 500)$.")
             st.latex(r"CDF = $1 - e^{-(x/\lambda)^k} = 1 - e^{-(500/500)^1} = 1 - e^{-1}$")
             st.code(f"1 - np.exp(-1) = {correct_ans:.4f}")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('weibull', 'weibull')
+
+debug_panel()
@@ -1,15 +1,23 @@
 import streamlit as st
 import numpy as np
-import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda
 try:
-    from helpers import plot_continuous_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import empirical_cdf_expander, truncation_expander, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('t')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página ---
 
 st.title("Distribución t de Student")
@@ -74,23 +82,14 @@ with tab2:
         st.error("df debe ser positivo.")
     else:
         try:
-            dist = stats.t(df=df_slider)
-            
-            # Rango de visualización
-            x_min = -4
-            x_max = 4
-            
-            fig = plot_continuous_distribution(dist, x_min, x_max, f"PDF t de Student (df={df_slider})")
-            
-            # Superponer la Normal Estándar para comparar
-            ax = fig.gca()
-            norm_dist = stats.norm(0, 1)
-            x_values = np.linspace(x_min, x_max, 500)
-            ax.plot(x_values, norm_dist.pdf(x_values), color='red', linestyle=':', linewidth=2, label='Normal(0,1)')
-            ax.legend()
-            
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('t', df=df_slider)
+            show_figure(view.fig, 't', df_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 't')
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PDF {view.label}", 't')
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -101,16 +100,19 @@ with tab3:
     st.subheader("Parámetros")
     calc_df = st.number_input("Grados de Libertad (df, $\nu$)", min_value=1, value=5, step=1, key='t_calc_df')
 
+    calc = calculator('t', df=calc_df)
+    moments = calc.moments()
+
     st.subheader("Estadísticos:")
     if calc_df <= 1:
         st.markdown(f"**Media (μ):** `Indefinida` (Requiere $\nu > 1$)")
     else:
-        st.markdown(f"**Media (μ):** `{stats.t.mean(df=calc_df):.4f}`")
+        st.markdown(f"**Media (μ):** `{moments['mean']:.4f}`")
 
     if calc_df <= 2:
         st.markdown(f"**Varianza (σ²):** `Indefinida` (Requiere $\nu > 2$)")
     else:
-        st.markdown(f"**Varianza (σ²):** `{stats.t.var(df=calc_df):.4f}`")
+        st.markdown(f"**Varianza (σ²):** `{moments['var']:.4f}`")
     
     st.subheader("Nota Pedagógica sobre Cálculo de Probabilidad")
     st.info("""
@@ -121,6 +123,9 @@ with tab3:
     Hoy en día, se obtienen directamente de **software estadístico** (como R, Python con SciPy, o Excel), que usan funciones numéricas para calcular el área bajo esta compleja curva.
     """)
 
+    # Varias x e intervalos en una sola evaluación
+    probability_query_expander(calc.dist, 't')
+
 with tab4:
     st.header("Ejemplos Aplicados")
     st.markdown("""
@@ -137,7 +142,7 @@ with tab5:
     ans1 = st.number_input("Tu respuesta (df):", min_value=1, step=1, key='t_ex1_ans')
     if st.button("Revisar 1", key='t_ex1_btn'):
         correct_ans = 24
-        if ans1 == correct_ans:
+        if record_attempt('t', 'ex1', ans1, ans1 == correct_ans):
             st.success(f"¡Correcto! Los df son $n-1 = 25 - 1 = 24$.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans}.")
@@ -147,7 +152,7 @@ with tab5:
     ans2 = st.number_input("Tu respuesta (Varianza σ²):", min_value=0.0, step=0.01, format="%.2f", key='t_ex2_ans')
     if st.button("Revisar 2", key='t_ex2_btn'):
         correct_ans = 5 / (5 - 2)
-        if np.isclose(ans2, correct_ans):
+        if record_attempt('t', 'ex2', ans2, np.isclose(ans2, correct_ans)):
             st.success(f"¡Correcto! La varianza es {correct_ans:.2f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.2f}.")
@@ -159,9 +164,14 @@ with tab5:
     st.write("¿A qué distribución se parece más una $t(df=100)$?")
     ans3 = st.text_input("Tu respuesta (Nombre de la distribución):", key='t_ex3_ans').strip().lower()
     if st.button("Revisar 3", key='t_ex3_btn'):
-        if "normal" in ans3:
+        if record_attempt('t', 'ex3', ans3, "normal" in ans3):
             st.success("¡Correcto! A la Distribución Normal Estándar.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es 'Normal' o 'Normal Estándar'.")
         with st.expander("Ver Solución"):
             st.write(f"A medida que $df \to \infty$, la distribución t converge a la N(0, 1). Con $df=100$, las colas ya son muy ligeras y es casi idéntica a la Normal.")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('t', 't')
+
+debug_panel()
@@ -1,15 +1,22 @@
 import streamlit as st
-import numpy as np
-import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda
 try:
-    from helpers import plot_continuous_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import empirical_cdf_expander, truncation_expander, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('chi2')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página ---
 
 st.title("Distribución Chi-Cuadrado (χ²)")
@@ -71,14 +78,14 @@ with tab2:
         st.error("k (df) debe ser positivo.")
     else:
         try:
-            dist = stats.chi2(df=k_slider)
-            
-            x_min = 0
-            x_max = dist.ppf(0.998) # Graficar hasta el 99.8%
-            
-            fig = plot_continuous_distribution(dist, x_min, x_max, f"PDF Chi-Cuadrado (k={k_slider})")
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('chi2', k=k_slider)
+            show_figure(view.fig, 'chi2', k_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'chi2')
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PDF {view.label}", 'chi2')
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -93,9 +100,10 @@ with tab3:
     if calc_k <= 0:
         st.error("k debe ser > 0")
     else:
-        dist = stats.chi2(df=calc_k)
-        st.markdown(f"**Media (μ = k):** `{dist.mean():.4f}`")
-        st.markdown(f"**Varianza (σ² = 2k):** `{dist.var():.4f}`")
+        calc = calculator('chi2', k=calc_k)
+        moments = calc.moments()
+        st.markdown(f"**Media (μ = k):** `{moments['mean']:.4f}`")
+        st.markdown(f"**Varianza (σ² = 2k):** `{moments['var']:.4f}`")
     
     st.subheader("Nota Pedagógica sobre Cálculo de Probabilidad")
     st.info("""
@@ -106,6 +114,10 @@ with tab3:
     Históricamente, los "valores críticos" (ej. el valor $x$ que deja 5% de área a la derecha) se buscaban en **tablas de Chi-Cuadrado**. Hoy, se obtienen de **software estadístico**.
     """)
 
+    # Varias x e intervalos en una sola evaluación
+    if calc_k > 0:
+        probability_query_expander(calc.dist, 'chi2')
+
 with tab4:
     st.header("Ejemplos Aplicados")
     st.markdown("""
@@ -126,7 +138,7 @@ with tab5:
         ans_v = st.number_input("Tu respuesta (Varianza σ²):", min_value=0, step=1, key='chi2_ex1_v')
     
     if st.button("Revisar 1", key='chi2_ex1_btn'):
-        if ans_m == 10 and ans_v == 20:
+        if record_attempt('chi2', 'ex1', f"{ans_m}, {ans_v}", ans_m == 10 and ans_v == 20):
             st.success("¡Correcto!")
         else:
             st.error(f"Incorrecto. La media es 10 y la varianza es 20.")
@@ -139,7 +151,7 @@ with tab5:
     ans2 = st.number_input("Tu respuesta (df):", min_value=1, step=1, key='chi2_ex2_ans')
     if st.button("Revisar 2", key='chi2_ex2_btn'):
         correct_ans = (2 - 1) * (4 - 1)
-        if ans2 == correct_ans:
+        if record_attempt('chi2', 'ex2', ans2, ans2 == correct_ans):
             st.success(f"¡Correcto! Los df son 3.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans}.")
@@ -151,9 +163,14 @@ with tab5:
     st.write("Si sumas los cuadrados de 8 variables Normal Estándar independientes, ¿qué distribución sigues?")
     ans3 = st.text_input("Tu respuesta (Nombre y parámetro):", key='chi2_ex3_ans').strip().lower()
     if st.button("Revisar 3", key='chi2_ex3_btn'):
-        if "chi-cuadrado" in ans3 and "8" in ans3:
+        if record_attempt('chi2', 'ex3', ans3, "chi-cuadrado" in ans3 and "8" in ans3):
             st.success("¡Correcto! Chi-Cuadrado con 8 grados de libertad (χ²(8)).")
         else:
             st.error(f"Incorrecto. Respuesta: Chi-Cuadrado(8).")
         with st.expander("Ver Solución"):
             st.write(f"Por definición, la suma de $k$ variables $Z^2$ sigue una $\chi^2(k)$. En este caso, $k=8$.")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('chi2', 'chi2')
+
+debug_panel()
@@ -1,15 +1,23 @@
 import streamlit as st
 import numpy as np
-import scipy.stats as stats
-import matplotlib.pyplot as plt
 
 # Importamos la función de ayuda
 try:
-    from helpers import plot_continuous_distribution
-except ImportError:
-    st.error("No se pudo importar 'helpers.py'. Asegúrate de que esté en el directorio raíz.")
+    from helpers import empirical_cdf_expander, truncation_expander, probability_query_expander, generated_exercises, record_attempt, show_figure, debug_panel
+    from timing import start_rerun
+    from compute import calculator
+    from views import visualization
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
     st.stop()
 
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('f')
+
+# Precalentamiento de las cachés (una vez por proceso, en segundo plano)
+start_warmup()
+
 # --- Contenido de la Página ---
 
 st.title("Distribución F (de Fisher-Snedecor)")
@@ -76,16 +84,14 @@ with tab2:
         st.error("df1 y df2 deben ser positivos.")
     else:
         try:
-            dist = stats.f(dfn=df1_slider, dfd=df2_slider)
-            
-            x_min = 0
-            x_max = dist.ppf(0.995) # Graficar hasta el 99.5%
-            # Evitar valores extremos si df2 es pequeño
-            if x_max > 15: x_max = 15
-            
-            fig = plot_continuous_distribution(dist, x_min, x_max, f"PDF Distribución F (df1={df1_slider}, df2={df2_slider})")
-            st.pyplot(fig)
-            plt.close(fig)
+            view = visualization('f', df1=df1_slider, df2=df2_slider)
+            show_figure(view.fig, 'f', df1_slider, df2_slider)
+
+            # Superponer la CDF empírica de un archivo del usuario
+            empirical_cdf_expander(view.dist, view.lo, view.hi, f"CDF {view.label}", 'f')
+
+            # Versión truncada y/o trasladada de la misma distribución
+            truncation_expander(view.frozen, f"PDF {view.label}", 'f')
         except Exception as e:
             st.error(f"Error al generar el gráfico: {e}")
 
@@ -100,16 +106,19 @@ with tab3:
     with col2:
         calc_df2 = st.number_input("Grados de Libertad Denominador (df2)", min_value=1, value=20, step=1, key='f_calc_df2')
 
+    calc = calculator('f', df1=calc_df1, df2=calc_df2)
+    moments = calc.moments()
+
     st.subheader("Estadísticos:")
     if calc_df2 <= 2:
         st.markdown(f"**Media (μ):** `Indefinida` (Requiere $df_2 > 2$)")
     else:
-        st.markdown(f"**Media (μ):** `{stats.f.mean(dfn=calc_df1, dfd=calc_df2):.4f}`")
+        st.markdown(f"**Media (μ):** `{moments['mean']:.4f}`")
 
     if calc_df2 <= 4:
         st.markdown(f"**Varianza (σ²):** `Indefinida` (Requiere $df_2 > 4$)")
     else:
-        st.markdown(f"**Varianza (σ²):** `{stats.f.var(dfn=calc_df1, dfd=calc_df2):.4f}`")
+        st.markdown(f"**Varianza (σ²):** `{moments['var']:.4f}`")
     
     st.subheader("Nota Pedagógica sobre Cálculo de Probabilidad")
     st.info("""
@@ -120,6 +129,9 @@ with tab3:
     Hoy, **software estadístico** realiza estos cálculos numéricamente.
     """)
 
+    # Varias x e intervalos en una sola evaluación
+    probability_query_expander(calc.dist, 'f')
+
 with tab4:
     st.header("Ejemplos Aplicados")
     st.markdown("""
@@ -136,7 +148,7 @@ with tab5:
     ans1 = st.number_input("Tu respuesta (Media μ):", min_value=0.0, step=0.01, format="%.2f", key='f_ex1_ans')
     if st.button("Revisar 1", key='f_ex1_btn'):
         correct_ans = 10 / (10 - 2)
-        if np.isclose(ans1, correct_ans):
+        if record_attempt('f', 'ex1', ans1, np.isclose(ans1, correct_ans)):
             st.success(f"¡Correcto! La media es {correct_ans:.2f}.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es {correct_ans:.2f}.")
@@ -153,7 +165,7 @@ with tab5:
         ans_df2 = st.number_input("Tu respuesta (df2):", min_value=1, step=1, key='f_ex2_df2')
     
     if st.button("Revisar 2", key='f_ex2_btn'):
-        if ans_df1 == 3 and ans_df2 == 28:
+        if record_attempt('f', 'ex2', f"{ans_df1}, {ans_df2}", ans_df1 == 3 and ans_df2 == 28):
             st.success("¡Correcto! $df_1 = 3$ y $df_2 = 28$.")
         else:
             st.error(f"Incorrecto. La respuesta correcta es df1=3 y df2=28.")
@@ -165,10 +177,15 @@ with tab5:
     st.write("Si $T$ sigue una $t(df=25)$, ¿qué distribución sigue $T^2$?")
     ans3 = st.text_input("Tu respuesta (Nombre y parámetros):", key='f_ex3_ans').strip().lower()
     if st.button("Revisar 3", key='f_ex3_btn'):
-        if "f" in ans3 and "1" in ans3 and "25" in ans3:
+        if record_attempt('f', 'ex3', ans3, "f" in ans3 and "1" in ans3 and "25" in ans3):
             st.success("¡Correcto! Sigue una $F(df_1=1, df_2=25)$.")
         else:
             st.error(f"Incorrecto. Respuesta: F(1, 25).")
         with st.expander("Ver Solución"):
             st.write(f"Una propiedad fundamental es que $t(\nu)^2 = F(1, \nu)$.")
             st.write("Por lo tanto, $t(25)^2 = F(1, 25)$.")
+
+    # Variantes por estudiante con respuestas precalculadas
+    generated_exercises('f', 'f')
+
+debug_panel()
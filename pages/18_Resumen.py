@@ -1,10 +1,128 @@
+import inspect
+
 import streamlit as st
 import numpy as np
+import altair as alt
+
+# Importamos las funciones de ayuda
+try:
+    from helpers import plot_discrete_distribution, plot_continuous_distribution, show_figure, debug_panel
+    from timing import start_rerun
+    from figures import managed_figure
+    from relations import RELATIONS, graph_data, relation_data, relation_title
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
+    st.stop()
+
+# Sin la caché de Streamlit: su clave es solo (puntos, título), y el
+# título redondea parámetros como p = λ/n; dos relaciones distintas
+# compartirían el mismo gráfico. La imagen se cachea con show_figure,
+# con los valores exactos de los sliders en la clave.
+_plot_discrete = inspect.unwrap(plot_discrete_distribution)
+_plot_continuous = inspect.unwrap(plot_continuous_distribution)
+
+# Tamaño fijo del mapa (en px) para orientar las flechas
+MAP_WIDTH, MAP_HEIGHT = 820, 480
+X_DOMAIN, Y_DOMAIN = (-0.9, 11.8), (-0.5, 5.7)
+
+
+@st.cache_data
+def relationship_map():
+    # Nodos y aristas del mapa: se generan una vez por proceso
+    return graph_data()
+
+
+def relationship_chart(nodes, edges, selected):
+    """Mapa de relaciones (Altair, se dibuja en el navegador sin recursos externos)."""
+    x_scale = alt.Scale(domain=X_DOMAIN)
+    y_scale = alt.Scale(domain=Y_DOMAIN)
+    # Píxeles por unidad de cada eje: el ángulo de la flecha en pantalla (en grados, horario)
+    sx = MAP_WIDTH / (X_DOMAIN[1] - X_DOMAIN[0])
+    sy = MAP_HEIGHT / (Y_DOMAIN[1] - Y_DOMAIN[0])
+    color = alt.condition(alt.datum.relacion == selected, alt.value('#d62728'), alt.value('#8c96a3'))
+
+    edge_data = alt.Data(values=edges)
+    lines = alt.Chart(edge_data).mark_rule(strokeWidth=2).encode(
+        x=alt.X('x:Q', scale=x_scale, axis=None), y=alt.Y('y:Q', scale=y_scale, axis=None),
+        x2='x2:Q', y2='y2:Q', color=color,
+    )
+    arrows = alt.Chart(edge_data).transform_calculate(
+        angulo=f"atan2(-(datum.y2 - datum.y) * {sy}, (datum.x2 - datum.x) * {sx}) * 180 / PI",
+    ).mark_point(shape='triangle-right', filled=True, size=140, opacity=1).encode(
+        x=alt.X('xf:Q', scale=x_scale), y=alt.Y('yf:Q', scale=y_scale),
+        angle=alt.Angle('angulo:Q', scale=None), color=color,
+    )
+    # Los puntos medios son el blanco del clic
+    click = alt.selection_point(name='arista', fields=['relacion'], on='click')
+    handles = alt.Chart(edge_data).mark_circle(size=220, opacity=0.9).encode(
+        x=alt.X('xm:Q', scale=x_scale), y=alt.Y('ym:Q', scale=y_scale), color=color,
+        tooltip=[alt.Tooltip('titulo:N', title="Relación")],
+    ).add_params(click)
+    edge_labels = alt.Chart(edge_data).mark_text(dy=-13, fontSize=11, color='#44515e').encode(
+        x=alt.X('xm:Q', scale=x_scale), y=alt.Y('ym:Q', scale=y_scale), text='etiqueta:N',
+    )
+
+    node_data = alt.Data(values=nodes)
+    node_position = dict(x=alt.X('x:Q', scale=x_scale), y=alt.Y('y:Q', scale=y_scale), text='nombre:N')
+    # Halo blanco debajo del nombre para que las líneas no lo tapen
+    halo = alt.Chart(node_data).mark_text(fontSize=14, fontWeight='bold', stroke='white', strokeWidth=6).encode(**node_position)
+    names = alt.Chart(node_data).mark_text(fontSize=14, fontWeight='bold').encode(
+        **node_position,
+        color=alt.Color('tipo:N', scale=alt.Scale(domain=["Discreta", "Continua"], range=['#1f4e99', '#2a7d46']),
+                        legend=alt.Legend(title=None, orient='bottom')),
+    )
+    return (lines + arrows + edge_labels + handles + halo + names).properties(
+        width=MAP_WIDTH, height=MAP_HEIGHT,
+    ).configure_view(stroke=None)
+
+
+def select_relation():
+    # Un clic en una arista elige esa relación en el selector
+    points = st.session_state['mapa_relaciones'].selection.get('arista', [])
+    if points:
+        st.session_state['relacion'] = points[0]['relacion']
+
+
+def approximation_figure(data):
+    """Gráfico de la familia base con la aproximación o la muestra simulada superpuesta."""
+    base = data.base
+    if base.discrete:
+        fig = _plot_discrete(base.dist, base.points, f"PMF {base.label}")
+    else:
+        fig = _plot_continuous(base.dist, base.points[0], base.points[1], f"PDF {base.label}")
+
+    with managed_figure(fig, keep=True):
+        ax = fig.gca()
+        if base.discrete:
+            k = np.asarray(base.points, dtype=float)
+            if data.sample is not None:
+                frequency = np.array([np.mean(data.sample == value) for value in k])
+                ax.plot(k, frequency, 'o', color='darkorange', markersize=7, label=f"{data.overlay_label} (frec. relativa)", zorder=4)
+            elif hasattr(data.overlay, 'pmf'):
+                ax.plot(k, data.overlay.pmf(k), 'o', color='darkorange', markersize=7, label=data.overlay_label, zorder=4)
+            else:
+                x = np.linspace(k[0] - 0.5, k[-1] + 0.5, 500)
+                ax.plot(x, data.overlay.pdf(x), color='darkorange', linewidth=2.5, label=data.overlay_label, zorder=4)
+        else:
+            lo, hi = base.points
+            if data.sample is not None:
+                counts, edges = np.histogram(data.sample, bins=60, range=(lo, hi))
+                # Densidad sobre toda la muestra (no solo la parte dentro del rango)
+                density = counts / (len(data.sample) * np.diff(edges))
+                ax.stairs(density, edges, color='darkorange', linewidth=2, label=f"{data.overlay_label} (histograma)", zorder=4)
+            else:
+                x = np.linspace(lo, hi, 500)
+                ax.plot(x, data.overlay.pdf(x), color='darkorange', linestyle='--', linewidth=2.5, label=data.overlay_label, zorder=4)
+        ax.legend()
+    return fig
+
+
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('resumen')
 
 # --- Contenido de la Página ---
 
 st.title("Resumen y Próximos Pasos")
-st.image("https://placehold.co/600x300/003366/FFFFFF?text=Mapa+de+Distribuciones", use_column_width=True)
 
 st.header("¡Felicitaciones!")
 st.write("""
@@ -15,6 +133,25 @@ Ahora posees un "catálogo" de herramientas que te permite modelar una increíbl
 st.header("El Mapa de las Distribuciones")
 st.write("Ninguna distribución vive aislada. Lo más poderoso es entender cómo se relacionan entre sí.")
 
+st.caption("Haz clic en el punto de una flecha (o elige la relación en la lista) para ver la aproximación.")
+nodes, edges = relationship_map()
+relation = st.session_state.get('relacion', next(iter(RELATIONS)))
+st.altair_chart(relationship_chart(nodes, edges, relation), key='mapa_relaciones',
+                on_select=select_relation, selection_mode='arista')
+
+relation = st.selectbox("Relación", list(RELATIONS), format_func=relation_title, key='relacion')
+spec = RELATIONS[relation]
+st.write(spec['text'])
+
+values = {}
+for col, (name, label, low, high, step, initial) in zip(st.columns(len(spec['sliders'])), spec['sliders']):
+    with col:
+        values[name] = st.slider(label, low, high, initial, step, key=f'relacion_{relation}_{name}')
+
+data = relation_data(relation, **values)
+show_figure(approximation_figure(data), 'relacion', relation, *values.values())
+st.markdown(f"**Distancia máxima entre las CDF:** `{data.distance:.4f}` (0 = idénticas)")
+
 st.subheader("1. La Base: Bernoulli")
 st.markdown("""
 - Un **Ensayo de Bernoulli** (un solo $p$) es el átomo.
@@ -52,7 +189,7 @@ st.markdown("""
 """)
 
 st.header("Próximos Pasos en tu Aprendizaje")
-st.write("Ahora que dominas los "qué", estás listo para los "cómo" y "por qué":")
+st.write("Ahora que dominas los «qué», estás listo para los «cómo» y «por qué»:")
 
 st.markdown("""
 1.  **Teorema del Límite Central (TLC):** Estudia a fondo por qué la Distribución Normal es tan importante y cómo emerge de la suma de otras distribuciones.
@@ -61,3 +198,5 @@ st.markdown("""
 4.  **Modelos de Regresión:** Usa la Normal, Binomial y Poisson como base para construir modelos predictivos (Regresión Lineal, Regresión Logística, Regresión de Poisson).
 5.  **Procesos Estocásticos:** Investiga cómo estas distribuciones se usan en secuencias de tiempo, como en las Cadenas de Markov.
 """)
+
+debug_panel()
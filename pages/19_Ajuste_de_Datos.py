@@ -0,0 +1,248 @@
+import hashlib
+import io
+
+import streamlit as st
+import numpy as np
+
+# Importamos las funciones de ayuda
+try:
+    from helpers import plot_discrete_distribution, plot_continuous_distribution, show_figure, debug_panel
+    from timing import start_rerun
+    from figures import managed_figure
+    from families import FAMILIES, format_params
+    from fitting import fit_all, default_families, fitted_distribution, CONTINUOUS_FIT_FAMILIES, DISCRETE_FIT_FAMILIES
+    from gof import gof_batch
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
+    st.stop()
+
+
+@st.cache_data
+def cached_fit_all(data, families, timeout, max_sample):
+    return fit_all(data, families=families, timeout=timeout, max_sample=max_sample)
+
+
+def data_digest(data):
+    """Huella de la muestra: el ranking guardado solo vale para esos datos."""
+    return hashlib.sha1(np.ascontiguousarray(data, dtype=float).tobytes()).hexdigest()
+
+
+def saved_ranking(data):
+    """Ranking del último ajuste, si se hizo sobre estos mismos datos."""
+    digest, ranking = st.session_state.get('fit_ranking', (None, []))
+    return ranking if data is not None and digest == data_digest(data) else []
+
+
+def parse_values(text):
+    """Convierte '1, 2.5, 3' en una lista de floats."""
+    return [float(v) for v in text.replace(';', ',').split(',') if v.strip()]
+
+
+def load_column(raw_bytes, column):
+    """Lee una columna numérica de un CSV/TXT, ignorando encabezados y vacíos."""
+    table = np.genfromtxt(io.BytesIO(raw_bytes), delimiter=',', dtype=float)
+    if table.ndim == 1:
+        values = table if column == 0 else np.array([])
+    else:
+        values = table[:, column]
+    return values[np.isfinite(values)]
+
+
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('ajuste')
+
+# --- Contenido de la Página ---
+
+st.title("Ajuste de Distribuciones a Datos")
+
+tab1, tab2, tab3, tab4 = st.tabs(["Datos", "Ajuste y Ranking", "Comparación Visual", "Bondad de Ajuste"])
+
+with tab1:
+    st.header("Cargar una Muestra")
+    st.write("""
+    Sube una muestra (tiempos de respuesta, tiempos de vida, conteos...) en un archivo CSV o de texto.
+    La aplicación ajusta por **Máxima Verosimilitud** las familias que ya conoces y las ordena por
+    **AIC** (Criterio de Información de Akaike), **BIC** y el estadístico de **Kolmogorov-Smirnov**.
+    """)
+
+    source = st.radio("Origen de los datos", ["Archivo", "Datos de ejemplo"], horizontal=True, key='fit_source')
+    data = None
+    if source == "Archivo":
+        uploaded = st.file_uploader("Archivo CSV / TXT", type=['csv', 'txt'], key='fit_file')
+        column = st.number_input("Columna (empezando en 0)", min_value=0, value=0, step=1, key='fit_column')
+        if uploaded is not None:
+            try:
+                data = load_column(uploaded.getvalue(), column)
+            except Exception as e:
+                st.error(f"No se pudo leer el archivo: {e}")
+    else:
+        example = st.selectbox("Ejemplo", ["Gamma(α=2, β=3)", "Poisson(λ=4)"], key='fit_example')
+        size = st.slider("Tamaño de la muestra", min_value=100, max_value=100_000, value=2_000, step=100, key='fit_size')
+        rng = np.random.default_rng(42)
+        if example.startswith("Gamma"):
+            data = rng.gamma(shape=2.0, scale=3.0, size=size)
+        else:
+            data = rng.poisson(lam=4.0, size=size).astype(float)
+
+    if data is not None and len(data) > 0:
+        st.subheader("Resumen:")
+        st.markdown(f"**Tamaño (n):** `{len(data)}`")
+        st.markdown(f"**Media:** `{np.mean(data):.4f}`")
+        st.markdown(f"**Desviación Estándar:** `{np.std(data, ddof=1) if len(data) > 1 else 0.0:.4f}`")
+        st.markdown(f"**Mínimo / Máximo:** `{np.min(data):.4f}` / `{np.max(data):.4f}`")
+
+with tab2:
+    st.header("Ajuste por Máxima Verosimilitud")
+
+    if data is None or len(data) < 2:
+        st.info("Carga al menos 2 datos en la pestaña 'Datos'.")
+    else:
+        candidates = default_families(data)
+        all_families = CONTINUOUS_FIT_FAMILIES + DISCRETE_FIT_FAMILIES
+        families = st.multiselect(
+            "Familias a ajustar", options=all_families, default=list(candidates),
+            format_func=lambda f: FAMILIES[f]['label'], key='fit_families'
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            timeout = st.number_input("Tiempo límite por familia (s)", min_value=1.0, value=10.0, step=1.0, key='fit_timeout')
+        with col2:
+            max_sample = st.number_input("Submuestra máxima (n)", min_value=1_000, value=200_000, step=10_000, key='fit_max_sample')
+
+        if not families:
+            st.warning("Selecciona al menos una familia.")
+        else:
+            try:
+                ranking, failed, n_used = cached_fit_all(data, tuple(families), float(timeout), int(max_sample))
+                if n_used < len(data):
+                    st.caption(f"Ajuste sobre una submuestra aleatoria de {n_used} de {len(data)} datos.")
+
+                st.subheader("Ranking (menor AIC es mejor):")
+                st.dataframe([
+                    {
+                        "Familia": FAMILIES[r['family']]['label'],
+                        "Parámetros": format_params(r['family'], r['params']),
+                        "AIC": round(r['aic'], 2),
+                        "BIC": round(r['bic'], 2),
+                        "KS": round(r['ks'], 4),
+                        "Valor-p KS": None if r['ks_pvalue'] is None else round(r['ks_pvalue'], 4),
+                    }
+                    for r in ranking
+                ])
+                if any(r.get('discretized') for r in ranking):
+                    st.caption("Con datos enteros, las familias continuas se evalúan redondeadas al entero más cercano, "
+                               "P(x - 0.5 < X ≤ x + 0.5): así su AIC y su BIC se comparan con los de las familias discretas.")
+                if any(r['ks_pvalue'] is None for r in ranking):
+                    st.caption("El valor-p de KS no se informa con datos enteros: la prueba no es válida (usa Chi-Cuadrado en 'Bondad de Ajuste').")
+
+                for r in failed:
+                    st.warning(f"{FAMILIES[r['family']]['label']}: no se pudo ajustar. {r['error']}")
+                st.session_state['fit_ranking'] = (data_digest(data), ranking)
+            except Exception as e:
+                st.error(f"Error en el ajuste: {e}")
+
+with tab3:
+    st.header("Mejores Ajustes sobre los Datos")
+    ranking = saved_ranking(data)
+
+    if data is None or not ranking:
+        st.info("Ejecuta el ajuste en la pestaña 'Ajuste y Ranking'.")
+    else:
+        n_best = 1
+        if len(ranking) > 1:
+            n_best = st.slider("Número de ajustes a superponer", min_value=1, max_value=len(ranking), value=min(3, len(ranking)), key='fit_n_best')
+        best = ranking[0]
+        best_dist = fitted_distribution(best)
+        title = f"Mejor ajuste: {FAMILIES[best['family']]['label']} ({format_params(best['family'], best['params'])})"
+        colors = ['darkorange', 'green', 'purple', 'brown', 'gray']
+
+        try:
+            # Con datos enteros todas las familias dan probabilidades por
+            # entero (las continuas, discretizadas)
+            discrete = bool(np.all(data == np.round(data)))
+            if discrete:
+                k_values = np.arange(int(np.min(data)), int(np.max(data)) + 1)
+                fig = plot_discrete_distribution(best_dist, k_values, title)
+            else:
+                x_min, x_max = np.quantile(data, [0.005, 0.995])
+                fig = plot_continuous_distribution(best_dist, x_min, x_max, title)
+
+            # Si una superposición falla, la figura se cierra igual
+            with managed_figure(fig):
+                ax = fig.gca()
+                if discrete:
+                    freqs = np.bincount((data - k_values[0]).astype(int), minlength=len(k_values)) / len(data)
+                    ax.plot(k_values, freqs, 'ko', label='Frecuencia observada', zorder=4)
+                    for r, color in zip(ranking[1:n_best], colors):
+                        other = fitted_distribution(r)
+                        ax.plot(k_values, other.pmf(k_values), color=color, marker='.', linestyle='--', label=FAMILIES[r['family']]['label'], zorder=4)
+                else:
+                    ax.hist(data[(data >= x_min) & (data <= x_max)], bins=50, density=True, color='gray', alpha=0.3, label='Datos', zorder=1)
+                    x_values = np.linspace(x_min, x_max, 500)
+                    for r, color in zip(ranking[1:n_best], colors):
+                        other = fitted_distribution(r)
+                        ax.plot(x_values, other.pdf(x_values), color=color, linestyle='--', linewidth=2, label=FAMILIES[r['family']]['label'], zorder=2)
+                ax.legend()
+                show_figure(fig)
+        except Exception as e:
+            st.error(f"Error al generar el gráfico: {e}")
+
+with tab4:
+    st.header("Pruebas de Bondad de Ajuste")
+    st.write("""
+    Compara los datos con cualquier familia del explorador y una o varias combinaciones de parámetros.
+    Se calculan las pruebas de **Kolmogorov-Smirnov**, **Anderson-Darling** (solo continuas) y **Chi-Cuadrado**
+    para todas las combinaciones a la vez. Valores-p pequeños (ej. < 0.05) indican que el modelo no describe bien los datos.
+    """)
+
+    if data is None or len(data) < 2:
+        st.info("Carga al menos 2 datos en la pestaña 'Datos'.")
+    else:
+        fitted = {r['family']: r['params'] for r in saved_ranking(data)}
+        family = st.selectbox("Familia", options=list(FAMILIES), format_func=lambda f: FAMILIES[f]['label'], key='gof_family')
+        start = fitted.get(family, FAMILIES[family]['defaults'])
+
+        st.write("Valores de cada parámetro, separados por comas (se prueban todas las combinaciones):")
+        names = FAMILIES[family]['params']
+        cols = st.columns(len(names))
+        values = {}
+        for col, name in zip(cols, names):
+            with col:
+                values[name] = st.text_input(name, value=f"{start[name]:.4g}", key=f'gof_{family}_{name}')
+
+        n_bins = st.slider("Cubos para Chi-Cuadrado", min_value=3, max_value=50, value=10, step=1, key='gof_bins')
+
+        try:
+            grids = np.meshgrid(*(parse_values(values[name]) for name in names), indexing='ij')
+            params = {name: grid.ravel() for name, grid in zip(names, grids)}
+            results = gof_batch(data, family, params, n_bins=n_bins)
+
+            # En familias discretas gof_batch no da valor-p de KS ni Anderson-Darling
+            continuous = FAMILIES[family]['kind'] != 'discrete'
+            columns = ["Parámetros", "KS"] + (["Valor-p KS", "AD", "Valor-p AD"] if continuous else []) + ["χ²", "gl", "Valor-p χ²"]
+            st.subheader("Resultados:")
+            st.dataframe([
+                {
+                    "Parámetros": format_params(family, {name: params[name][j] for name in names}),
+                    "KS": round(float(results['ks'][j]), 4),
+                    "Valor-p KS": round(float(results['ks_pvalue'][j]), 4),
+                    "AD": round(float(results['ad'][j]), 4),
+                    "Valor-p AD": round(float(results['ad_pvalue'][j]), 4),
+                    "χ²": round(float(results['chi2'][j]), 4),
+                    "gl": int(results['chi2_df'][j]),
+                    "Valor-p χ²": round(float(results['chi2_pvalue'][j]), 4),
+                }
+                for j in range(len(results['ks']))
+            ], column_order=columns)
+            if not continuous:
+                st.caption("Familia discreta: el estadístico KS se muestra como referencia, pero su valor-p "
+                           "(pensado para CDF continuas) no es válido; usa Chi-Cuadrado.")
+            if np.any(results['min_expected'] < 5):
+                st.warning("Algunos cubos tienen una frecuencia esperada menor que 5: el valor-p de Chi-Cuadrado puede no ser fiable.")
+            st.caption("Los valores-p suponen parámetros conocidos; si provienen del ajuste a estos mismos datos, son optimistas.")
+        except ValueError as e:
+            st.error(f"Parámetros inválidos: {e}")
+        except Exception as e:
+            st.error(f"Error en el cálculo: {e}")
+
+debug_panel()
@@ -0,0 +1,126 @@
+import streamlit as st
+import numpy as np
+
+# Importamos las funciones de ayuda
+try:
+    from helpers import plot_discrete_distribution, plot_continuous_distribution, show_figure, debug_panel
+    from timing import start_rerun
+    from families import FAMILIES, format_params
+    from mixtures import Mixture
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
+    st.stop()
+
+
+@st.cache_resource
+def build_mixture(components, weights):
+    # La mezcla (y su tabla inversa para la ppf) se comparte entre
+    # ejecuciones mientras no cambien las componentes ni los pesos.
+    return Mixture([(family, dict(params)) for family, params in components], weights)
+
+
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('mezclas')
+
+# --- Contenido de la Página ---
+
+st.title("Distribuciones de Mezcla")
+
+tab1, tab2, tab3 = st.tabs(["Teoría y Fórmulas", "Constructor", "Calculadora y Muestreo"])
+
+with tab1:
+    st.header("Concepto Teórico")
+    st.write("""
+    Muchos fenómenos reales no siguen una única distribución sino una **mezcla** de varias. Por ejemplo, los tiempos de
+    respuesta de un servicio pueden ser en un 90% "normales" (Lognormal) y en un 10% lentos por reintentos (Exponencial).
+
+    Una mezcla elige primero una componente $i$ con probabilidad $w_i$ y luego genera el valor con esa componente.
+    """)
+
+    st.header("Fórmulas Matemáticas")
+    st.latex(r"f(x) = \sum_{i=1}^{m} w_i \, f_i(x), \qquad \sum_{i=1}^{m} w_i = 1")
+    st.latex(r"F(x) = \sum_{i=1}^{m} w_i \, F_i(x)")
+    st.subheader("Media y Varianza")
+    st.latex(r"\mu = \sum_i w_i \mu_i, \qquad \sigma^2 = \sum_i w_i (\sigma_i^2 + \mu_i^2) - \mu^2")
+    st.write("La función cuantil (ppf) de una mezcla no tiene fórmula cerrada; se obtiene invirtiendo numéricamente $F(x)$.")
+
+with tab2:
+    st.header("Constructor de Mezclas")
+
+    kind = st.radio("Tipo de componentes", ['continuous', 'discrete'],
+                    format_func={'continuous': "Continuas", 'discrete': "Discretas"}.get,
+                    horizontal=True, key='mix_kind')
+    options = [f for f, spec in FAMILIES.items() if spec['kind'] == kind]
+    n_components = st.number_input("Número de componentes", min_value=1, max_value=5, value=2, step=1, key='mix_n')
+
+    defaults = {'continuous': ['lognormal', 'exponencial'], 'discrete': ['poisson', 'poisson']}[kind]
+    components = []
+    weights = []
+    for i in range(n_components):
+        st.subheader(f"Componente {i + 1}")
+        cols = st.columns(4)
+        with cols[0]:
+            default_family = defaults[i] if i < len(defaults) else options[0]
+            family = st.selectbox("Familia", options, index=options.index(default_family),
+                                  format_func=lambda f: FAMILIES[f]['label'], key=f'mix_{kind}_family_{i}')
+        with cols[1]:
+            weight = st.number_input("Peso (w)", min_value=0.0, value=0.9 if i == 0 else 0.1, step=0.05, key=f'mix_{kind}_w_{i}')
+
+        params = {}
+        for j, name in enumerate(FAMILIES[family]['params']):
+            default = FAMILIES[family]['defaults'][name]
+            with cols[2 + j % 2]:
+                if isinstance(default, int):
+                    params[name] = st.number_input(name, value=default, step=1, key=f'mix_{kind}_{family}_{name}_{i}')
+                else:
+                    params[name] = st.number_input(name, value=float(default), step=0.1, key=f'mix_{kind}_{family}_{name}_{i}')
+        components.append((family, tuple(params.items())))
+        weights.append(weight)
+
+    mixture = None
+    try:
+        mixture = build_mixture(tuple(components), tuple(weights))
+        label = " + ".join(
+            f"{w:.2f}·{FAMILIES[f]['label']}({format_params(f, dict(p))})"
+            for (f, p), w in zip(components, mixture.weights)
+        )
+        lo, hi = mixture.support_range(0.001 if kind == 'continuous' else 1e-4)
+        if kind == 'discrete':
+            k_values = np.arange(int(np.floor(lo)), int(np.ceil(hi)) + 1)
+            fig = plot_discrete_distribution(mixture, k_values, f"PMF Mezcla: {label}")
+        else:
+            fig = plot_continuous_distribution(mixture, lo, hi, f"PDF Mezcla: {label}")
+        show_figure(fig, 'mezcla', components, weights)
+    except Exception as e:
+        st.error(f"Error al construir la mezcla: {e}")
+
+with tab3:
+    st.header("Calculadora de la Mezcla")
+
+    if mixture is None:
+        st.info("Configura una mezcla válida en la pestaña 'Constructor'.")
+    else:
+        try:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("**1. Probabilidad Acumulada $P(X \\le x)$**")
+                calc_x = st.number_input("Valor de x", value=round(float(mixture.ppf(0.5)), 2), step=0.1, key='mix_calc_x')
+                st.markdown(f"**$P(X \\le {calc_x:.2f})$:** `{float(mixture.cdf(calc_x)):.6f}`")
+                st.markdown(f"**$P(X > {calc_x:.2f})$:** `{float(mixture.sf(calc_x)):.6f}`")
+            with col2:
+                st.write("**2. Cuantil (ppf)**")
+                calc_q = st.number_input("Probabilidad (q)", min_value=0.0, max_value=1.0, value=0.95, step=0.01, format="%.4f", key='mix_calc_q')
+                st.markdown(f"**$x_{{{calc_q:.4f}}}$:** `{float(mixture.ppf(calc_q)):.6f}`")
+
+            st.subheader("Estadísticos:")
+            st.markdown(f"**Media (μ):** `{mixture.mean():.4f}`")
+            st.markdown(f"**Varianza (σ²):** `{mixture.var():.4f}`")
+
+            st.subheader("Muestreo")
+            n_samples = st.slider("Tamaño de la muestra", min_value=100, max_value=1_000_000, value=10_000, step=100, key='mix_n_samples')
+            samples = mixture.rvs(size=n_samples, random_state=0)
+            st.markdown(f"**Media muestral:** `{samples.mean():.4f}` · **Percentil 95 muestral:** `{np.quantile(samples, 0.95):.4f}`")
+        except Exception as e:
+            st.error(f"Error en el cálculo: {e}")
+
+debug_panel()
@@ -0,0 +1,120 @@
+import hmac
+import os
+
+import streamlit as st
+from datetime import datetime
+
+# Importamos las funciones de ayuda
+try:
+    from helpers import get_progress_store, get_disk_cache, debug_panel
+    from timing import start_rerun
+    from families import FAMILIES
+    from warmup import start_warmup
+except ImportError as e:
+    st.error(f"No se pudo importar '{e.name}.py' ({e}). Asegúrate de que esté en el directorio raíz.")
+    st.stop()
+
+
+# El panel muestra los resultados de todos los estudiantes: solo se abre
+# con la clave de DISTRIBUCIONES_PANEL_CLAVE (sin ella, está desactivado)
+PANEL_KEY = os.environ.get('DISTRIBUCIONES_PANEL_CLAVE', '')
+
+
+def page_label(page):
+    return FAMILIES[page]['label'] if page in FAMILIES else page
+
+
+# Tiempos de este rerun (panel de depuración con ?debug=1)
+start_rerun('panel_docente')
+
+# --- Contenido de la Página ---
+
+st.title("Panel Docente")
+
+if not PANEL_KEY:
+    st.info("El panel docente está desactivado. Para activarlo, define la variable de entorno "
+            "DISTRIBUCIONES_PANEL_CLAVE con la clave de acceso y reinicia la aplicación.")
+    debug_panel()
+    st.stop()
+if not st.session_state.get('panel_autorizado'):
+    key = st.text_input("Clave del panel docente", type='password', key='panel_clave')
+    if key and hmac.compare_digest(key.encode('utf-8'), PANEL_KEY.encode('utf-8')):
+        st.session_state['panel_autorizado'] = True
+        st.rerun()
+    if key:
+        st.error("Clave incorrecta.")
+    debug_panel()
+    st.stop()
+
+st.write("Resumen de los intentos registrados con los botones **Revisar** de todas las páginas (incluidos los ejercicios generados).")
+
+store = get_progress_store()
+# Los intentos recientes pueden seguir en la cola del hilo escritor
+store.flush()
+if store.dropped:
+    st.warning(f"{store.dropped} intentos no se pudieron guardar (último error: {store.last_error}).")
+
+tab1, tab2, tab3 = st.tabs(["Por Página", "Por Ejercicio", "Por Estudiante"])
+
+with tab1:
+    st.header("Resumen por Página")
+    summary = store.page_summary()
+    if not summary:
+        st.info("Todavía no hay intentos registrados.")
+    else:
+        st.dataframe([
+            {"Página": page_label(page), "Intentos": attempts, "Estudiantes": students, "Acierto (%)": round(100 * rate, 1)}
+            for page, attempts, students, rate in summary
+        ])
+
+with tab2:
+    st.header("Resumen por Ejercicio")
+    pages = [row[0] for row in store.page_summary()]
+    if pages:
+        page = st.selectbox("Página", pages, format_func=page_label, key='panel_page')
+        st.dataframe([
+            {"Ejercicio": exercise, "Intentos": attempts, "Estudiantes": students, "Acierto (%)": round(100 * rate, 1)}
+            for exercise, attempts, students, rate in store.exercise_summary(page)
+        ])
+        with st.expander("Estudiantes de esta página"):
+            st.dataframe([
+                {"Estudiante": student, "Intentos": attempts, "Acierto (%)": round(100 * rate, 1)}
+                for student, attempts, rate in store.students(page)
+            ])
+    else:
+        st.info("Todavía no hay intentos registrados.")
+
+with tab3:
+    st.header("Progreso de un Estudiante")
+    student = st.text_input("Identificador del estudiante", value=st.session_state.get('student_id', ''), key='panel_student').strip()
+    if student:
+        rows = store.student_summary(student)
+        if not rows:
+            st.warning("No hay intentos registrados para este estudiante.")
+        else:
+            st.dataframe([
+                {"Página": page_label(page), "Intentos": attempts, "Aciertos": correct,
+                 "Último intento": datetime.fromtimestamp(last).strftime('%Y-%m-%d %H:%M')}
+                for page, attempts, correct, last in rows
+            ])
+
+with st.expander("Caché en disco"):
+    cache = get_disk_cache()
+    metrics = cache.metrics()
+    st.markdown(f"**Directorio:** `{cache.path}` · **Tamaño:** `{metrics['bytes'] / 1024 ** 2:.1f}` / `{cache.max_bytes / 1024 ** 2:.0f}` MB")
+    st.markdown(f"**Aciertos:** `{metrics['hits']}` · **Fallos:** `{metrics['misses']}` · **Escrituras:** `{metrics['writes']}` · **Desalojadas:** `{metrics['evictions']}`")
+
+with st.expander("Precalentamiento de cachés"):
+    warmup = start_warmup()
+    if warmup is None:
+        st.info("Desactivado (DISTRIBUCIONES_WARMUP=0).")
+    else:
+        metrics = warmup.metrics()
+        state = "terminado" if warmup.done() else "en curso"
+        st.markdown(f"**Estado:** `{state}` · **Trabajos:** `{metrics['ok']}` / `{metrics['jobs']}` · **Errores:** `{metrics['errors']}` · **Duración:** `{metrics['wall_seconds']:.1f}` s")
+        st.dataframe([
+            {"Trabajo": name, "Estado": status, "Segundos": None if elapsed is None else round(elapsed, 3), "Error": error or ""}
+            for name, (status, elapsed, error) in warmup.status.items()
+        ])
+
+debug_panel()
@@ -0,0 +1,191 @@
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+# --- Progreso de los Estudiantes en SQLite ---
+# Cada pulsación de "Revisar" se guarda como un intento (estudiante,
+# página, ejercicio, respuesta, acierto). Las escrituras no bloquean la
+# página: se encolan y un hilo escritor las inserta por lotes, en una
+# transacción por lote. La base usa WAL, de modo que las lecturas del
+# panel docente no esperan a las escrituras. Cada hilo lector tiene su
+# propia conexión reutilizable, y el índice (student, page) sirve tanto
+# las consultas de un estudiante como las agregaciones por página.
+#
+# Si un lote no se puede escribir (ej. "database is locked" tras el
+# tiempo de espera), se reintenta WRITE_RETRIES veces y después se
+# descarta con un aviso en el log: el hilo escritor nunca muere, así que
+# flush() siempre vuelve.
+
+DEFAULT_DB_PATH = os.environ.get(
+    'DISTRIBUCIONES_DB',
+    os.path.join(os.path.expanduser('~'), '.distribuciones', 'progreso.sqlite3'),
+)
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.2   # segundos máximos que un intento espera en la cola
+WRITE_RETRIES = 3
+RETRY_DELAY = 0.5      # segundos antes del primer reintento (se duplica)
+
+_log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id       INTEGER PRIMARY KEY,
+    student  TEXT    NOT NULL,
+    page     TEXT    NOT NULL,
+    exercise TEXT    NOT NULL,
+    answer   TEXT,
+    correct  INTEGER NOT NULL,
+    created  REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_student_page ON attempts (student, page);
+CREATE INDEX IF NOT EXISTS idx_attempts_page_exercise ON attempts (page, exercise);
+"""
+
+_STOP = object()
+
+
+class ProgressStore:
+    """
+    Almacén de intentos. 'record' encola y vuelve enseguida; 'flush'
+    espera a que todo lo encolado esté escrito.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self.dropped = 0        # intentos descartados tras agotar los reintentos
+        self.last_error = None
+        self._writer = threading.Thread(target=self._write_loop, name='progress-writer', daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def connection(self):
+        """Conexión del hilo actual (se crea una vez y se reutiliza)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # --- Escritura ---
+
+    def record(self, student, page, exercise, answer, correct):
+        """Encola un intento; no toca la base de datos en el hilo que llama."""
+        self._queue.put((str(student), str(page), str(exercise), None if answer is None else str(answer),
+                         int(bool(correct)), time.time()))
+
+    def record_many(self, rows):
+        """Encola varios intentos (student, page, exercise, answer, correct)."""
+        now = time.time()
+        for student, page, exercise, answer, correct in rows:
+            self._queue.put((str(student), str(page), str(exercise), None if answer is None else str(answer),
+                             int(bool(correct)), now))
+
+    def _write_loop(self):
+        conn = self._connect()
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            # Se junta un lote hasta llenarlo o hasta que pase el intervalo
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            rows = [item for item in batch if item is not _STOP]
+            stop = len(rows) < len(batch)
+            try:
+                if rows:
+                    self._write_batch(conn, rows)
+            except Exception:
+                # Filas que SQLite rechaza: no tiene sentido reintentarlas
+                self.dropped += len(rows)
+                _log.exception("Intentos descartados al guardarlos en %s", self.path)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    def _write_batch(self, conn, rows):
+        delay = RETRY_DELAY
+        for attempt in range(WRITE_RETRIES + 1):
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO attempts (student, page, exercise, answer, correct, created) VALUES (?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                return
+            except sqlite3.Error as e:
+                self.last_error = str(e)
+                if attempt == WRITE_RETRIES:
+                    self.dropped += len(rows)
+                    _log.error("No se pudieron guardar %d intentos en %s: %s", len(rows), self.path, e)
+                    return
+                _log.warning("Error al guardar intentos (reintento %d de %d): %s", attempt + 1, WRITE_RETRIES, e)
+                time.sleep(delay)
+                delay *= 2
+
+    def flush(self):
+        """Bloquea hasta que todos los intentos encolados estén escritos."""
+        self._queue.join()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    # --- Consultas (panel docente) ---
+
+    def page_summary(self):
+        """Por página: intentos, estudiantes distintos y tasa de acierto."""
+        return self.connection().execute(
+            "SELECT page, COUNT(*), COUNT(DISTINCT student), AVG(correct) "
+            "FROM attempts GROUP BY page ORDER BY page"
+        ).fetchall()
+
+    def student_summary(self, student):
+        """Por página para un estudiante: intentos, aciertos y último intento."""
+        return self.connection().execute(
+            "SELECT page, COUNT(*), SUM(correct), MAX(created) "
+            "FROM attempts WHERE student = ? GROUP BY page ORDER BY page",
+            (student,),
+        ).fetchall()
+
+    def exercise_summary(self, page):
+        """Por ejercicio de una página: intentos, estudiantes y tasa de acierto."""
+        return self.connection().execute(
+            "SELECT exercise, COUNT(*), COUNT(DISTINCT student), AVG(correct) "
+            "FROM attempts WHERE page = ? GROUP BY exercise ORDER BY exercise",
+            (page,),
+        ).fetchall()
+
+    def students(self, page=None, limit=1000):
+        """Estudiantes (opcionalmente de una página) con su tasa de acierto."""
+        if page is None:
+            sql, args = "SELECT student, COUNT(*), AVG(correct) FROM attempts GROUP BY student ORDER BY student LIMIT ?", (limit,)
+        else:
+            sql, args = ("SELECT student, COUNT(*), AVG(correct) FROM attempts WHERE page = ? "
+                         "GROUP BY student ORDER BY student LIMIT ?", (page, limit))
+        return self.connection().execute(sql, args).fetchall()
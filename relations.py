@@ -0,0 +1,281 @@
+import collections
+
+import numpy as np
+
+from compute import view_data
+from ecdf import ks_distance
+from families import FAMILIES, make_distribution, format_params
+
+# --- Relaciones entre Distribuciones (sin Streamlit) ---
+# El mapa de la página Resumen: cada arista va de una familia a otra y
+# tiene una comparación que se calcula en vivo con los parámetros de sus
+# sliders:
+#
+#   - límites y casos particulares ('approx'): la distribución de origen
+#     (ej. Binomial(n, λ/n)) frente a la de destino (Poisson(λ));
+#   - construcciones ('sample'): la de destino frente a una muestra
+#     simulada de la construcción (ej. suma de k Exponenciales frente a
+#     la Gamma).
+#
+# En ambos casos 'base' es la familia que se grafica con los helpers de
+# siempre (compute.view_data) y lo otro se superpone. La distancia es el
+# máximo de |F_base - F_otra| (tipo Kolmogorov): baja a 0 a medida que la
+# aproximación mejora.
+#
+#   graph_data()                       nodos y aristas del mapa
+#   relation_data(relación, **valores) gráfico base, superposición y distancia
+
+N_SAMPLES = 20000
+SEED = 0
+
+# (columna, fila) de cada familia en el mapa: discretas a la izquierda
+MAP_POSITIONS = {
+    'bernoulli': (0.0, 3.0),
+    'uniforme_discreta': (0.5, -0.2),
+    'geometrica': (1.5, 4.6),
+    'binomial': (2.4, 3.0),
+    'hipergeometrica': (0.8, 1.2),
+    'poisson': (4.0, 4.2),
+    'normal': (4.0, 1.6),
+    'lognormal': (2.6, 0.0),
+    'exponencial': (6.3, 4.8),
+    'weibull': (8.5, 5.4),
+    'gamma': (7.8, 3.6),
+    'chi2': (6.3, 1.6),
+    't': (8.3, 0.4),
+    'f': (9.0, 2.5),
+    'beta': (10.4, 5.0),
+    'uniforme_continua': (10.4, 3.0),
+    'triangular': (10.6, 1.0),
+}
+# Separación de las aristas que unen el mismo par en sentidos opuestos
+REVERSE_OFFSET = 0.15
+
+# Sliders: (parámetro, etiqueta, mínimo, máximo, paso, valor inicial).
+# 'base' y 'approx' devuelven (familia, parámetros); 'sample' recibe un
+# generador, el tamaño y los valores y devuelve la muestra simulada.
+RELATIONS = {
+    'bernoulli_binomial': {
+        'source': 'bernoulli', 'target': 'binomial', 'edge': "suma de n",
+        'text': "La suma de n ensayos de Bernoulli(p) independientes es una Binomial(n, p).",
+        'sliders': (('n', "Ensayos (n)", 1, 50, 1, 10), ('p', "Probabilidad (p)", 0.01, 0.99, 0.01, 0.3)),
+        'base': lambda n, p: ('binomial', {'n': n, 'p': p}),
+        'sample': lambda rng, size, n, p: rng.binomial(1, p, size=(size, n)).sum(axis=1),
+        'sample_label': lambda n, p: f"Suma de {n} Bernoulli({p:.2f})",
+    },
+    'bernoulli_geometrica': {
+        'source': 'bernoulli', 'target': 'geometrica', 'edge': "hasta el 1.er éxito",
+        'text': "El número de ensayos de Bernoulli(p) hasta el primer éxito es una Geométrica(p).",
+        'sliders': (('p', "Probabilidad (p)", 0.05, 0.95, 0.01, 0.25),),
+        'base': lambda p: ('geometrica', {'p': p}),
+        # Primer índice con éxito en filas de ensayos (casi nunca hacen falta más de 200)
+        'sample': lambda rng, size, p: np.argmax(rng.random((size, 200)) < p, axis=1) + 1,
+        'sample_label': lambda p: f"Ensayos hasta el 1.er éxito (p={p:.2f})",
+    },
+    'hipergeometrica_binomial': {
+        'source': 'hipergeometrica', 'target': 'binomial', 'edge': "N → ∞",
+        'text': "Si la población N es mucho mayor que la muestra n, sacar sin reemplazo es casi como sacar con "
+                "reemplazo: la Hipergeométrica(N, K = pN, n) se acerca a la Binomial(n, p).",
+        'sliders': (('N', "Población (N)", 20, 2000, 10, 40), ('n', "Muestra (n)", 1, 20, 1, 10),
+                    ('p', "Proporción de éxitos (K/N)", 0.05, 0.95, 0.05, 0.3)),
+        'base': lambda N, n, p: ('hipergeometrica', {'N': N, 'K': max(1, round(p * N)), 'n': min(n, N)}),
+        'approx': lambda N, n, p: ('binomial', {'n': n, 'p': p}),
+    },
+    'binomial_poisson': {
+        'source': 'binomial', 'target': 'poisson', 'edge': "n → ∞, np = λ",
+        'text': "Con muchos ensayos y éxitos raros (p = λ/n), la Binomial(n, p) se acerca a la Poisson(λ).",
+        'sliders': (('n', "Ensayos (n)", 5, 500, 5, 20), ('lam', "λ = n·p", 0.5, 5.0, 0.5, 3.0)),
+        'base': lambda n, lam: ('binomial', {'n': n, 'p': lam / n}),
+        'approx': lambda n, lam: ('poisson', {'lam': lam}),
+    },
+    'binomial_normal': {
+        'source': 'binomial', 'target': 'normal', 'edge': "TLC",
+        'text': "Por el Teorema del Límite Central, la Binomial(n, p) se acerca a la Normal(np, √(np(1-p))) "
+                "(la distancia usa la corrección por continuidad).",
+        'sliders': (('n', "Ensayos (n)", 1, 100, 1, 10), ('p', "Probabilidad (p)", 0.05, 0.95, 0.05, 0.3)),
+        'base': lambda n, p: ('binomial', {'n': n, 'p': p}),
+        'approx': lambda n, p: ('normal', {'mu': n * p, 'sigma': float(np.sqrt(n * p * (1 - p)))}),
+    },
+    'poisson_normal': {
+        'source': 'poisson', 'target': 'normal', 'edge': "λ → ∞",
+        'text': "Con λ grande, la Poisson(λ) se acerca a la Normal(λ, √λ).",
+        'sliders': (('lam', "Tasa (λ)", 0.5, 50.0, 0.5, 3.0),),
+        'base': lambda lam: ('poisson', {'lam': lam}),
+        'approx': lambda lam: ('normal', {'mu': lam, 'sigma': float(np.sqrt(lam))}),
+    },
+    'poisson_exponencial': {
+        'source': 'poisson', 'target': 'exponencial', 'edge': "tiempo entre eventos",
+        'text': "En un proceso de Poisson con tasa λ, el tiempo entre eventos consecutivos es Exponencial(λ). "
+                "Se simulan los eventos en un intervalo largo y se miden los huecos.",
+        'sliders': (('lam', "Tasa (λ)", 0.2, 5.0, 0.1, 1.0),),
+        'base': lambda lam: ('exponencial', {'lam': lam}),
+        # Los eventos del proceso son uniformes en [0, T] dado su número
+        'sample': lambda rng, size, lam: np.diff(np.sort(rng.uniform(0, size / lam, rng.poisson(size)))),
+        'sample_label': lambda lam: f"Huecos de un proceso de Poisson (λ={lam:.1f})",
+    },
+    'exponencial_gamma': {
+        'source': 'exponencial', 'target': 'gamma', 'edge': "suma de k",
+        'text': "La suma de k Exponenciales(λ) independientes (el tiempo hasta el k-ésimo evento) es una "
+                "Gamma(α = k, β = 1/λ).",
+        'sliders': (('k', "Eventos (k)", 1, 20, 1, 3), ('lam', "Tasa (λ)", 0.2, 5.0, 0.1, 1.0)),
+        'base': lambda k, lam: ('gamma', {'alpha': float(k), 'beta': 1.0 / lam}),
+        'sample': lambda rng, size, k, lam: rng.exponential(1.0 / lam, size=(size, k)).sum(axis=1),
+        'sample_label': lambda k, lam: f"Suma de {k} Exponenciales(λ={lam:.1f})",
+    },
+    'exponencial_weibull': {
+        'source': 'exponencial', 'target': 'weibull', 'edge': "k = 1",
+        'text': "La Weibull(k, λ) con k = 1 es la Exponencial de tasa 1/λ; con k ≠ 1 la tasa de fallo "
+                "deja de ser constante.",
+        'sliders': (('k', "Forma (k)", 0.5, 3.0, 0.1, 1.5), ('lam', "Escala (λ)", 1.0, 20.0, 1.0, 10.0)),
+        'base': lambda k, lam: ('weibull', {'k': k, 'lam': lam}),
+        'approx': lambda k, lam: ('exponencial', {'lam': 1.0 / lam}),
+    },
+    'gamma_normal': {
+        'source': 'gamma', 'target': 'normal', 'edge': "α → ∞",
+        'text': "La Gamma(α, β) es una suma de α Exponenciales: con α grande se acerca a la Normal(αβ, √α·β).",
+        'sliders': (('alpha', "Forma (α)", 0.5, 50.0, 0.5, 2.0), ('beta', "Escala (β)", 0.5, 5.0, 0.5, 1.0)),
+        'base': lambda alpha, beta: ('gamma', {'alpha': alpha, 'beta': beta}),
+        'approx': lambda alpha, beta: ('normal', {'mu': alpha * beta, 'sigma': float(np.sqrt(alpha)) * beta}),
+    },
+    'normal_lognormal': {
+        'source': 'normal', 'target': 'lognormal', 'edge': "exp(X)",
+        'text': "Si X es Normal(μ, σ), entonces exp(X) es Lognormal(μ_log = μ, σ_log = σ).",
+        'sliders': (('mu', "Media de X (μ)", -1.0, 2.0, 0.1, 0.0), ('sigma', "Desv. de X (σ)", 0.1, 1.5, 0.1, 0.5)),
+        'base': lambda mu, sigma: ('lognormal', {'mu_log': mu, 'sigma_log': sigma}),
+        'sample': lambda rng, size, mu, sigma: np.exp(rng.normal(mu, sigma, size)),
+        'sample_label': lambda mu, sigma: f"exp(Normal({mu:.1f}, {sigma:.1f}))",
+    },
+    'normal_chi2': {
+        'source': 'normal', 'target': 'chi2', 'edge': "suma de Z²",
+        'text': "La suma de los cuadrados de k Normales estándar independientes es una Chi-Cuadrado(k).",
+        'sliders': (('k', "Grados de libertad (k)", 1, 30, 1, 3),),
+        'base': lambda k: ('chi2', {'k': k}),
+        'sample': lambda rng, size, k: (rng.standard_normal((size, k)) ** 2).sum(axis=1),
+        'sample_label': lambda k: f"Suma de {k} Z²",
+    },
+    'chi2_normal': {
+        'source': 'chi2', 'target': 'normal', 'edge': "k → ∞",
+        'text': "Con k grande, la Chi-Cuadrado(k) se acerca a la Normal(k, √(2k)).",
+        'sliders': (('k', "Grados de libertad (k)", 1, 100, 1, 5),),
+        'base': lambda k: ('chi2', {'k': k}),
+        'approx': lambda k: ('normal', {'mu': float(k), 'sigma': float(np.sqrt(2 * k))}),
+    },
+    'chi2_t': {
+        'source': 'chi2', 'target': 't', 'edge': "Z / √(V/k)",
+        'text': "Si Z es Normal(0, 1) y V es Chi-Cuadrado(k) independientes, Z / √(V/k) es una t de Student con "
+                "k grados de libertad.",
+        'sliders': (('k', "Grados de libertad (k)", 1, 30, 1, 3),),
+        'base': lambda k: ('t', {'df': k}),
+        'sample': lambda rng, size, k: rng.standard_normal(size) / np.sqrt(rng.chisquare(k, size) / k),
+        'sample_label': lambda k: f"Z / √(V/{k}) simulada",
+    },
+    'chi2_f': {
+        'source': 'chi2', 'target': 'f', 'edge': "(V₁/k₁) / (V₂/k₂)",
+        'text': "El cociente de dos Chi-Cuadrado independientes, cada una dividida por sus grados de libertad, "
+                "es una F(k₁, k₂).",
+        'sliders': (('df1', "k₁", 1, 30, 1, 5), ('df2', "k₂", 1, 50, 1, 20)),
+        'base': lambda df1, df2: ('f', {'df1': df1, 'df2': df2}),
+        'sample': lambda rng, size, df1, df2: (rng.chisquare(df1, size) / df1) / (rng.chisquare(df2, size) / df2),
+        'sample_label': lambda df1, df2: f"(V₁/{df1}) / (V₂/{df2}) simulada",
+    },
+    't_normal': {
+        'source': 't', 'target': 'normal', 'edge': "df → ∞",
+        'text': "Con muchos grados de libertad, la t de Student se acerca a la Normal(0, 1).",
+        'sliders': (('df', "Grados de libertad (df)", 1, 60, 1, 2),),
+        'base': lambda df: ('t', {'df': df}),
+        'approx': lambda df: ('normal', {'mu': 0.0, 'sigma': 1.0}),
+    },
+    'beta_uniforme': {
+        'source': 'beta', 'target': 'uniforme_continua', 'edge': "α = β = 1",
+        'text': "La Beta(1, 1) es la Uniforme en [0, 1].",
+        'sliders': (('alpha', "α", 0.2, 5.0, 0.1, 2.0), ('beta', "β", 0.2, 5.0, 0.1, 2.0)),
+        'base': lambda alpha, beta: ('beta', {'alpha': alpha, 'beta': beta}),
+        'approx': lambda alpha, beta: ('uniforme_continua', {'a': 0.0, 'b': 1.0}),
+    },
+    'uniforme_triangular': {
+        'source': 'uniforme_continua', 'target': 'triangular', 'edge': "U₁ + U₂",
+        'text': "La suma de dos Uniformes(0, b) independientes es una Triangular(0, b, 2b).",
+        'sliders': (('b', "Extremo de cada Uniforme (b)", 1.0, 10.0, 0.5, 5.0),),
+        'base': lambda b: ('triangular', {'a': 0.0, 'c': b, 'b': 2 * b}),
+        'sample': lambda rng, size, b: rng.uniform(0, b, size) + rng.uniform(0, b, size),
+        'sample_label': lambda b: f"U(0, {b:.1f}) + U(0, {b:.1f})",
+    },
+}
+
+RelationData = collections.namedtuple('RelationData', 'base overlay overlay_label sample distance')
+
+
+def relation_title(relation):
+    spec = RELATIONS[relation]
+    return f"{FAMILIES[spec['source']]['label']} → {FAMILIES[spec['target']]['label']} ({spec['edge']})"
+
+
+def graph_data():
+    """
+    (nodos, aristas) del mapa como listas de diccionarios: posición y
+    nombre de cada familia; extremos, punto medio, punta de la flecha y
+    etiqueta de cada relación.
+    """
+    nodes = [
+        {'familia': family, 'nombre': FAMILIES[family]['label'], 'x': x, 'y': y,
+         'tipo': "Discreta" if FAMILIES[family]['kind'] == 'discrete' else "Continua"}
+        for family, (x, y) in MAP_POSITIONS.items()
+    ]
+    pairs = {(spec['source'], spec['target']) for spec in RELATIONS.values()}
+    edges = []
+    for relation, spec in RELATIONS.items():
+        (x, y), (x2, y2) = MAP_POSITIONS[spec['source']], MAP_POSITIONS[spec['target']]
+        if (spec['target'], spec['source']) in pairs:
+            # Cada sentido se corre hacia su izquierda: quedan en lados opuestos
+            dx, dy = x2 - x, y2 - y
+            shift = REVERSE_OFFSET / np.hypot(dx, dy)
+            x, x2 = x - dy * shift, x2 - dy * shift
+            y, y2 = y + dx * shift, y2 + dx * shift
+        edges.append({
+            'relacion': relation, 'titulo': relation_title(relation), 'etiqueta': spec['edge'],
+            'x': x, 'y': y, 'x2': x2, 'y2': y2,
+            'xm': (x + x2) / 2, 'ym': (y + y2) / 2,
+            # Punta de la flecha, antes de tapar el nodo de destino
+            'xf': x + 0.8 * (x2 - x), 'yf': y + 0.8 * (y2 - y),
+        })
+    return nodes, edges
+
+
+def _sample_cdf(sample):
+    values, counts = np.unique(sample, return_counts=True)
+    return values, np.cumsum(counts) / len(sample)
+
+
+def relation_data(relation, **values):
+    """
+    RelationData(base, overlay, overlay_label, sample, distance): 'base'
+    es el compute.ViewData de la familia graficada; 'overlay' la
+    distribución superpuesta (límites) o 'sample' la muestra simulada
+    (construcciones); 'distance' el máximo de |F_base - F_otra|.
+    """
+    spec = RELATIONS[relation]
+    values = {name: values.get(name, initial) for name, _, _, _, _, initial in spec['sliders']}
+    args = tuple(values.values())
+    family, params = spec['base'](*args)
+    base = view_data(family, **params)
+
+    if 'sample' in spec:
+        # Semilla fija: los mismos valores dan el mismo gráfico (y la misma clave de caché)
+        rng = np.random.default_rng(SEED)
+        sample = np.asarray(spec['sample'](rng, N_SAMPLES, *args), dtype=float)
+        x, y = _sample_cdf(sample)
+        distance = ks_distance(base.frozen, x, y, discrete=base.discrete)
+        return RelationData(base, None, spec['sample_label'](*args), sample, distance)
+
+    approx_family, approx_params = spec['approx'](*args)
+    overlay = make_distribution(approx_family, **approx_params)
+    label = f"{FAMILIES[approx_family]['label']} ({format_params(approx_family, approx_params)})"
+    if base.discrete:
+        k = np.asarray(base.points, dtype=float)
+        # Una aproximación continua se compara con la corrección por continuidad
+        shift = 0.5 if FAMILIES[approx_family]['kind'] == 'continuous' else 0.0
+        distance = float(np.max(np.abs(base.frozen.cdf(k) - overlay.cdf(k + shift))))
+    else:
+        x = np.linspace(base.points[0], base.points[1], 1001)
+        distance = float(np.max(np.abs(base.frozen.cdf(x) - overlay.cdf(x))))
+    return RelationData(base, overlay, label, None, distance)
@@ -0,0 +1,112 @@
+import collections
+import io
+import os
+import re
+import threading
+
+from PIL import Image
+
+from timing import REGISTRY
+
+# --- Resolución y Codificación de las Imágenes de los Gráficos ---
+# Los gráficos miden 10 pulgadas de ancho (figsize=(10, 6)) y antes se
+# rasterizaban siempre a 200 dpi: unos 1700 px de ancho y más de 100 KB
+# por PNG, aunque el navegador fuera un móvil de 400 px.
+#
+# Ahora cada imagen se rasteriza con RenderOptions(dpi, format, colors):
+#
+#   dpi     a partir del ancho (px CSS) en que se mostrará la imagen y la
+#           densidad de píxeles de la pantalla, redondeando el ancho al
+#           siguiente de WIDTHS (pocas variantes en la caché en disco) y
+#           limitado a [MIN_DPI, MAX_DPI];
+#   format  'png' o 'webp' (sin pérdida: el texto de los ejes queda nítido);
+#   colors  si no es 0, la imagen se reduce a una paleta de ese número de
+#           colores antes de codificarla (los gráficos tienen pocos
+#           colores planos: el PNG con paleta ocupa ~4 veces menos).
+#
+# El servidor no conoce el ancho del contenedor en el navegador: la
+# página lo toma de ?ancho=<px> en la URL o, si no está, del User-Agent
+# (MOBILE_WIDTH para móviles, DEFAULT_WIDTH para el resto); ver
+# helpers.render_options.
+#
+# Configuración (variables de entorno):
+#   DISTRIBUCIONES_IMAGE_FORMAT        png (por defecto) o webp
+#   DISTRIBUCIONES_IMAGE_COLORS        colores de la paleta (por defecto 64; 0 la desactiva)
+#   DISTRIBUCIONES_IMAGE_PIXEL_RATIO   densidad de píxeles supuesta (por defecto 1.5)
+
+RenderOptions = collections.namedtuple('RenderOptions', 'dpi format colors')
+
+FORMATS = {'png': '.png', 'webp': '.webp'}
+FIGURE_WIDTH = 10   # pulgadas, como figsize en helpers
+MIN_DPI, MAX_DPI = 48, 200
+# Anchos (px CSS) a los que se redondea el ancho pedido
+WIDTHS = (360, 480, 640, 800, 1000, 1280)
+DEFAULT_WIDTH = 1000    # contenedor principal con layout="wide"
+MOBILE_WIDTH = 420
+
+IMAGE_FORMAT = os.environ.get('DISTRIBUCIONES_IMAGE_FORMAT', 'png').lower()
+IMAGE_COLORS = int(os.environ.get('DISTRIBUCIONES_IMAGE_COLORS', 64))
+PIXEL_RATIO = float(os.environ.get('DISTRIBUCIONES_IMAGE_PIXEL_RATIO', 1.5))
+if IMAGE_FORMAT not in FORMATS:
+    raise ValueError(f"DISTRIBUCIONES_IMAGE_FORMAT debe ser uno de: {', '.join(FORMATS)}.")
+
+_MOBILE_AGENT = re.compile(r'Mobi|Android|iPhone|iPod|Opera Mini|IEMobile', re.IGNORECASE)
+
+
+def dpi_for_width(width, pixel_ratio=PIXEL_RATIO):
+    """DPI para mostrar la figura a 'width' px CSS (redondeado hacia arriba a WIDTHS)."""
+    width = next((w for w in WIDTHS if w >= width), WIDTHS[-1])
+    return int(min(MAX_DPI, max(MIN_DPI, round(width * pixel_ratio / FIGURE_WIDTH))))
+
+
+def options_for_width(width, image_format=IMAGE_FORMAT, colors=IMAGE_COLORS):
+    return RenderOptions(dpi_for_width(width), image_format, colors)
+
+
+def is_mobile(user_agent):
+    return bool(user_agent) and _MOBILE_AGENT.search(user_agent) is not None
+
+
+DEFAULT_OPTIONS = options_for_width(DEFAULT_WIDTH)
+MOBILE_OPTIONS = options_for_width(MOBILE_WIDTH)
+
+
+def render_image(fig, options=DEFAULT_OPTIONS):
+    """Bytes de 'fig' rasterizada y codificada con 'options'."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight', dpi=options.dpi)
+    if options.format == 'png' and not options.colors:
+        return buffer.getvalue()
+
+    image = Image.open(buffer)
+    if options.colors:
+        # FASTOCTREE es el único método de Pillow que admite RGBA
+        image = image.quantize(colors=options.colors, method=Image.Quantize.FASTOCTREE)
+    out = io.BytesIO()
+    if options.format == 'webp':
+        image.convert('RGBA').save(out, format='WEBP', lossless=True, method=4)
+    else:
+        image.save(out, format='PNG', optimize=True)
+    return out.getvalue()
+
+
+class SentTracker:
+    """Imágenes de gráficos enviadas a los navegadores y sus bytes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.images = 0
+        self.bytes = 0
+
+    def record(self, data):
+        with self._lock:
+            self.images += 1
+            self.bytes += len(data)
+
+
+SENT = SentTracker()
+
+REGISTRY.register('distribuciones_images_sent_total', 'counter',
+                  "Imágenes de gráficos enviadas a los navegadores.", lambda: SENT.images)
+REGISTRY.register('distribuciones_image_bytes_sent_total', 'counter',
+                  "Bytes de las imágenes de gráficos enviadas.", lambda: SENT.bytes)
@@ -0,0 +1,365 @@
+import argparse
+import contextlib
+import json
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:   # Windows: sin bloqueo entre procesos, el almacén se desactiva
+    fcntl = None
+
+# --- Almacén de Resultados en Memoria Compartida ---
+# Con varios procesos de Streamlit detrás de un balanceador, cada uno
+# tiene su propia st.cache_data: la PMF que un proceso ya evaluó se vuelve
+# a evaluar en los demás. La caché en disco (disk_cache.py) comparte las
+# imágenes, pero cada lectura copia el archivo y los arreglos pasan por
+# np.load.
+#
+# Este almacén guarda arreglos de NumPy y bytes (imágenes rasterizadas)
+# en segmentos de multiprocessing.shared_memory con un nombre derivado
+# de la clave (make_key). Cualquier proceso de la misma máquina los abre
+# por nombre y get_array devuelve un arreglo de solo lectura sobre la
+# misma memoria, sin copias ni pickle.
+#
+# Un segmento índice (SLOTS entradas: clave, bytes, último uso) lleva la
+# cuenta de lo guardado para no pasar de 'max_bytes': al llenarse se
+# borran los segmentos usados hace más tiempo. Las reservas y desalojos
+# del índice se hacen con un flock sobre un archivo de bloqueo. Un
+# segmento se publica marcando su cabecera como lista después de
+# escribir los datos: un lector nunca ve uno a medias (lo trata como
+# ausente). Las reservas que no llegan a publicarse (un proceso que se
+# cae) se reclaman pasados STALE_SECONDS.
+#
+# Los segmentos no pertenecen a ningún proceso: sobreviven a los
+# reinicios de Streamlit hasta desalojarse o hasta  python shm_store.py --clear.
+# Antes de crear uno se comprueba el espacio libre de /dev/shm (escribir
+# en un tmpfs lleno termina el proceso con SIGBUS).
+#
+# Configuración (variables de entorno):
+#   DISTRIBUCIONES_SHM=0        desactiva el almacén
+#   DISTRIBUCIONES_SHM_MB       tamaño máximo de lo guardado (por defecto 64)
+#   DISTRIBUCIONES_SHM_PREFIX   prefijo de los segmentos (por defecto 'distrib_';
+#                               distinto por despliegue si comparten máquina)
+#
+# Uso:  python shm_store.py [--stats] [--clear]
+
+SHM_ENABLED = os.environ.get('DISTRIBUCIONES_SHM', '1') not in ('0', 'false', 'no') and fcntl is not None
+DEFAULT_MAX_BYTES = int(float(os.environ.get('DISTRIBUCIONES_SHM_MB', 64)) * 1024 * 1024)
+DEFAULT_PREFIX = os.environ.get('DISTRIBUCIONES_SHM_PREFIX', 'distrib_')
+SLOTS = 4096
+KEY_CHARS = 24         # caracteres de la clave en los nombres (96 bits)
+STALE_SECONDS = 30.0
+SHM_DIR = '/dev/shm'
+
+INDEX_DTYPE = np.dtype([('key', f'S{KEY_CHARS}'), ('size', '<i8'), ('used', '<f8')])
+# Cabecera de cada segmento: marca, lista (0/1), largo de los metadatos (JSON)
+HEADER = struct.Struct('<4sB3xI')
+MAGIC = b'DSM1'
+ALIGN = 64
+
+
+# Python 3.13 añade track=False; antes hay que dar de baja cada segmento a mano
+_HAS_TRACK = sys.version_info >= (3, 13)
+
+
+class _Segment(shared_memory.SharedMemory):
+    """
+    SharedMemory sin el resource_tracker (por defecto, cada proceso que
+    abre un segmento lo borra al salir, y aquí deben sobrevivir a quien
+    los creó) y que se puede cerrar con arreglos todavía vivos.
+    """
+
+    def __init__(self, name, create=False, size=0):
+        if _HAS_TRACK:
+            super().__init__(name, create, size, track=False)
+        else:
+            super().__init__(name, create, size)
+            resource_tracker.unregister(self._name, 'shared_memory')
+
+    def close(self):
+        try:
+            super().close()
+        except BufferError:
+            # Aún hay arreglos sobre el segmento: el mapeo se libera con ellos
+            pass
+
+    def unlink(self):
+        if not _HAS_TRACK:
+            # unlink() lo da de baja del resource_tracker
+            resource_tracker.register(self._name, 'shared_memory')
+        super().unlink()
+
+
+def _unlink(name):
+    try:
+        shm = _Segment(name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class SharedStore:
+    """
+    Arreglos y bytes compartidos entre procesos de la misma máquina,
+    acotados a 'max_bytes'. Seguro para varios hilos y procesos.
+    """
+
+    def __init__(self, prefix=DEFAULT_PREFIX, max_bytes=DEFAULT_MAX_BYTES, slots=SLOTS):
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        # Reentrante: los desalojos cuentan con el lock ya tomado
+        self._lock = threading.RLock()
+        self._lock_path = os.path.join(tempfile.gettempdir(), f'{prefix}index.lock')
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        with self._locked():
+            try:
+                self._index_shm = _Segment(f'{prefix}index')
+            except FileNotFoundError:
+                self._index_shm = _Segment(f'{prefix}index', create=True, size=slots * INDEX_DTYPE.itemsize)
+        # El tamaño del índice lo fija el primer proceso que lo crea
+        n_slots = self._index_shm.size // INDEX_DTYPE.itemsize
+        self._index = np.ndarray(n_slots, dtype=INDEX_DTYPE, buffer=self._index_shm.buf)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        # El lock del hilo primero: flock no excluye a otros hilos del mismo proceso
+        with self._lock:
+            with open(self._lock_path, 'a+b') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _name(self, key):
+        return self.prefix + key[:KEY_CHARS]
+
+    # --- Lectura ---
+
+    def _open(self, key):
+        """(segmento, metadatos, desplazamiento de los datos), o None si no está listo."""
+        try:
+            shm = _Segment(self._name(key))
+        except (FileNotFoundError, ValueError):
+            return None
+        if shm.size < HEADER.size:
+            shm.close()
+            return None
+        magic, ready, meta_len = HEADER.unpack_from(shm.buf)
+        if magic != MAGIC or not ready:
+            shm.close()
+            return None
+        meta = json.loads(bytes(shm.buf[HEADER.size:HEADER.size + meta_len]))
+        if meta['key'] != key:
+            shm.close()
+            return None
+        self._touch(key)
+        return shm, meta, _data_offset(meta_len)
+
+    def _touch(self, key):
+        # Sin el flock: una fecha de uso perdida solo adelanta un desalojo
+        slot = np.flatnonzero(self._index['key'] == key[:KEY_CHARS].encode('ascii'))
+        if slot.size:
+            self._index['used'][slot[0]] = time.time()
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get_array(self, key):
+        """Arreglo de solo lectura guardado con put_array (sin copiarlo), o None."""
+        opened = self._open(key)
+        if opened is None or opened[1]['kind'] != 'array':
+            if opened is not None:
+                opened[0].close()
+            self._count(False)
+            return None
+        shm, meta, offset = opened
+        dtype = np.dtype(meta['dtype'])
+        shape = tuple(meta['shape'])
+        flat = np.frombuffer(shm.buf, dtype=dtype, count=int(np.prod(shape)), offset=offset)
+        flat.flags.writeable = False
+        # El segmento queda abierto mientras viva el arreglo (o una vista suya)
+        weakref.finalize(flat, shm.close)
+        self._count(True)
+        return flat.reshape(shape)
+
+    def get_bytes(self, key):
+        """Bytes guardados con put_bytes, o None."""
+        opened = self._open(key)
+        if opened is None or opened[1]['kind'] != 'bytes':
+            if opened is not None:
+                opened[0].close()
+            self._count(False)
+            return None
+        shm, meta, offset = opened
+        data = bytes(shm.buf[offset:offset + meta['nbytes']])
+        shm.close()
+        self._count(True)
+        return data
+
+    # --- Escritura ---
+
+    def put_array(self, key, array):
+        array = np.ascontiguousarray(array)
+        if array.dtype.hasobject:
+            raise TypeError("Solo se pueden compartir arreglos numéricos.")
+        meta = {'key': key, 'kind': 'array', 'dtype': array.dtype.str, 'shape': list(array.shape), 'nbytes': array.nbytes}
+        return self._put(key, meta, memoryview(array).cast('B'))
+
+    def put_bytes(self, key, data):
+        meta = {'key': key, 'kind': 'bytes', 'nbytes': len(data)}
+        return self._put(key, meta, data)
+
+    def _put(self, key, meta, payload):
+        """Publica 'payload'; False si ya estaba, no cabe o lo está escribiendo otro proceso."""
+        meta_bytes = json.dumps(meta).encode('utf-8')
+        offset = _data_offset(len(meta_bytes))
+        size = offset + max(meta['nbytes'], 1)
+        if size > self.max_bytes or not self._reserve(key, size):
+            return False
+
+        name = self._name(key)
+        try:
+            try:
+                shm = _Segment(name, create=True, size=size)
+            except FileExistsError:
+                # Resto de una reserva abandonada
+                _unlink(name)
+                shm = _Segment(name, create=True, size=size)
+        except OSError:
+            self._release(key)
+            return False
+        try:
+            shm.buf[HEADER.size:HEADER.size + len(meta_bytes)] = meta_bytes
+            shm.buf[offset:offset + meta['nbytes']] = payload
+            # Se marca como listo al final: nadie lee un segmento a medias
+            HEADER.pack_into(shm.buf, 0, MAGIC, 1, len(meta_bytes))
+        finally:
+            shm.close()
+        with self._lock:
+            self.writes += 1
+        return True
+
+    def _reserve(self, key, size):
+        """Reserva una entrada del índice para 'key' desalojando lo necesario."""
+        short = key[:KEY_CHARS].encode('ascii')
+        now = time.time()
+        with self._locked():
+            index = self._index
+            found = np.flatnonzero(index['key'] == short)
+            if found.size:
+                slot = found[0]
+                ready = self._is_ready(key)
+                if ready or now - index['used'][slot] < STALE_SECONDS:
+                    return False
+                # Reserva abandonada por un proceso caído: se reclama
+                self._evict_slot(slot)
+
+            if not _shm_has_room(size):
+                return False
+            used = index['size'][index['key'] != b''].sum()
+            while True:
+                free = np.flatnonzero(index['key'] == b'')
+                if free.size and used + size <= self.max_bytes:
+                    break
+                occupied = np.flatnonzero(index['key'] != b'')
+                if not occupied.size:
+                    return False
+                oldest = occupied[np.argmin(index['used'][occupied])]
+                used -= index['size'][oldest]
+                self._evict_slot(oldest)
+            slot = free[0]
+            index[slot] = (short, size, now)
+        return True
+
+    def _is_ready(self, key):
+        opened = self._open(key)
+        if opened is None:
+            return False
+        opened[0].close()
+        return True
+
+    def _evict_slot(self, slot):
+        # Con el flock tomado
+        short = self._index['key'][slot].decode('ascii')
+        _unlink(self.prefix + short)
+        self._index[slot] = (b'', 0, 0.0)
+        with self._lock:
+            self.evictions += 1
+
+    def _release(self, key):
+        short = key[:KEY_CHARS].encode('ascii')
+        with self._locked():
+            found = np.flatnonzero(self._index['key'] == short)
+            if found.size:
+                self._index[found[0]] = (b'', 0, 0.0)
+
+    # --- Mantenimiento ---
+
+    def clear(self):
+        """Borra todos los segmentos del índice."""
+        with self._locked():
+            for slot in np.flatnonzero(self._index['key'] != b''):
+                self._evict_slot(slot)
+
+    def metrics(self):
+        occupied = self._index['key'] != b''
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'writes': self.writes, 'evictions': self.evictions,
+                    'entries': int(occupied.sum()), 'bytes': int(self._index['size'][occupied].sum())}
+
+
+def _data_offset(meta_len):
+    # Datos alineados a ALIGN bytes (cualquier dtype queda alineado)
+    return -(-(HEADER.size + meta_len) // ALIGN) * ALIGN
+
+
+def _shm_has_room(size):
+    try:
+        info = os.statvfs(SHM_DIR)
+    except OSError:
+        # Sin /dev/shm (macOS): el sistema reserva la memoria al crear el segmento
+        return True
+    return info.f_bavail * info.f_frsize > 2 * size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estado del almacén de resultados en memoria compartida.")
+    parser.add_argument('--stats', action='store_true', help="Entradas y bytes guardados (por defecto)")
+    parser.add_argument('--clear', action='store_true', help="Borra todos los segmentos")
+    args = parser.parse_args(argv)
+    if fcntl is None:
+        print("El almacén en memoria compartida necesita fcntl (no disponible en esta plataforma).")
+        return 1
+    store = SharedStore()
+    if args.clear:
+        store.clear()
+        print("Segmentos borrados.")
+    metrics = store.metrics()
+    print(f"{metrics['entries']} entradas, {metrics['bytes'] / 1024:.0f} KB de {store.max_bytes / 1024:.0f} KB "
+          f"(prefijo '{store.prefix}').")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
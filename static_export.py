@@ -0,0 +1,385 @@
+import argparse
+import concurrent.futures
+import hashlib
+import html
+import inspect
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from compute import view_data
+from families import FAMILIES
+
+# --- Exportación a un Sitio Estático ---
+# Genera un sitio HTML/JS sin servidor (se puede subir a cualquier
+# hosting estático o CDN) con la pestaña "Visualización" de las 17
+# familias: cada página tiene los mismos sliders que la aplicación y, al
+# moverlos, el navegador cambia a un gráfico precalculado; no hay
+# cálculo en el cliente.
+#
+# Para cada familia se recorre la rejilla de sus sliders (mismo mínimo,
+# máximo y paso que la página; las combinaciones inválidas, como K > N,
+# se omiten) y se dibujan todos los gráficos en un grupo de procesos. La
+# rejilla completa de algunas familias es enorme (Hipergeométrica:
+# millones de combinaciones), así que por defecto cada familia se limita
+# a unos 'max_points' gráficos tomando valores repartidos en cada eje y
+# siempre el valor por defecto; --max-points 0 exporta la rejilla entera.
+#
+# Dos formatos:
+#   png     imagen de cada gráfico (la misma figura que la aplicación)
+#   arrays  JSON con los puntos de la PMF/PDF; el navegador los dibuja
+#           en un <canvas> (mucho más liviano, sin los adornos)
+#
+# Los archivos se nombran por el SHA-256 de su contenido: los gráficos
+# idénticos se guardan una vez y volver a exportar sobre la misma carpeta
+# solo escribe los que cambiaron.
+#
+# Uso:  python static_export.py sitio/ [--families normal t] [--workers 4]
+#                               [--max-points 400] [--format png|arrays]
+#                               [--dpi 100]
+
+DEFAULT_MAX_POINTS = 400
+DEFAULT_DPI = 100
+DEFAULT_WORKERS = os.cpu_count() or 1
+ARRAY_POINTS = 200   # puntos de la PDF en formato 'arrays'
+
+# (parámetro, etiqueta, mínimo, máximo, paso) como en la pestaña
+# Visualización de cada página. Los sliders que dependen de otro (ej. b
+# entre a + 1 y a + 20) se exportan con su rango absoluto y la
+# restricción va en VALID.
+SLIDERS = {
+    'bernoulli': [('p', "Probabilidad de éxito (p)", 0.0, 1.0, 0.01)],
+    'binomial': [('n', "Número de ensayos (n)", 1, 100, 1), ('p', "Probabilidad de éxito (p)", 0.01, 0.99, 0.01)],
+    'geometrica': [('p', "Probabilidad de éxito (p)", 0.01, 0.99, 0.01)],
+    'hipergeometrica': [('N', "Población (N)", 10, 200, 1), ('K', "Éxitos en Pob. (K)", 1, 200, 1), ('n', "Muestra (n)", 1, 200, 1)],
+    'uniforme_discreta': [('a', "Mínimo (a)", 1, 20, 1), ('b', "Máximo (b)", 1, 40, 1)],
+    'poisson': [('lam', "Tasa media (λ)", 0.1, 30.0, 0.1)],
+    'uniforme_continua': [('a', "Mínimo (a)", -10.0, 10.0, 0.5), ('b', "Máximo (b)", -9.5, 30.0, 0.5)],
+    'triangular': [('a', "Mínimo (a)", -10.0, 10.0, 0.5), ('c', "Modo (c)", -10.0, 30.0, 0.5), ('b', "Máximo (b)", -9.0, 30.0, 0.5)],
+    'exponencial': [('lam', "Tasa (λ)", 0.1, 10.0, 0.1)],
+    'normal': [('mu', "Media (μ)", -10.0, 10.0, 0.5), ('sigma', "Desviación Estándar (σ)", 0.1, 5.0, 0.1)],
+    'lognormal': [('mu_log', "Media Log (μ_log)", -2.0, 3.0, 0.1), ('sigma_log', "Desv. Est. Log (σ_log)", 0.1, 2.0, 0.1)],
+    'gamma': [('alpha', "Forma (α)", 0.1, 20.0, 0.1), ('beta', "Escala (β)", 0.1, 5.0, 0.1)],
+    'beta': [('alpha', "Forma (α)", 0.1, 20.0, 0.1), ('beta', "Forma (β)", 0.1, 20.0, 0.1)],
+    'weibull': [('k', "Forma (k)", 0.1, 5.0, 0.1), ('lam', "Escala (λ)", 0.1, 20.0, 0.5)],
+    't': [('df', "Grados de Libertad (df)", 1, 30, 1)],
+    'chi2': [('k', "Grados de Libertad (k, df)", 1, 50, 1)],
+    'f': [('df1', "Grados de Libertad Numerador (df1)", 1, 50, 1), ('df2', "Grados de Libertad Denominador (df2)", 1, 50, 1)],
+}
+
+# Combinaciones que la página no permite
+VALID = {
+    'hipergeometrica': lambda N, K, n: K <= N and n <= N,
+    'uniforme_discreta': lambda a, b: a <= b <= a + 20,
+    'uniforme_continua': lambda a, b: a < b <= a + 20,
+    'triangular': lambda a, c, b: a + 1 <= b <= a + 20 and a <= c <= b,
+}
+
+
+def _decimals(step):
+    return 0 if isinstance(step, int) else max(0, -int(np.floor(np.log10(step) + 1e-9)))
+
+
+def axis_values(lo, hi, step, default, count=None):
+    """
+    Valores de la rejilla de un slider (con el tipo del slider). Con
+    'count' se toman unos 'count' valores repartidos, más 'default'.
+    """
+    n_steps = int(round((hi - lo) / step))
+    indices = np.arange(n_steps + 1)
+    if count is not None and count < len(indices):
+        indices = np.unique(np.round(np.linspace(0, n_steps, max(count, 2))).astype(int))
+        default_index = int(round((default - lo) / step))
+        if 0 <= default_index <= n_steps:
+            indices = np.union1d(indices, [default_index])
+    if isinstance(step, int):
+        return [int(lo + step * i) for i in indices]
+    return [round(lo + step * int(i), _decimals(step)) for i in indices]
+
+
+def grid(family, max_points=DEFAULT_MAX_POINTS):
+    """
+    ({parámetro: [valores]}, [parámetros válidos]) de 'family'. Con
+    max_points > 0 cada eje se recorta para que el producto no pase de
+    unos max_points gráficos.
+    """
+    sliders = SLIDERS[family]
+    defaults = FAMILIES[family]['defaults']
+    count = None
+    if max_points:
+        count = max(2, int(np.floor(max_points ** (1 / len(sliders)))))
+    axes = {name: axis_values(lo, hi, step, defaults[name], count) for name, _, lo, hi, step in sliders}
+    valid = VALID.get(family)
+    points = []
+    for values in itertools.product(*axes.values()):
+        params = dict(zip(axes, values))
+        if valid is None or valid(**params):
+            points.append(params)
+    return axes, points
+
+
+def position_key(params, axes):
+    # Índices de los valores en cada eje, como las posiciones de los
+    # sliders en el navegador ("3|17")
+    return "|".join(str(axes[name].index(params[name])) for name in axes)
+
+
+# --- Trabajo de cada proceso ---
+
+_PLOTS = None
+
+
+def _plots():
+    # Importación perezosa: solo los procesos del grupo cargan matplotlib
+    # (y, a través de helpers, Streamlit en modo sin servidor)
+    global _PLOTS
+    if _PLOTS is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        from helpers import plot_discrete_distribution, plot_continuous_distribution
+        from views import DECORATIONS
+        # Sin la caché de Streamlit: cada gráfico se dibuja una sola vez
+        _PLOTS = (inspect.unwrap(plot_discrete_distribution), inspect.unwrap(plot_continuous_distribution), DECORATIONS)
+    return _PLOTS
+
+
+def _render_png(family, params, dpi):
+    from figures import managed_figure
+    plot_discrete, plot_continuous, decorations = _plots()
+    data = view_data(family, **params)
+    if data.discrete:
+        fig = plot_discrete(data.dist, data.points, f"PMF {data.label}")
+    else:
+        fig = plot_continuous(data.dist, data.points[0], data.points[1], f"PDF {data.label}")
+    with managed_figure(fig):
+        decorate = decorations.get(family)
+        if decorate is not None:
+            decorate(fig.gca(), data.dist, *data.args)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', bbox_inches='tight', dpi=dpi)
+    return buffer.getvalue()
+
+
+def _render_arrays(family, params):
+    data = view_data(family, **params)
+    if data.discrete:
+        x = np.asarray(data.points, dtype=float)
+        y = data.dist.pmf(x)
+    else:
+        x = np.linspace(data.points[0], data.points[1], ARRAY_POINTS)
+        y = data.dist.pdf(x)
+    y = np.where(np.isfinite(y), y, 0.0)
+    payload = {
+        'title': f"{'PMF' if data.discrete else 'PDF'} {data.label}",
+        'discrete': data.discrete,
+        'mean': float(data.dist.mean()),
+        # 6 cifras significativas bastan para dibujar y achican el JSON
+        'x': [float(f"{v:.6g}") for v in x],
+        'y': [float(f"{v:.6g}") for v in y],
+    }
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+
+def render(family, params, fmt, dpi):
+    """(bytes, extensión) del gráfico de 'family' con 'params'."""
+    if fmt == 'png':
+        return _render_png(family, params, dpi), '.png'
+    return _render_arrays(family, params), '.json'
+
+
+def _render_job(job):
+    family, params, fmt, dpi = job
+    try:
+        return render(family, params, fmt, dpi), None
+    except Exception as e:
+        return None, f"{family} {params}: {e}"
+
+
+# --- Sitio ---
+
+_SCRIPT = r"""
+function explorer(labels, items, fmt) {
+  const names = Object.keys(labels);
+  const img = document.getElementById('plot-img');
+  const canvas = document.getElementById('plot-canvas');
+  const message = document.getElementById('message');
+
+  function draw(data) {
+    const ctx = canvas.getContext('2d');
+    const w = canvas.width, h = canvas.height, pad = 50;
+    ctx.clearRect(0, 0, w, h);
+    const xmin = Math.min(...data.x), xmax = Math.max(...data.x);
+    const ymax = Math.max(...data.y) * 1.1 || 1;
+    const sx = v => pad + (v - xmin) / ((xmax - xmin) || 1) * (w - 2 * pad);
+    const sy = v => h - pad - v / ymax * (h - 2 * pad);
+    ctx.strokeStyle = '#333'; ctx.beginPath();
+    ctx.moveTo(pad, pad); ctx.lineTo(pad, h - pad); ctx.lineTo(w - pad, h - pad); ctx.stroke();
+    ctx.fillStyle = '#333'; ctx.font = '12px sans-serif';
+    ctx.fillText(xmin.toPrecision(3), pad, h - pad + 16);
+    ctx.fillText(xmax.toPrecision(3), w - pad - 30, h - pad + 16);
+    ctx.fillText(ymax.toPrecision(3), 4, pad);
+    ctx.font = '16px sans-serif'; ctx.fillText(data.title, pad, pad - 20);
+    if (data.discrete) {
+      const bw = Math.max(1, (w - 2 * pad) / data.x.length * 0.8);
+      ctx.fillStyle = 'skyblue'; ctx.strokeStyle = 'black';
+      data.x.forEach((x, i) => {
+        ctx.fillRect(sx(x) - bw / 2, sy(data.y[i]), bw, h - pad - sy(data.y[i]));
+        ctx.strokeRect(sx(x) - bw / 2, sy(data.y[i]), bw, h - pad - sy(data.y[i]));
+      });
+    } else {
+      ctx.strokeStyle = 'royalblue'; ctx.lineWidth = 2; ctx.beginPath();
+      data.x.forEach((x, i) => i ? ctx.lineTo(sx(x), sy(data.y[i])) : ctx.moveTo(sx(x), sy(data.y[i])));
+      ctx.stroke(); ctx.lineWidth = 1;
+    }
+    ctx.strokeStyle = 'red'; ctx.setLineDash([6, 4]); ctx.beginPath();
+    ctx.moveTo(sx(data.mean), pad); ctx.lineTo(sx(data.mean), h - pad); ctx.stroke(); ctx.setLineDash([]);
+  }
+
+  function update() {
+    const positions = names.map(name => document.getElementById('slider-' + name).value);
+    names.forEach((name, i) => document.getElementById('value-' + name).textContent = labels[name][positions[i]]);
+    const file = items[positions.join('|')];
+    message.textContent = file ? '' : 'Combinación de parámetros no válida para esta distribución.';
+    img.style.display = canvas.style.display = 'none';
+    if (!file) return;
+    if (fmt === 'png') {
+      img.src = file; img.style.display = '';
+    } else {
+      fetch(file).then(r => r.json()).then(data => { canvas.style.display = ''; draw(data); });
+    }
+  }
+
+  names.forEach(name => document.getElementById('slider-' + name).addEventListener('input', update));
+  update();
+}
+"""
+
+_STYLE = """
+body { font-family: sans-serif; max-width: 960px; margin: 2em auto; padding: 0 1em; }
+label { display: block; margin-top: 1em; }
+input[type=range] { width: 100%; }
+img, canvas { max-width: 100%; margin-top: 1em; }
+#message { color: #b00; }
+"""
+
+
+def _page(title, body, script=""):
+    return (f"<!DOCTYPE html>\n<html lang=\"es\">\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">\n"
+            f"<title>{html.escape(title)}</title>\n<link rel=\"stylesheet\" href=\"style.css\">\n</head>\n"
+            f"<body>\n{body}\n{script}</body>\n</html>\n")
+
+
+def family_page(family, axes, items, fmt):
+    """HTML de la página de 'family': sliders sobre los valores exportados."""
+    defaults = FAMILIES[family]['defaults']
+    controls = []
+    for name, label, *_ in SLIDERS[family]:
+        values = axes[name]
+        start = values.index(defaults[name]) if defaults[name] in values else 0
+        controls.append(
+            f"<label>{html.escape(label)}: <strong id=\"value-{name}\"></strong>"
+            f"<input type=\"range\" id=\"slider-{name}\" min=\"0\" max=\"{len(values) - 1}\" step=\"1\" value=\"{start}\"></label>"
+        )
+    body = (f"<p><a href=\"index.html\">← Todas las distribuciones</a></p>\n"
+            f"<h1>Distribución {html.escape(FAMILIES[family]['label'])}</h1>\n" + "\n".join(controls) +
+            "\n<p id=\"message\"></p>\n<img id=\"plot-img\" alt=\"Gráfico de la distribución\" style=\"display:none\">"
+            "\n<canvas id=\"plot-canvas\" width=\"900\" height=\"540\" style=\"display:none\"></canvas>")
+    labels = {name: [str(value) for value in values] for name, values in axes.items()}
+    script = (f"<script src=\"explorer.js\"></script>\n<script>explorer({json.dumps(labels, ensure_ascii=False)}, "
+              f"{json.dumps(items, separators=(',', ':'))}, {json.dumps(fmt)});</script>\n")
+    return _page(FAMILIES[family]['label'], body, script)
+
+
+def index_page(families):
+    links = "\n".join(f"<li><a href=\"{family}.html\">{html.escape(FAMILIES[family]['label'])}</a></li>" for family in families)
+    body = ("<h1>Explorador de Distribuciones</h1>\n"
+            "<p>Versión estática: los gráficos están precalculados para las posiciones de los sliders.</p>\n"
+            f"<ul>\n{links}\n</ul>")
+    return _page("Explorador de Distribuciones", body)
+
+
+def _write(path, content):
+    mode = 'wb' if isinstance(content, bytes) else 'w'
+    with open(path, mode, **({} if mode == 'wb' else {'encoding': 'utf-8'})) as f:
+        f.write(content)
+
+
+def export(output, families=None, fmt='png', max_points=DEFAULT_MAX_POINTS, dpi=DEFAULT_DPI,
+           workers=DEFAULT_WORKERS, progress=None):
+    """
+    Escribe el sitio en 'output' y devuelve las métricas: gráficos,
+    archivos únicos, archivos nuevos, bytes y errores.
+    """
+    families = list(families or FAMILIES)
+    asset_dir = os.path.join(output, 'img' if fmt == 'png' else 'data')
+    os.makedirs(asset_dir, exist_ok=True)
+
+    grids = {family: grid(family, max_points) for family in families}
+    jobs = [(family, params, fmt, dpi) for family in families for params in grids[family][1]]
+    metrics = {'plots': len(jobs), 'unique': 0, 'written': 0, 'bytes': 0, 'errors': []}
+    items = {family: {} for family in families}
+    seen = set()
+
+    start = time.perf_counter()
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max(1, workers), mp_context=context) as pool:
+        chunksize = max(1, len(jobs) // (8 * max(1, workers)))
+        for done, ((family, params, _, _), (result, error)) in enumerate(zip(jobs, pool.map(_render_job, jobs, chunksize=chunksize)), 1):
+            if error is not None:
+                metrics['errors'].append(error)
+                continue
+            content, ext = result
+            name = hashlib.sha256(content).hexdigest()[:20] + ext
+            items[family][position_key(params, grids[family][0])] = f"{os.path.basename(asset_dir)}/{name}"
+            if name not in seen:
+                seen.add(name)
+                metrics['unique'] += 1
+                metrics['bytes'] += len(content)
+                path = os.path.join(asset_dir, name)
+                if not os.path.exists(path):
+                    _write(path, content)
+                    metrics['written'] += 1
+            if progress is not None:
+                progress(done, len(jobs))
+
+    for family in families:
+        _write(os.path.join(output, f"{family}.html"), family_page(family, grids[family][0], items[family], fmt))
+    _write(os.path.join(output, 'index.html'), index_page(families))
+    _write(os.path.join(output, 'explorer.js'), _SCRIPT.lstrip())
+    _write(os.path.join(output, 'style.css'), _STYLE.lstrip())
+    metrics['seconds'] = round(time.perf_counter() - start, 2)
+    return metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta el explorador como sitio estático con gráficos precalculados.")
+    parser.add_argument('output', help="Carpeta de salida")
+    parser.add_argument('--families', nargs='*', choices=list(FAMILIES), help="Familias a exportar (por defecto, todas)")
+    parser.add_argument('--format', choices=['png', 'arrays'], default='png')
+    parser.add_argument('--max-points', type=int, default=DEFAULT_MAX_POINTS,
+                        help="Gráficos aproximados por familia (0 = rejilla completa)")
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI, help="Resolución de los PNG")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Procesos del grupo")
+    args = parser.parse_args(argv)
+
+    def progress(done, total):
+        if done % 100 == 0 or done == total:
+            print(f"\r{done}/{total} gráficos", end="", flush=True)
+
+    metrics = export(args.output, args.families, args.format, args.max_points, args.dpi, args.workers, progress)
+    print()
+    for error in metrics['errors']:
+        print(f"Error: {error}")
+    print(f"{metrics['plots']} gráficos, {metrics['unique']} archivos únicos ({metrics['bytes'] / 1024 ** 2:.1f} MB), "
+          f"{metrics['written']} escritos, {len(metrics['errors'])} errores en {metrics['seconds']} s.")
+    return 1 if metrics['errors'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
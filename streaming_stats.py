@@ -0,0 +1,332 @@
+import io
+import itertools
+import os
+
+import numpy as np
+from scipy.optimize import brentq
+from scipy.special import gammaln
+
+# --- Estadísticos en Streaming (una sola pasada) ---
+# Permite resumir archivos de varios GB sin cargarlos en memoria:
+# los datos se leen por bloques (memory-map para .npy y binarios,
+# lectura por líneas para CSV) y cada bloque se combina con el
+# acumulado usando las fórmulas de Welford/Pébay para momentos
+# centrales hasta orden 4. Los cuantiles se estiman con un sketch
+# logarítmico (DDSketch) que también se puede combinar.
+
+DEFAULT_CHUNK = 1_000_000
+
+
+class RunningMoments:
+    """
+    Conteo, media, varianza, asimetría, curtosis, mínimo y máximo
+    acumulados. 'update' procesa un bloque completo de forma vectorizada
+    y lo combina en O(1); 'merge' combina dos acumulados (ej. de
+    procesos distintos).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        chunk = chunk[np.isfinite(chunk)]
+        if len(chunk) == 0:
+            return self
+        other = RunningMoments()
+        other.count = len(chunk)
+        other.mean = float(np.mean(chunk))
+        delta = chunk - other.mean
+        delta2 = delta * delta
+        other.m2 = float(np.sum(delta2))
+        other.m3 = float(np.sum(delta2 * delta))
+        other.m4 = float(np.sum(delta2 * delta2))
+        other.min = float(np.min(chunk))
+        other.max = float(np.max(chunk))
+        return self.merge(other)
+
+    def merge(self, other):
+        """Combina 'other' en este acumulado (Pébay, 2008)."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        delta = other.mean - self.mean
+        delta_n = delta / n
+
+        m2 = self.m2 + other.m2 + delta * delta_n * n_a * n_b
+        m3 = (self.m3 + other.m3
+              + delta * delta_n ** 2 * n_a * n_b * (n_a - n_b)
+              + 3.0 * delta_n * (n_a * other.m2 - n_b * self.m2))
+        m4 = (self.m4 + other.m4
+              + delta * delta_n ** 3 * n_a * n_b * (n_a * n_a - n_a * n_b + n_b * n_b)
+              + 6.0 * delta_n ** 2 * (n_a * n_a * other.m2 + n_b * n_b * self.m2)
+              + 4.0 * delta_n * (n_a * other.m3 - n_b * self.m3))
+
+        self.count = n
+        self.mean = self.mean + delta_n * n_b
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def variance(self, ddof=1):
+        if self.count <= ddof:
+            return np.nan
+        return self.m2 / (self.count - ddof)
+
+    def std(self, ddof=1):
+        return np.sqrt(self.variance(ddof))
+
+    def skewness(self):
+        """Asimetría poblacional g1 (igual que scipy.stats.skew)."""
+        if self.count < 2 or self.m2 == 0:
+            return np.nan
+        return np.sqrt(self.count) * self.m3 / self.m2 ** 1.5
+
+    def kurtosis(self):
+        """Exceso de curtosis g2 (igual que scipy.stats.kurtosis)."""
+        if self.count < 2 or self.m2 == 0:
+            return np.nan
+        return self.count * self.m4 / (self.m2 * self.m2) - 3.0
+
+
+class QuantileSketch:
+    """
+    Sketch de cuantiles con error relativo acotado (DDSketch).
+
+    Cada valor x != 0 cae en el cubo i = ceil(log_γ |x|), con
+    γ = (1 + α) / (1 - α); el cuantil devuelto tiene error relativo
+    menor que α. Los conteos se guardan en arreglos densos con
+    desplazamiento, así que combinar dos sketches es sumar conteos.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.alpha = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self.gamma)
+        self.positive = _DenseStore()
+        self.negative = _DenseStore()
+        self.zero_count = 0
+        self.count = 0
+
+    def _key(self, magnitudes):
+        return np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        chunk = chunk[np.isfinite(chunk)]
+        self.count += len(chunk)
+        self.positive.add(self._key(chunk[chunk > 0]))
+        self.negative.add(self._key(-chunk[chunk < 0]))
+        self.zero_count += int(np.count_nonzero(chunk == 0))
+        return self
+
+    def merge(self, other):
+        if self.gamma != other.gamma:
+            raise ValueError("Solo se pueden combinar sketches con la misma precisión.")
+        self.positive.merge(other.positive)
+        self.negative.merge(other.negative)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def _value(self, key):
+        return 2.0 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q):
+        """Cuantiles q en [0, 1] (escalar o arreglo)."""
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan)
+        q = np.asarray(q, dtype=float)
+        ranks = q * (self.count - 1)
+
+        # Orden ascendente: negativos (de mayor a menor magnitud), ceros, positivos
+        neg_keys, neg_counts = self.negative.items()
+        pos_keys, pos_counts = self.positive.items()
+        values = np.concatenate([-self._value(neg_keys[::-1]), [0.0], self._value(pos_keys)])
+        counts = np.concatenate([neg_counts[::-1], [self.zero_count], pos_counts])
+        cumulative = np.cumsum(counts)
+        idx = np.searchsorted(cumulative, ranks, side='right')
+        return values[np.clip(idx, 0, len(values) - 1)]
+
+
+class _DenseStore:
+    """Conteos por cubo en un arreglo denso que crece según haga falta."""
+
+    def __init__(self):
+        self.offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def _grow(self, key_min, key_max):
+        if len(self.counts) == 0:
+            self.offset = key_min
+            self.counts = np.zeros(key_max - key_min + 1, dtype=np.int64)
+            return
+        new_min = min(key_min, self.offset)
+        new_max = max(key_max, self.offset + len(self.counts) - 1)
+        if new_min == self.offset and new_max == self.offset + len(self.counts) - 1:
+            return
+        grown = np.zeros(new_max - new_min + 1, dtype=np.int64)
+        start = self.offset - new_min
+        grown[start:start + len(self.counts)] = self.counts
+        self.offset, self.counts = new_min, grown
+
+    def add(self, keys, weights=None):
+        if len(keys) == 0:
+            return
+        self._grow(int(keys.min()), int(keys.max()))
+        self.counts += np.bincount(keys - self.offset, weights=weights,
+                                   minlength=len(self.counts)).astype(np.int64)
+
+    def merge(self, other):
+        keys, counts = other.items()
+        self.add(keys, weights=counts)
+
+    def items(self):
+        nonzero = np.nonzero(self.counts)[0]
+        return nonzero + self.offset, self.counts[nonzero]
+
+
+class StreamingSummary:
+    """Momentos y sketch de cuantiles alimentados en la misma pasada."""
+
+    def __init__(self, relative_accuracy=0.01):
+        self.moments = RunningMoments()
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        self.moments.update(chunk)
+        self.sketch.update(chunk)
+        return self
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def as_dict(self):
+        m = self.moments
+        q = self.sketch.quantile([0.01, 0.25, 0.5, 0.75, 0.99])
+        return {
+            'count': m.count, 'mean': m.mean, 'variance': m.variance(),
+            'std': m.std(), 'skewness': m.skewness(), 'kurtosis': m.kurtosis(),
+            'min': m.min, 'max': m.max,
+            'p01': q[0], 'p25': q[1], 'median': q[2], 'p75': q[3], 'p99': q[4],
+        }
+
+
+# --- Lectura por Bloques ---
+
+def iter_chunks(source, column=0, chunk_size=DEFAULT_CHUNK, dtype='float64', skip_header=0):
+    """
+    Genera bloques numpy de una columna del origen, sin cargarlo entero.
+
+    - '.npy': np.load con mmap_mode='r' (columna 'column' si es 2D).
+    - '.bin', '.dat', '.f64', '.f32', '.raw': binario crudo vía np.memmap
+      con el 'dtype' indicado.
+    - Cualquier otro archivo o un objeto tipo archivo: texto CSV leído
+      por líneas ('skip_header' líneas iniciales se descartan).
+    """
+    if isinstance(source, (str, os.PathLike)):
+        ext = os.path.splitext(str(source))[1].lower()
+        if ext == '.npy':
+            array = np.load(source, mmap_mode='r')
+            if array.ndim > 1:
+                array = array[:, column]
+            for start in range(0, len(array), chunk_size):
+                yield np.asarray(array[start:start + chunk_size], dtype=float)
+            return
+        if ext in ('.bin', '.dat', '.f64', '.f32', '.raw'):
+            if ext == '.f32':
+                dtype = 'float32'
+            array = np.memmap(source, dtype=dtype, mode='r')
+            for start in range(0, len(array), chunk_size):
+                yield np.asarray(array[start:start + chunk_size], dtype=float)
+            return
+        with open(source, 'r', encoding='utf-8', errors='replace') as f:
+            yield from _iter_csv_chunks(f, column, chunk_size, skip_header)
+        return
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    if isinstance(source, io.BufferedIOBase) or hasattr(source, 'getvalue'):
+        source = io.TextIOWrapper(source, encoding='utf-8', errors='replace')
+    yield from _iter_csv_chunks(source, column, chunk_size, skip_header)
+
+
+def _iter_csv_chunks(lines, column, chunk_size, skip_header):
+    lines = itertools.islice(lines, skip_header, None)
+    while True:
+        block = list(itertools.islice(lines, chunk_size))
+        if not block:
+            return
+        values = np.genfromtxt(block, delimiter=',', usecols=column, dtype=float, invalid_raise=False)
+        yield np.atleast_1d(values)
+
+
+def summarize_source(source, column=0, chunk_size=DEFAULT_CHUNK, relative_accuracy=0.01, **kwargs):
+    """Resume un archivo (ruta u objeto tipo archivo) en una sola pasada."""
+    summary = StreamingSummary(relative_accuracy)
+    for chunk in iter_chunks(source, column=column, chunk_size=chunk_size, **kwargs):
+        summary.update(chunk)
+    return summary
+
+
+# --- Estimadores por el Método de los Momentos ---
+# En la notación de las páginas; sirven como valores iniciales para
+# las calculadoras y para el ajuste por máxima verosimilitud.
+
+def _weibull_shape_from_cv(cv):
+    # CV² = Γ(1+2/k) / Γ(1+1/k)² - 1, decreciente en k
+    def equation(k):
+        return np.exp(gammaln(1 + 2 / k) - 2 * gammaln(1 + 1 / k)) - 1 - cv * cv
+    return brentq(equation, 0.05, 100.0)
+
+
+def moment_estimates(moments):
+    """
+    Devuelve {familia: {parámetro: valor}} con los estimadores por
+    momentos que tengan sentido para los datos resumidos.
+    """
+    m = moments.mean
+    v = moments.variance()
+    estimates = {}
+    if moments.count < 2 or not np.isfinite(v) or v <= 0:
+        return estimates
+
+    estimates['normal'] = {'mu': m, 'sigma': np.sqrt(v)}
+    estimates['uniforme_continua'] = {'a': m - np.sqrt(3 * v), 'b': m + np.sqrt(3 * v)}
+
+    if moments.min > 0:
+        estimates['exponencial'] = {'lam': 1.0 / m}
+        estimates['gamma'] = {'alpha': m * m / v, 'beta': v / m}
+        sigma2_log = np.log1p(v / (m * m))
+        estimates['lognormal'] = {'mu_log': np.log(m) - sigma2_log / 2, 'sigma_log': np.sqrt(sigma2_log)}
+        try:
+            k = _weibull_shape_from_cv(np.sqrt(v) / m)
+            estimates['weibull'] = {'k': k, 'lam': m / np.exp(gammaln(1 + 1 / k))}
+        except ValueError:
+            pass
+
+    if moments.min > 0 and moments.max < 1 and v < m * (1 - m):
+        common = m * (1 - m) / v - 1
+        estimates['beta'] = {'alpha': m * common, 'beta': (1 - m) * common}
+
+    if moments.min >= 0:
+        estimates['poisson'] = {'lam': m}
+    if moments.min >= 1:
+        estimates['geometrica'] = {'p': 1.0 / m}
+    return {family: {name: float(value) for name, value in params.items()}
+            for family, params in estimates.items()}
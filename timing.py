@@ -0,0 +1,286 @@
+import bisect
+import collections
+import functools
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+# --- Instrumentación de Tiempos por Rerun ---
+# Temporizadores ligeros (context manager o decorador) alrededor de las
+# etapas de cada rerun:
+#
+#   construccion   objeto de la distribución (SciPy / motor propio)
+#   evaluacion     pmf/pdf/cdf/sf y consultas de la calculadora
+#   figura         construcción de la figura de matplotlib
+#   rasterizacion  figura -> PNG / WebP
+#   envio          st.image
+#   rerun          ejecución completa del script de la página
+#
+# Cada medida se acumula por (página, etapa) en un histograma de cubetas
+# fijas (acumulado desde el arranque, para Prometheus) y en una ventana
+# de las últimas WINDOW medidas (percentiles recientes del panel). La
+# página la fija start_rerun() en el hilo del script; las medidas de
+# otros hilos (precalentamiento, API) quedan con página ''.
+#
+# Una medida cuesta unos pocos microsegundos (perf_counter y un lock).
+#
+# Otros módulos pueden añadir al archivo de Prometheus valores que se leen
+# al exportar (register), como las figuras vivas de 'figures.py'.
+#
+# counted_cache envuelve una caché (st.cache_data) y cuenta, por proceso,
+# las llamadas y las ejecuciones reales del cuerpo: la diferencia son los
+# cálculos que la caché ahorró. Las llamadas simultáneas con la misma
+# clave ya las serializa el lock por clave de st.cache_data
+# (compute_value_lock): solo la primera ejecuta el cuerpo.
+
+WINDOW = 1000
+# Límites superiores de las cubetas, en segundos
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGES = ('construccion', 'evaluacion', 'figura', 'rasterizacion', 'envio', 'rerun')
+
+DEFAULT_METRICS_FILE = os.environ.get(
+    'DISTRIBUCIONES_METRICS_FILE',
+    os.path.join(os.path.expanduser('~'), '.distribuciones', 'metrics.prom'),
+)
+EXPORT_INTERVAL = 5.0   # segundos mínimos entre escrituras del archivo
+
+_local = threading.local()
+
+
+class Histogram:
+    """Histograma acumulado (cubetas fijas) más ventana de las últimas medidas."""
+
+    __slots__ = ('counts', 'total', 'count', 'recent')
+
+    def __init__(self, window=WINDOW):
+        self.counts = [0] * (len(BUCKETS) + 1)   # la última es +Inf
+        self.total = 0.0
+        self.count = 0
+        self.recent = collections.deque(maxlen=window)
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        self.recent.append(seconds)
+
+    def summary(self):
+        """Percentiles (en segundos) de la ventana reciente."""
+        if not self.recent:
+            return {'n': 0, 'p50': None, 'p95': None, 'max': None}
+        values = np.fromiter(self.recent, dtype=float)
+        p50, p95 = np.percentile(values, [50, 95])
+        return {'n': len(values), 'p50': float(p50), 'p95': float(p95), 'max': float(values.max())}
+
+    def recent_counts(self):
+        """Histograma de la ventana reciente con las mismas cubetas."""
+        counts = [0] * (len(BUCKETS) + 1)
+        for seconds in self.recent:
+            counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        return counts
+
+
+class TimingRegistry:
+    """Histogramas por (página, etapa), seguros para varios hilos."""
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._metrics = {}
+        self._last_export = 0.0
+
+    def observe(self, page, stage, seconds):
+        with self._lock:
+            histogram = self._histograms.get((page, stage))
+            if histogram is None:
+                histogram = self._histograms[(page, stage)] = Histogram(self.window)
+            histogram.observe(seconds)
+
+    def summary(self, page=None):
+        """{(página, etapa): {'n', 'p50', 'p95', 'max'}} de la ventana reciente."""
+        with self._lock:
+            return {key: h.summary() for key, h in sorted(self._histograms.items()) if page is None or key[0] == page}
+
+    def recent_counts(self, page, stage):
+        with self._lock:
+            histogram = self._histograms.get((page, stage))
+            return histogram.recent_counts() if histogram is not None else [0] * (len(BUCKETS) + 1)
+
+    def register(self, name, kind, description, read):
+        """
+        Añade a la exportación la métrica 'name' ('gauge' o 'counter'); su
+        valor es read() en el momento de exportar.
+        """
+        with self._lock:
+            self._metrics[name] = (kind, description, read)
+
+    def prometheus(self):
+        """Texto en el formato de exposición de Prometheus."""
+        lines = [
+            "# HELP distribuciones_stage_seconds Duración de cada etapa del rerun.",
+            "# TYPE distribuciones_stage_seconds histogram",
+        ]
+        with self._lock:
+            for (page, stage), h in sorted(self._histograms.items()):
+                labels = f'page="{page}",stage="{stage}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS + (float('inf'),), h.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'distribuciones_stage_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f'distribuciones_stage_seconds_sum{{{labels}}} {h.total!r}')
+                lines.append(f'distribuciones_stage_seconds_count{{{labels}}} {h.count}')
+            metrics = sorted(self._metrics.items())
+        for name, (kind, description, read) in metrics:
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}", f"{name} {read()}"]
+        return "\n".join(lines) + "\n"
+
+    def export(self, path=DEFAULT_METRICS_FILE):
+        """Escribe el archivo de métricas de forma atómica (temporal + os.replace)."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-metrics-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus())
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        return path
+
+    def maybe_export(self, path=DEFAULT_METRICS_FILE, interval=EXPORT_INTERVAL):
+        """Como export(), pero como mucho una vez cada 'interval' segundos."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_export < interval:
+                return None
+            self._last_export = now
+        return self.export(path)
+
+
+REGISTRY = TimingRegistry()
+
+
+def current_page():
+    return getattr(_local, 'page', '')
+
+
+def start_rerun(page):
+    """
+    Marca el comienzo del rerun de 'page' en el hilo actual: las medidas
+    siguientes llevan esa página y se guardan también en la traza del
+    rerun (ver rerun_trace).
+    """
+    _local.page = page
+    _local.trace = []
+    _local.start = time.perf_counter()
+
+
+def finish_rerun():
+    """Registra la etapa 'rerun' (desde start_rerun) y devuelve su duración."""
+    start = getattr(_local, 'start', None)
+    if start is None:
+        return None
+    seconds = time.perf_counter() - start
+    _record('rerun', seconds)
+    _local.start = None
+    return seconds
+
+
+def rerun_trace():
+    """[(etapa, segundos)] medidas en el rerun actual, en orden."""
+    return list(getattr(_local, 'trace', ()))
+
+
+def _record(stage, seconds):
+    REGISTRY.observe(current_page(), stage, seconds)
+    trace = getattr(_local, 'trace', None)
+    if trace is not None:
+        trace.append((stage, seconds))
+
+
+class _Timer:
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        _record(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+def timer(stage):
+    """Context manager: with timer('figura'): ..."""
+    return _Timer(stage)
+
+
+def timed(stage):
+    """Decorador: cada llamada a la función se mide como 'stage'."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class CacheCounter:
+    """Llamadas a una función cacheada y ejecuciones reales de su cuerpo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+
+    def called(self):
+        with self._lock:
+            self.calls += 1
+
+    def executed(self):
+        with self._lock:
+            self.executions += 1
+
+    def metrics(self):
+        with self._lock:
+            return {'calls': self.calls, 'executions': self.executions,
+                    'saved': self.calls - self.executions}
+
+
+CACHE_COUNTERS = {}
+
+
+def counted_cache(name, cache):
+    """
+    Decorador: cache(func) (p. ej. st.cache_data) contando en
+    CACHE_COUNTERS[name] cada llamada y cada ejecución real del cuerpo.
+    """
+    counter = CACHE_COUNTERS.setdefault(name, CacheCounter())
+
+    def decorator(func):
+        @functools.wraps(func)
+        def body(*args, **kwargs):
+            counter.executed()
+            return func(*args, **kwargs)
+        cached = cache(body)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            counter.called()
+            return cached(*args, **kwargs)
+        wrapper.clear = cached.clear
+        return wrapper
+    return decorator
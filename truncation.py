@@ -0,0 +1,206 @@
+import warnings
+
+import numpy as np
+from scipy import integrate
+
+# --- Distribuciones Truncadas y Transformadas ---
+# Y = loc + scale · X, restringida a [a, b] (en unidades de Y), para
+# cualquier objeto congelado de SciPy. La masa retenida y la cdf/sf se
+# calculan en escala logarítmica a partir de la cdf o la sf del padre
+# según el lado de la mediana, de modo que una truncación en la cola
+# profunda (masa retenida de 1e-10 o menor) conserva todas sus cifras.
+# La ppf invierte directamente la cdf/sf del padre: el muestreo por
+# transformada inversa es exacto y vectorizado.
+#
+# Media y varianza: sin truncación se usan las del padre; con truncación,
+# cuadratura adaptativa (scipy.integrate.quad) de la densidad sobre
+# [a, b], partida en la mediana. Si el intervalo llega a una cola
+# infinita en la que el momento del padre diverge, el momento no existe:
+# la media es ±inf (o nan si divergen ambas colas) y la varianza inf o
+# nan. Se supone que un momento no finito del padre diverge en todas sus
+# colas infinitas, como en la t de Student y la F.
+
+
+def _log_diff(log_big, log_small):
+    """log(exp(log_big) - exp(log_small)) sin pérdida de precisión."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return log_big + np.log1p(-np.exp(log_small - log_big))
+
+
+class Truncated:
+    """
+    Distribución de Y = loc + scale · X condicionada a a <= Y <= b.
+
+    dist: objeto congelado de SciPy (continuo o discreto).
+    Para padres discretos solo se permite scale = 1 y loc entero.
+    """
+
+    def __init__(self, dist, a=-np.inf, b=np.inf, loc=0.0, scale=1.0, discrete=False):
+        if scale <= 0:
+            raise ValueError("La escala debe ser positiva.")
+        if discrete and (scale != 1 or loc != int(loc)):
+            raise ValueError("En distribuciones discretas solo se admite un desplazamiento entero (scale = 1).")
+        if not a < b:
+            raise ValueError("Se requiere a < b.")
+
+        self.parent = dist
+        self.discrete = discrete
+        self.loc, self.scale = float(loc), float(scale)
+        self.a, self.b = float(a), float(b)
+
+        # Límites en unidades del padre
+        self._lo = (self.a - self.loc) / self.scale
+        self._hi = (self.b - self.loc) / self.scale
+        if discrete:
+            # P(lo <= X <= hi) = F(hi) - F(lo - 1) en soporte entero
+            self._lo = np.ceil(self._lo) - 1
+            self._hi = np.floor(self._hi)
+
+        # Si todo el intervalo está por encima de la mediana se trabaja con
+        # la sf (cola derecha); en otro caso con la cdf.
+        self._upper = self._lo >= dist.median()
+        if self._upper:
+            self._log_edge_lo = dist.logsf(self._lo)
+            self._log_edge_hi = dist.logsf(self._hi)
+            self.log_mass = _log_diff(self._log_edge_lo, self._log_edge_hi)
+        else:
+            self._log_edge_lo = dist.logcdf(self._lo)
+            self._log_edge_hi = dist.logcdf(self._hi)
+            self.log_mass = _log_diff(self._log_edge_hi, self._log_edge_lo)
+        if not np.isfinite(self.log_mass):
+            raise ValueError("El intervalo [a, b] no contiene masa de probabilidad.")
+        self._moments = None
+
+    @property
+    def mass(self):
+        """Probabilidad retenida P(a <= Y <= b) bajo el padre."""
+        return np.exp(self.log_mass)
+
+    def _to_parent(self, y):
+        return (np.asarray(y, dtype=float) - self.loc) / self.scale
+
+    def _inside(self, x):
+        if self.discrete:
+            return (x > self._lo) & (x <= self._hi)
+        return (x >= self._lo) & (x <= self._hi)
+
+    def logpdf(self, y):
+        x = self._to_parent(y)
+        with np.errstate(divide='ignore'):
+            logp = self.parent.logpdf(x) - np.log(self.scale) - self.log_mass
+        return np.where(self._inside(x), logp, -np.inf)
+
+    def pdf(self, y):
+        return np.exp(self.logpdf(y))
+
+    def logpmf(self, k):
+        x = self._to_parent(k)
+        with np.errstate(divide='ignore'):
+            logp = self.parent.logpmf(x) - self.log_mass
+        return np.where(self._inside(x), logp, -np.inf)
+
+    def pmf(self, k):
+        return np.exp(self.logpmf(k))
+
+    def _log_cdf_sf(self, y):
+        # Devuelve (log F_Y, log S_Y) dentro del intervalo
+        x = np.clip(self._to_parent(y), self._lo, self._hi)
+        if self._upper:
+            log_sf_x = self.parent.logsf(x)
+            log_cdf = _log_diff(self._log_edge_lo, log_sf_x) - self.log_mass
+            log_sf = _log_diff(log_sf_x, self._log_edge_hi) - self.log_mass
+        else:
+            log_cdf_x = self.parent.logcdf(x)
+            log_cdf = _log_diff(log_cdf_x, self._log_edge_lo) - self.log_mass
+            log_sf = _log_diff(self._log_edge_hi, log_cdf_x) - self.log_mass
+        return log_cdf, log_sf
+
+    def cdf(self, y):
+        log_cdf, _ = self._log_cdf_sf(y)
+        return np.clip(np.exp(log_cdf), 0.0, 1.0)
+
+    def sf(self, y):
+        _, log_sf = self._log_cdf_sf(y)
+        return np.clip(np.exp(log_sf), 0.0, 1.0)
+
+    def ppf(self, q):
+        """
+        Cuantil exacto invirtiendo la cdf (o sf) del padre:
+            cola derecha: S(x) = S(hi) + (1 - q) · Z
+            resto:        F(x) = F(lo) + q · Z
+        con Z la masa retenida, todo en escala logarítmica.
+        """
+        q = np.asarray(q, dtype=float)
+        with np.errstate(divide='ignore'):
+            if self._upper:
+                log_target = np.logaddexp(self._log_edge_hi, np.log1p(-q) + self.log_mass)
+                x = self.parent.isf(np.exp(log_target))
+            else:
+                log_target = np.logaddexp(self._log_edge_lo, np.log(q) + self.log_mass)
+                x = self.parent.ppf(np.exp(log_target))
+        lo = self._lo + 1 if self.discrete else self._lo
+        x = np.clip(x, lo, self._hi)
+        return np.where((q < 0) | (q > 1), np.nan, self.loc + self.scale * x)
+
+    def isf(self, q):
+        return self.ppf(1 - np.asarray(q, dtype=float))
+
+    def rvs(self, size=1, random_state=None):
+        """Muestreo por transformada inversa."""
+        rng = np.random.default_rng(random_state)
+        return self.ppf(rng.random(size))
+
+    def _open_tails(self):
+        # (izquierda, derecha): el intervalo llega a una cola infinita del padre
+        low, high = self.parent.support()
+        return bool(self._lo == -np.inf and low == -np.inf), bool(self._hi == np.inf and high == np.inf)
+
+    def _untruncated(self):
+        low, high = self.parent.support()
+        below = self._lo < low if self.discrete else self._lo <= low
+        return below and self._hi >= high
+
+    def _expect(self, g):
+        # E[g(X) | lo <= X <= hi] en unidades del padre
+        if self.discrete:
+            # Suma directa sobre el soporte retenido (sin la masa < 1e-12 de las colas)
+            values = np.arange(self._to_parent(self.ppf(1e-12)), self._to_parent(self.ppf(1 - 1e-12)) + 1)
+            weights = np.exp(self.parent.logpmf(values) - self.log_mass)
+            return float(np.sum(weights * g(values)) / np.sum(weights))
+        density = lambda x: g(x) * np.exp(self.parent.logpdf(x) - self.log_mass)
+        mid = float(self._to_parent(self.median()))
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', integrate.IntegrationWarning)
+            return sum(integrate.quad(density, lo, hi, limit=200)[0]
+                       for lo, hi in ((self._lo, mid), (mid, self._hi)) if lo < hi)
+
+    def _parent_moments(self):
+        # (media, varianza) de X condicionada al intervalo
+        parent_mean, parent_var = float(self.parent.mean()), float(self.parent.var())
+        left, right = self._open_tails()
+        if not np.isfinite(parent_mean) and (left or right):
+            return (np.nan if left and right else np.inf if right else -np.inf), np.nan
+        if self._untruncated():
+            return parent_mean, parent_var
+        mean = self._expect(lambda x: x)
+        if not np.isfinite(parent_var) and (left or right):
+            return mean, np.inf
+        return mean, max(self._expect(lambda x: (x - mean) ** 2), 0.0)
+
+    def _compute_moments(self):
+        if self._moments is None:
+            mean, var = self._parent_moments()
+            self._moments = (float(self.loc + self.scale * mean), float(self.scale ** 2 * var))
+        return self._moments
+
+    def mean(self):
+        return self._compute_moments()[0]
+
+    def var(self):
+        return self._compute_moments()[1]
+
+    def std(self):
+        return np.sqrt(self.var())
+
+    def median(self):
+        return float(self.ppf(0.5))
@@ -0,0 +1,68 @@
+import collections
+
+import numpy as np
+import scipy.stats as stats
+
+from compute import view_data
+from figures import managed_figure
+from helpers import plot_discrete_distribution, plot_continuous_distribution
+
+# --- Gráficos de la Pestaña "Visualización" ---
+# Dibuja lo que calcula 'compute.view_data' (rango, título, objetos) con
+# los adornos que usa cada página. Las páginas y el precalentamiento
+# (warmup.py) usan los mismos constructores, así el gráfico precalculado
+# es idéntico (misma clave de caché, mismos bytes) al que vería un
+# visitante.
+
+View = collections.namedtuple('View', 'dist frozen fig lo hi label discrete')
+
+
+def _normal_rule(ax, dist, mu, sigma):
+    # Líneas de la regla empírica
+    ax.axvline(mu + sigma, color='gray', linestyle='--', linewidth=1, label='μ ± 1σ (68%)')
+    ax.axvline(mu - sigma, color='gray', linestyle='--', linewidth=1)
+    ax.axvline(mu + 2*sigma, color='dimgray', linestyle=':', linewidth=1, label='μ ± 2σ (95%)')
+    ax.axvline(mu - 2*sigma, color='dimgray', linestyle=':', linewidth=1)
+    ax.legend()
+
+
+def _t_reference(ax, dist, df):
+    # Superponer la Normal Estándar para comparar
+    x_values = np.linspace(-4, 4, 500)
+    ax.plot(x_values, stats.norm(0, 1).pdf(x_values), color='red', linestyle=':', linewidth=2, label='Normal(0,1)')
+    ax.legend()
+
+
+# Adornos que algunas páginas añaden a su gráfico: reciben el eje, la
+# distribución y los parámetros.
+DECORATIONS = {
+    # Ajustar el eje Y para que se vea mejor
+    'uniforme_discreta': lambda ax, dist, a, b: ax.set_ylim(bottom=0, top=dist.pmf(a) * 1.2),
+    'uniforme_continua': lambda ax, dist, a, b: ax.set_ylim(bottom=0, top=1 / (b - a) * 1.2),
+    'normal': _normal_rule,
+    't': _t_reference,
+}
+
+
+def visualization(family, **params):
+    """
+    Distribución y gráfico de la pestaña "Visualización" de 'family'.
+
+    Devuelve View(dist, frozen, fig, lo, hi, label, discrete): 'dist' es
+    el objeto graficado, 'frozen' el objeto de SciPy para las
+    superposiciones (CDF empírica, truncación), [lo, hi] el rango
+    graficado y 'label' el título sin prefijo ("Normal (μ=0.0, σ=1.0)").
+    """
+    data = view_data(family, **params)
+    if data.discrete:
+        fig = plot_discrete_distribution(data.dist, data.points, f"PMF {data.label}")
+        lo, hi = data.points[0], data.points[-1]
+    else:
+        lo, hi = data.points
+        fig = plot_continuous_distribution(data.dist, lo, hi, f"PDF {data.label}")
+    decorate = DECORATIONS.get(family)
+    if decorate is not None:
+        with managed_figure(fig, keep=True):
+            decorate(fig.gca(), data.dist, *data.args)
+    return View(data.dist, data.frozen, fig, lo, hi, data.label, data.discrete)
+
@@ -0,0 +1,218 @@
+import concurrent.futures
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+import streamlit as st
+
+from compute import figure_key
+from families import FAMILIES
+from figures import managed_figure
+from exercises import BANK_VERSION
+from helpers import cached_png, truncation_figure, get_answer_bank
+from queries import IntervalQuery
+from rendering import DEFAULT_OPTIONS, MOBILE_OPTIONS
+from truncation import Truncated
+from views import visualization
+
+# --- Precalentamiento de las Cachés ---
+# Al arrancar, nada está calculado: el primer visitante de cada página
+# paga SciPy + matplotlib con los valores por defecto de los sliders.
+# Este módulo recorre en un grupo de hilos en segundo plano las 17
+# familias y, para cada juego de parámetros (los valores por defecto más
+# los "calientes" del archivo de configuración):
+#
+#   - construye el gráfico de "Visualización" (st.cache_data) y guarda su
+#     imagen en la caché en disco, con la misma clave que usa la página,
+#     para navegadores de escritorio y móviles (rendering.py);
+#   - hace lo mismo con el gráfico de "Truncar y trasladar", que la página
+#     dibuja aunque el expander esté cerrado;
+#   - evalúa las consultas por defecto de la calculadora (no se guardan:
+#     solo se paga la inicialización perezosa de SciPy);
+#
+# y genera o carga el banco de respuestas de los ejercicios.
+#
+# Streamlit no tiene un gancho de arranque: start_warmup() se llama desde
+# app.py y desde cada página y, al ser un recurso cacheado, se ejecuta una
+# sola vez por proceso. Como la caché en disco persiste, también se puede
+# precalentar antes de desplegar:  python warmup.py [--workers 4]
+#
+# Configuración (variables de entorno):
+#   DISTRIBUCIONES_WARMUP=0           desactiva el precalentamiento
+#   DISTRIBUCIONES_WARMUP_WORKERS     hilos del grupo (por defecto 2)
+#   DISTRIBUCIONES_WARMUP_FILE        JSON con parámetros calientes, ej.
+#       {"normal": [{"mu": 100, "sigma": 15}], "t": [{"df": 10}, {"df": 30}]}
+#     (por defecto 'warmup.json' junto a la aplicación, si existe)
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+WARMUP_ENABLED = os.environ.get('DISTRIBUCIONES_WARMUP', '1') not in ('0', 'false', 'no')
+DEFAULT_WORKERS = int(os.environ.get('DISTRIBUCIONES_WARMUP_WORKERS', 2))
+DEFAULT_HOT_FILE = os.environ.get('DISTRIBUCIONES_WARMUP_FILE', os.path.join(_APP_DIR, 'warmup.json'))
+# Resoluciones precalculadas: las que elige render_options sin ?ancho=
+RENDER_OPTIONS = (DEFAULT_OPTIONS, MOBILE_OPTIONS)
+
+
+def load_hot_params(path=DEFAULT_HOT_FILE):
+    """
+    Juegos de parámetros calientes {familia: [{parámetro: valor}, ...]}.
+
+    Cada valor toma el tipo del valor por defecto de su slider (la clave
+    de la caché distingue 5 de 5.0). Un archivo inexistente equivale a
+    ninguno.
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        raw = json.load(f)
+    if not isinstance(raw, dict):
+        raise ValueError("El archivo de precalentamiento debe ser un objeto {familia: [parámetros, ...]}.")
+
+    hot = {}
+    for family, sets in raw.items():
+        if family not in FAMILIES:
+            raise ValueError(f"Familia desconocida en el precalentamiento: '{family}'.")
+        defaults = FAMILIES[family]['defaults']
+        hot[family] = []
+        for params in sets:
+            unknown = set(params) - set(defaults)
+            if unknown:
+                raise ValueError(f"Parámetros desconocidos para {family}: {', '.join(sorted(unknown))}.")
+            hot[family].append({name: type(defaults[name])(value) for name, value in params.items()})
+    return hot
+
+
+def warm_visualization(family, params):
+    """Gráfico de Visualización y de truncación por defecto, en memoria y en disco."""
+    view = visualization(family, **params)
+    with managed_figure(view.fig):
+        for options in RENDER_OPTIONS:
+            cached_png(view.fig, *figure_key(family, **params), options=options)
+
+    # Valores iniciales del expander "Truncar y trasladar"
+    loc = 0 if view.discrete else 0.0
+    truncated = Truncated(view.frozen, loc=loc, discrete=view.discrete)
+    prefix = 'PMF' if view.discrete else 'PDF'
+    fig, key_parts = truncation_figure(view.frozen, truncated, f"{prefix} {view.label}", -np.inf, np.inf, loc, 1.0, view.discrete)
+    with managed_figure(fig):
+        if key_parts:
+            for options in RENDER_OPTIONS:
+                cached_png(fig, *key_parts, options=options)
+
+
+def warm_calculator(family, params):
+    """Consultas de la calculadora alrededor de la media (inicializa SciPy)."""
+    view = visualization(family, **params)
+    plt.close(view.fig)
+    dist = view.dist
+    mean, std = float(dist.mean()), float(dist.std())
+    IntervalQuery(dist, discrete=view.discrete).query(x=[mean], a=[mean - std], b=[mean + std])
+
+
+def warmup_jobs(hot=None):
+    """Lista de (nombre, función) a ejecutar, en orden de páginas."""
+    hot = load_hot_params() if hot is None else hot
+    jobs = [("banco de ejercicios", lambda: get_answer_bank(BANK_VERSION))]
+    for family, spec in FAMILIES.items():
+        param_sets = [dict(spec['defaults'])] + [{**spec['defaults'], **p} for p in hot.get(family, [])]
+        for params in param_sets:
+            name = f"{spec['label']} ({', '.join(f'{k}={v}' for k, v in params.items())})"
+            jobs.append((f"{name}: gráficos", lambda f=family, p=params: warm_visualization(f, p)))
+        jobs.append((f"{spec['label']}: calculadora", lambda f=family, p=param_sets[0]: warm_calculator(f, p)))
+    return jobs
+
+
+class WarmUp:
+    """
+    Ejecuta 'jobs' en un grupo de hilos en segundo plano. Un error en un
+    trabajo se registra y no detiene a los demás.
+    """
+
+    def __init__(self, jobs, workers=DEFAULT_WORKERS):
+        self.jobs = list(jobs)
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self.status = {name: ('pendiente', None, None) for name, _ in self.jobs}
+        self.started = None
+        self.finished = None
+        self._executor = None
+        self._futures = []
+
+    def _run(self, name, fn):
+        start = time.perf_counter()
+        try:
+            fn()
+            result = ('ok', time.perf_counter() - start, None)
+        except Exception as e:
+            result = ('error', time.perf_counter() - start, str(e))
+        with self._lock:
+            self.status[name] = result
+            if all(state != 'pendiente' for state, _, _ in self.status.values()):
+                self.finished = time.time()
+
+    def start(self):
+        self.started = time.time()
+        if not self.jobs:
+            self.finished = self.started
+            return self
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='warmup')
+        self._futures = [self._executor.submit(self._run, name, fn) for name, fn in self.jobs]
+        # Los hilos terminan solos; no se espera a que acaben
+        self._executor.shutdown(wait=False)
+        return self
+
+    def wait(self, timeout=None):
+        concurrent.futures.wait(self._futures, timeout=timeout)
+        return self.done()
+
+    def done(self):
+        return self.finished is not None
+
+    def metrics(self):
+        with self._lock:
+            states = [state for state, _, _ in self.status.values()]
+            seconds = sum(elapsed for _, elapsed, _ in self.status.values() if elapsed is not None)
+            end = self.finished or time.time()
+        return {
+            'jobs': len(self.jobs),
+            'ok': states.count('ok'),
+            'errors': states.count('error'),
+            'pending': states.count('pendiente'),
+            'job_seconds': round(seconds, 3),
+            'wall_seconds': round(end - self.started, 3) if self.started else 0.0,
+        }
+
+
+def _raise(error):
+    raise error
+
+
+@st.cache_resource(show_spinner=False)
+def start_warmup():
+    """Lanza el precalentamiento una vez por proceso (None si está desactivado)."""
+    if not WARMUP_ENABLED:
+        return None
+    try:
+        jobs = warmup_jobs()
+    except (OSError, ValueError) as e:
+        # Un archivo de configuración roto no impide precalentar lo básico
+        jobs = warmup_jobs(hot={})
+        jobs.append(("archivo de parámetros calientes", lambda error=e: _raise(error)))
+    return WarmUp(jobs).start()
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Precalienta la caché en disco con los gráficos por defecto.")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--hot', default=DEFAULT_HOT_FILE, help="JSON con parámetros calientes")
+    args = parser.parse_args()
+
+    warmup = WarmUp(warmup_jobs(load_hot_params(args.hot)), workers=args.workers).start()
+    warmup.wait()
+    for name, (state, elapsed, error) in warmup.status.items():
+        print(f"{state:6} {elapsed:7.3f} s  {name}" + (f"  ({error})" if error else ""))
+    print(warmup.metrics())